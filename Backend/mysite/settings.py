@@ -1,4 +1,6 @@
 from pathlib import Path
+import hashlib
+import hmac
 import os
 from dotenv import load_dotenv
 
@@ -163,6 +165,28 @@ QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "resumes")
 
 
+# ===============================
+# EMBEDDING SERVER
+# ===============================
+# Shared secret for the embedding server's Unix socket (run_embedding_server).
+# Defaults to a key derived from SECRET_KEY, so web workers and the server
+# agree on it as long as they share the same settings.
+EMBEDDING_SERVER_AUTHKEY = os.getenv("EMBEDDING_SERVER_AUTHKEY", "") or hmac.new(
+    SECRET_KEY.encode(), b"talentlens-embedding-server", hashlib.sha256
+).hexdigest()
+
+
+# ===============================
+# UPLOADS
+# ===============================
+# Resume uploads are queued as ingestion jobs, so one request may carry far
+# more files than Django's default of 100 (see INGEST_MAX_FILES)
+DATA_UPLOAD_MAX_NUMBER_FILES = int(os.getenv("INGEST_MAX_FILES", "500"))
+# Uploaded files above this size are spooled to a temp file instead of memory;
+# the ingestion job then moves that file into its staging dir without copying
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("FILE_UPLOAD_MAX_MEMORY_SIZE", str(2621440)))
+
+
 # ===============================
 # REST FRAMEWORK
 # ===============================
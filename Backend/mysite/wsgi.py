@@ -10,3 +10,15 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
 
 application = get_wsgi_application()
+
+# Optionally load the embedding model in the background once this worker has
+# started, instead of on the first request that needs it.
+if os.getenv("EMBEDDING_WARMUP_ON_START", "false").lower() == "true":
+    from resume.services.embedding_service import start_background_warmup
+    start_background_warmup()
+
+# Optionally start the in-process ingestion worker at boot, so uploads queued
+# before a restart are picked up without waiting for the next upload.
+if os.getenv("INGEST_WORKER_ON_START", "false").lower() == "true":
+    from resume.services.ingestion_service import start_worker
+    start_worker()
@@ -0,0 +1,219 @@
+# resume/async_views.py
+"""
+Async (ASGI) versions of the read-heavy endpoints, served under async/.
+
+They return the same JSON as their sync counterparts in views.py / job_views.py
+and reuse their helpers; only the Qdrant calls differ, going through
+async_qdrant_service so concurrent requests don't each pin a worker thread.
+Embedding and keyword matching are CPU work and run on a thread.
+"""
+import asyncio
+import functools
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET, require_POST
+
+from .job_views import _add_job, _job_department_filter, _job_list_entry, _page_of_jobs
+from .services import async_qdrant_service as aqs
+from .services.keyword_match_service import KeywordMatchService
+from .services.sparse_service import query_sparse_vector
+from .views import (
+    ANALYTICS_SKILL_FACET_LIMIT,
+    RESUME_CARD_FIELDS,
+    _analytics_body,
+    _analytics_filters,
+    _filter_only_results,
+    _query_vectors,
+    _resume_card,
+    _score_search_results,
+    _search_filter,
+    _search_options,
+)
+
+
+def _qdrant_view(view):
+    """
+    Outside ASGI (runserver/WSGI) each request runs on its own event loop, so
+    the loop's AsyncQdrantClient is closed when the view returns.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        finally:
+            if not isinstance(request, ASGIRequest):
+                await aqs.close_async_client()
+    return wrapper
+
+
+def _json_body(request) -> dict:
+    try:
+        data = json.loads(request.body or b"{}")
+    except (TypeError, ValueError):
+        raise ValueError("Invalid JSON body")
+    if not isinstance(data, dict):
+        raise ValueError("Invalid JSON body")
+    return data
+
+
+# ============================================================
+# Search Resume
+# ============================================================
+@require_POST
+@_qdrant_view
+async def resume_search(request):
+    try:
+        data = _json_body(request)
+        options = _search_options(data)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    query = data.get("query", "")
+    filters = data.get("filters", {}) or {}
+    if not query and not filters:
+        return JsonResponse({"error": "A search query or filters are required"}, status=400)
+
+    query_filter = _search_filter(filters)
+
+    # Filter-only: ordered scroll, same as ResumeSearchView
+    if not query:
+        try:
+            listing = await aqs.list_points_filtered(
+                query_filter,
+                order_by="experience_years" if filters.get("cpd_level") else "cpd_level",
+                limit=options["limit"],
+                cursor=data.get("cursor"),
+                fields=RESUME_CARD_FIELDS,
+            )
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        except Exception as e:
+            print(f"❌ Qdrant scroll error: {e}")
+            return JsonResponse({"error": f"Qdrant search error: {e}"}, status=500)
+
+        return JsonResponse({
+            "results": _filter_only_results(listing["points"]),
+            "next_cursor": listing["next_cursor"],
+            "total": listing["total"],
+        }, status=200)
+
+    raw_keywords = await asyncio.to_thread(KeywordMatchService.extract_keywords, query)
+    expanded_keywords = KeywordMatchService.expand_dependencies(raw_keywords)
+
+    weights = options["weights"]
+    try:
+        query_vectors = await asyncio.to_thread(_query_vectors, query, raw_keywords, weights)
+    except Exception as e:
+        return JsonResponse({"error": f"Embedding failed: {e}"}, status=500)
+
+    use_hybrid = options["hybrid"]
+    results = None
+    try:
+        if use_hybrid:
+            results = await aqs.hybrid_search(
+                query_vectors,
+                query_sparse_vector(query, expanded_keywords),
+                vector_names=list(weights),
+                fusion=options["fusion"],
+                query_filter=query_filter,
+                limit=300,
+                exclude_fields=["resume_text"],
+            )
+        if results is None:
+            use_hybrid = False
+            results = await aqs.search_resumes_weighted(
+                query_vectors, weights, query_filter=query_filter, limit=300, exclude_fields=["resume_text"]
+            )
+    except Exception as e:
+        return JsonResponse({"error": f"Qdrant search error: {e}"}, status=500)
+
+    final_results = await asyncio.to_thread(_score_search_results, results, query, use_hybrid)
+    return JsonResponse({"results": final_results}, status=200)
+
+
+# ============================================================
+# List resumes
+# ============================================================
+@require_GET
+@_qdrant_view
+async def resume_list(request):
+    try:
+        try:
+            limit = int(request.GET.get("limit", 12))
+        except ValueError:
+            limit = 12
+        offset = request.GET.get("offset", None)
+
+        records, next_offset = await aqs.get_points_paginated(
+            offset=offset, limit=limit, fields=RESUME_CARD_FIELDS
+        )
+        return JsonResponse({
+            "results": [_resume_card(record) for record in records],
+            "next_offset": next_offset,
+        }, status=200)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+# ============================================================
+# Analytics
+# ============================================================
+@require_GET
+@_qdrant_view
+async def analytics_overview(request):
+    try:
+        # All count calls and the skills facet are in flight together
+        counts, skills = await asyncio.gather(
+            aqs.count_by_filters(_analytics_filters()),
+            aqs.facet_counts("skills", limit=ANALYTICS_SKILL_FACET_LIMIT),
+        )
+        return JsonResponse(_analytics_body(counts, skills))
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+# ============================================================
+# Jobs
+# ============================================================
+@require_GET
+@_qdrant_view
+async def list_jobs(request):
+    try:
+        user_id = await request.session.aget('user_id')
+        if not user_id:
+            return JsonResponse({"error": "Unauthorized"}, status=401)
+
+        try:
+            limit = int(request.GET.get("limit", 12))
+            offset = int(request.GET.get("offset", 0))
+        except ValueError:
+            limit = 12
+            offset = 0
+        target_dept = request.GET.get("department", "All")
+
+        job_map = {}
+        for record in await aqs.get_all_job_postings(query_filter=_job_department_filter(target_dept)):
+            _add_job(job_map, _job_list_entry(record))
+
+        return JsonResponse(_page_of_jobs(job_map, offset, limit), status=200)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@require_GET
+@_qdrant_view
+async def get_job_details(request, job_id):
+    try:
+        user_id = await request.session.aget('user_id')
+        if not user_id:
+            return JsonResponse({"error": "Unauthorized"}, status=401)
+
+        point = await aqs.retrieve_job(job_id)
+        if not point:
+            return JsonResponse({"error": "Job not found"}, status=404)
+
+        return JsonResponse({**(point.payload or {}), "id": job_id}, status=200)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
@@ -15,12 +15,18 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
  
 # Import your services
-from .services.qdrant_service import insert_job_posting
+from .services.qdrant_service import (
+    JOB_COLLECTION,
+    delete_job,
+    insert_job_posting,
+    iter_job_postings,
+    qdrant_client,
+    retrieve_job,
+    update_job_payload,
+)
 from .services.embedding_service import get_text_embedding
-from .services.qdrant_service import insert_job_posting, qdrant_client # <-- ✅ Add qdrant_client
 from qdrant_client.http import models
 from .models import AppUser
-from .services.qdrant_service import get_all_job_postings, insert_job_posting, qdrant_client
 from datetime import datetime
 from .services.s3_service import s3, BUCKET  # ✅ Imported for S3 deletion
 from urllib.parse import urlparse, unquote # ✅ ADD unquote HERE
@@ -157,7 +163,7 @@ def save_job_description(request):
     1. Generates a PDF from the JD data.
     2. Uploads PDF to S3 (jobs/ folder).
     3. Generates Embedding.
-    4. Saves Data + S3 Link to Qdrant Department Collection.
+    4. Saves Data + S3 Link to the Qdrant job collection, tagged with its department.
     """
     print("=== SAVE JD (S3 + QDRANT) CALLED ===")
     try:
@@ -239,15 +245,9 @@ def save_job_description(request):
 def delete_job_description(request, job_id):
     """
     Deletes a Job Description from Qdrant and S3.
-    Searches all job collections since we might not know which one the ID belongs to.
     """
     print(f"=== DELETE JOB CALLED: {job_id} ===")
    
-    # Get all unique collection names from our mapping
-    collections_to_check = set(DEPARTMENT_MAPPING.values())
-   
-    job_found = False
-   
     try:
         # 1. Initialize S3 Client
         s3_client = boto3.client(
@@ -257,51 +257,32 @@ def delete_job_description(request, job_id):
             region_name=settings.AWS_REGION_NAME,
         )
  
-        # 2. Search for the job in each collection
-        for collection_name in collections_to_check:
+        # 2. Look the job up (every department shares one collection)
+        point = retrieve_job(job_id)
+        if not point:
+            return Response({"error": "Job ID not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        payload = point.payload or {}
+       
+        # 3. Delete from S3
+        # We saved the full key (e.g. "jobs/file.pdf") as 'file_name'
+        object_key = payload.get("file_name")
+       
+        if object_key:
             try:
-                # Try to retrieve the record
-                points = qdrant_client.retrieve(
-                    collection_name=collection_name,
-                    ids=[job_id],
-                    with_payload=True
+                s3_client.delete_object(
+                    Bucket=settings.S3_BUCKET_JD,
+                    Key=object_key
                 )
-               
-                if points:
-                    # Found it!
-                    job_found = True
-                    point = points[0]
-                    payload = point.payload or {}
-                   
-                    # 3. Delete from S3
-                    # We saved the full key (e.g. "jobs/file.pdf") as 'file_name'
-                    object_key = payload.get("file_name")
-                   
-                    if object_key:
-                        try:
-                            s3_client.delete_object(
-                                Bucket=settings.S3_BUCKET_JD,
-                                Key=object_key
-                            )
-                            print(f"🗑️ Deleted S3 file: {object_key}")
-                        except Exception as s3_e:
-                            print(f"⚠️ S3 Delete Warning: {s3_e}")
- 
-                    # 4. Delete from Qdrant
-                    qdrant_client.delete(
-                        collection_name=collection_name,
-                        points_selector=models.PointIdsList(points=[job_id]),
-                    )
-                    print(f"✅ Deleted Qdrant record from {collection_name}")
-                   
-                    return Response({"message": "Job deleted successfully"}, status=status.HTTP_200_OK)
- 
-            except Exception as e:
-                # If collection doesn't exist or other minor error, continue searching
-                continue
+                print(f"🗑️ Deleted S3 file: {object_key}")
+            except Exception as s3_e:
+                print(f"⚠️ S3 Delete Warning: {s3_e}")
+ 
+        # 4. Delete from Qdrant
+        delete_job(job_id)
+        print(f"✅ Deleted Qdrant record from {JOB_COLLECTION}")
        
-        if not job_found:
-            return Response({"error": "Job ID not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"message": "Job deleted successfully"}, status=status.HTTP_200_OK)
  
     except Exception as e:
         print(f"❌ Error deleting JD: {e}")
@@ -311,48 +292,35 @@ def delete_job_description(request, job_id):
 @api_view(['GET'])
 def get_all_jobs(request):
     """
-    Fetch all job descriptions from all collections.
+    Fetch all job descriptions from every department.
     """
     all_jobs = []
     try:
-        # Iterate over all unique collection names
-        unique_collections = set(DEPARTMENT_MAPPING.values())
-       
-        # Initialize Qdrant client (ensure it is imported or use the service)
-        from .services.qdrant_service import qdrant_client
         if not qdrant_client:
              return Response({"error": "Qdrant not connected"}, status=500)
  
-        for collection_name in unique_collections:
-            try:
-                # Fetch all points from this collection
-                records, _ = qdrant_client.scroll(
-                    collection_name=collection_name,
-                    limit=100,
-                    with_payload=True,
-                    with_vectors=False
-                )
-               
-                for record in records:
-                    p = record.payload or {}
-                    all_jobs.append({
-                        "id": record.id,
-                        "title": p.get("jobTitle", "Unknown Role"),
-                        "company": p.get("companyName", "Unknown Company"),
-                        "location": p.get("location", "Remote"),
-                        "type": p.get("jobType", "Full-time"),
-                        "posted": p.get("postingDate", "Recently"),
-                        "applicants": 0, # Placeholder
-                        "description": p.get("summary", ""),
-                        "skills": p.get("requiredSkills", "").split(",") if p.get("requiredSkills") else [],
-                        "creator_email": p.get("contactEmail", ""), # Used to filter "My JDs"
-                        "department": p.get("department", ""),
-                        "s3_url": p.get("s3_url", ""), # <--- Needed for "View" button
-                        "file_name": p.get("file_name", ""), # <--- Needed for "View" button
-                        "collection": collection_name
-                    })
-            except Exception:
-                continue
+        try:
+            # Stream all postings (page by page)
+            for record in iter_job_postings():
+                p = record.payload or {}
+                all_jobs.append({
+                    "id": record.id,
+                    "title": p.get("jobTitle", "Unknown Role"),
+                    "company": p.get("companyName", "Unknown Company"),
+                    "location": p.get("location", "Remote"),
+                    "type": p.get("jobType", "Full-time"),
+                    "posted": p.get("postingDate", "Recently"),
+                    "applicants": 0, # Placeholder
+                    "description": p.get("summary", ""),
+                    "skills": p.get("requiredSkills", "").split(",") if p.get("requiredSkills") else [],
+                    "creator_email": p.get("contactEmail", ""), # Used to filter "My JDs"
+                    "department": p.get("department", ""),
+                    "s3_url": p.get("s3_url", ""), # <--- Needed for "View" button
+                    "file_name": p.get("file_name", ""), # <--- Needed for "View" button
+                    "collection": p.get("department_key", "")
+                })
+        except Exception as e:
+            print(f"⚠️ Job scroll stopped early: {e}")
  
         return Response(all_jobs, status=status.HTTP_200_OK)
        
@@ -460,7 +428,7 @@ def publish_jd(request):
         user = AppUser.objects.get(id=user_id)
         data = request.data
         dept = user.department
-        collection_name = DEPARTMENT_MAPPING.get(dept, "engineering_it")
+        department_key = DEPARTMENT_MAPPING.get(dept, "engineering_it")
  
         job_id = str(uuid.uuid4())
         payload = {
@@ -477,12 +445,8 @@ def publish_jd(request):
             "experience_required": data.get("experience", "0-2 years")
         }
         from .services.embedding_service import get_text_embedding
-        from qdrant_client.http import models
         vector = get_text_embedding(payload["job_description"])
-        qdrant_client.upsert(
-            collection_name=collection_name,
-            points=[models.PointStruct(id=job_id, vector=vector, payload=payload)]
-        )
+        insert_job_posting(department_key, payload, vector, point_id=job_id)
         return Response({"message": "Job Published", "id": job_id}, status=201)
     except Exception as e:
         return Response({"error": str(e)}, status=500)
@@ -500,6 +464,110 @@ def get_fuzzy(payload, targets):
 # ✅ SMART LIST FUNCTION (Deduplicates Jobs & Fixes Status)
 # In Backend/resume/job_views.py
 
+def _job_list_entry(record):
+    """Normalized job card for the job list, whichever keys the posting was saved with."""
+    p = record.payload or {}
+    job_id = record.id
+
+    # --- ROBUST DATA EXTRACTION ---
+    
+    # 1. Title
+    title = p.get("jobTitle") or p.get("job_title") or p.get("title") or "Untitled"
+
+    # 2. Manager Name (Try all known keys)
+    manager_name = (
+        p.get("hiringManagerName") or 
+        p.get("creator_name") or 
+        p.get("name") or 
+        get_fuzzy(p, ["manager", "creator"]) or 
+        "Unknown"
+    )
+
+    # 3. Manager Email (Try all known keys)
+    manager_email = (
+        p.get("contactEmail") or 
+        p.get("creator_email") or 
+        p.get("email") or 
+        ""
+    )
+
+    # 4. Department
+    dept = (
+        p.get("department") or 
+        p.get("dept") or 
+        (p.get("department_key") or "").replace("_", " ").title() or 
+        "General"
+    )
+
+    # 5. File Info
+    s3_url = p.get("s3_url") or p.get("fileUrl") or p.get("url")
+    file_name = p.get("file_name") or p.get("fileName")
+    
+    # 6. Status & Dates
+    status_val = p.get("status") or "Open"
+    date_val = p.get("postingDate") or p.get("posting_date") or p.get("created_at") or ""
+
+    return {
+        "id": job_id,
+        "title": title,
+        "creator_name": manager_name,  # Key for frontend match
+        "hiringManagerName": manager_name, # Backup key
+        "email": manager_email,        # Key for frontend match
+        "creator_email": manager_email, # Backup key
+        "department": dept,
+        "location": p.get("location", "Remote"),
+        "type": p.get("jobType") or p.get("job_type") or "Full-time",
+        "status": status_val,
+        "created_at": date_val,
+        "s3_url": s3_url,
+        "file_name": file_name,
+        "salary": p.get("salary"),
+        "openings": p.get("openings")
+    }
+
+
+def _job_department_filter(target_dept):
+    # "department" holds the label the JD was saved with (migrate_job_collections
+    # fills it in for postings that had none)
+    if target_dept == "All":
+        return None
+    return models.Filter(must=[
+        models.FieldCondition(key="department", match=models.MatchValue(value=target_dept))
+    ])
+
+
+def _add_job(job_map, job_data):
+    # Deduplication Logic
+    job_id = job_data["id"]
+    if job_id not in job_map:
+        job_map[job_id] = job_data
+    else:
+        existing = job_map[job_id]
+        if existing.get("status") == "Closed" and job_data["status"] in ["Open", "Active"]:
+            job_map[job_id] = job_data
+
+
+def _page_of_jobs(job_map, offset, limit):
+    """Sort and slice the collected jobs into the list_jobs response body."""
+    all_jobs = list(job_map.values())
+
+    # 3. Sort for stability
+    all_jobs.sort(key=lambda x: (x.get("created_at", ""), x.get("id", "")), reverse=True)
+
+    # 4. Pagination
+    total = len(all_jobs)
+    start = offset
+    end = offset + limit
+    paginated_jobs = all_jobs[start:end]
+
+    next_offset = end if end < total else None
+
+    return {
+        "results": paginated_jobs,
+        "next_offset": next_offset
+    }
+
+
 @api_view(['GET'])
 def list_jobs(request):
     try:
@@ -516,112 +584,16 @@ def list_jobs(request):
             
         target_dept = request.query_params.get("department", "All")
 
-        # 2. Collect All Jobs
-        unique_collections = set(DEPARTMENT_MAPPING.values())
+        # 2. Collect Jobs (one scroll, narrowed to the department in Qdrant)
         job_map = {} 
 
-        for collection_name in unique_collections:
-            try:
-                records, _ = qdrant_client.scroll(
-                    collection_name=collection_name,
-                    limit=1000, 
-                    with_payload=True,
-                    with_vectors=False
-                )
-                
-                for record in records:
-                    p = record.payload or {}
-                    job_id = record.id
-                    
-                    # --- ROBUST DATA EXTRACTION ---
-                    
-                    # 1. Title
-                    title = p.get("jobTitle") or p.get("job_title") or p.get("title") or "Untitled"
-
-                    # 2. Manager Name (Try all known keys)
-                    manager_name = (
-                        p.get("hiringManagerName") or 
-                        p.get("creator_name") or 
-                        p.get("name") or 
-                        get_fuzzy(p, ["manager", "creator"]) or 
-                        "Unknown"
-                    )
-
-                    # 3. Manager Email (Try all known keys)
-                    manager_email = (
-                        p.get("contactEmail") or 
-                        p.get("creator_email") or 
-                        p.get("email") or 
-                        ""
-                    )
-
-                    # 4. Department
-                    dept = (
-                        p.get("department") or 
-                        p.get("dept") or 
-                        collection_name.replace("_", " ").title() or 
-                        "General"
-                    )
-
-                    # 5. File Info
-                    s3_url = p.get("s3_url") or p.get("fileUrl") or p.get("url")
-                    file_name = p.get("file_name") or p.get("fileName")
-                    
-                    # 6. Status & Dates
-                    status_val = p.get("status") or "Open"
-                    date_val = p.get("postingDate") or p.get("posting_date") or p.get("created_at") or ""
-
-                    job_data = {
-                        "id": job_id,
-                        "title": title,
-                        "creator_name": manager_name,  # Key for frontend match
-                        "hiringManagerName": manager_name, # Backup key
-                        "email": manager_email,        # Key for frontend match
-                        "creator_email": manager_email, # Backup key
-                        "department": dept,
-                        "location": p.get("location", "Remote"),
-                        "type": p.get("jobType") or p.get("job_type") or "Full-time",
-                        "status": status_val,
-                        "created_at": date_val,
-                        "s3_url": s3_url,
-                        "file_name": file_name,
-                        "salary": p.get("salary"),
-                        "openings": p.get("openings")
-                    }
-
-                    # Deduplication Logic
-                    if job_id not in job_map:
-                        job_map[job_id] = job_data
-                    else:
-                        existing = job_map[job_id]
-                        if existing.get("status") == "Closed" and status_val in ["Open", "Active"]:
-                            job_map[job_id] = job_data
-                            
-            except Exception as e:
-                print(f"Error processing collection {collection_name}: {e}")
-                continue 
-
-        all_jobs = list(job_map.values())
-
-        # 3. Apply Filter
-        if target_dept != "All":
-            all_jobs = [j for j in all_jobs if j["department"] == target_dept]
-
-        # Sort for stability
-        all_jobs.sort(key=lambda x: (x.get("created_at", ""), x.get("id", "")), reverse=True)
-
-        # 4. Pagination
-        total = len(all_jobs)
-        start = offset
-        end = offset + limit
-        paginated_jobs = all_jobs[start:end]
-        
-        next_offset = end if end < total else None
+        try:
+            for record in iter_job_postings(query_filter=_job_department_filter(target_dept)):
+                _add_job(job_map, _job_list_entry(record))
+        except Exception as e:
+            print(f"Error processing collection {JOB_COLLECTION}: {e}")
 
-        return Response({
-            "results": paginated_jobs, 
-            "next_offset": next_offset
-        }, status=200)
+        return Response(_page_of_jobs(job_map, offset, limit), status=200)
 
     except Exception as e:
         return Response({"error": str(e)}, status=500)
@@ -637,23 +609,19 @@ def delete_jd(request, job_id):
             return Response({"error": "Unauthorized"}, status=401)
        
         user = AppUser.objects.get(id=user_id)
-        collection_name = DEPARTMENT_MAPPING.get(user.department)
+        department_key = DEPARTMENT_MAPPING.get(user.department)
        
-        if not collection_name:
+        if not department_key:
             return Response({"error": "Invalid department"}, status=400)
  
-        print(f"🗑️ Attempting to delete Job ID: {job_id} from {collection_name}")
+        print(f"🗑️ Attempting to delete Job ID: {job_id} from {department_key}")
  
-        # 2. Retrieve Point first (to get S3 URL)
-        points = qdrant_client.retrieve(
-            collection_name=collection_name,
-            ids=[job_id]
-        )
+        # 2. Retrieve Point first (to get S3 URL); only the user's own department
+        point = retrieve_job(job_id)
        
-        if not points:
+        if not point or (point.payload or {}).get("department_key") != department_key:
             return Response({"error": "Job not found"}, status=404)
            
-        point = points[0]
         payload = point.payload or {}
        
         # 3. Delete from S3
@@ -670,10 +638,7 @@ def delete_jd(request, job_id):
                 print(f"⚠️ S3 Delete Warning: {s3_e}")
  
         # 4. Delete from Qdrant
-        qdrant_client.delete(
-            collection_name=collection_name,
-            points_selector=models.PointIdsList(points=[job_id])
-        )
+        delete_job(job_id)
         print(f"✅ Deleted from Qdrant: {job_id}")
        
         return Response({"message": "Job deleted successfully"}, status=200)
@@ -695,9 +660,8 @@ def update_jd_status(request, job_id):
         if not user_id:
             return Response({"error": "Unauthorized"}, status=401)
        
-        # 1. Find the job in ANY collection
-        # (This fixes the issue where it couldn't find the job to update)
-        point, collection_name = find_job_and_collection(job_id)
+        # 1. Find the job (any department)
+        point = retrieve_job(job_id)
        
         if not point:
             return Response({"error": "Job not found in any department"}, status=404)
@@ -712,16 +676,12 @@ def update_jd_status(request, job_id):
         else:
             new_status = "Open"
        
-        print(f"   Collection: {collection_name}")
+        print(f"   Department: {payload.get('department_key')}")
         print(f"   Old Status: {current_status} -> New Status: {new_status}")
  
         # 3. Save to Qdrant (This makes it UNIVERSAL)
         # Because we update the central DB, all other users will see this change.
-        qdrant_client.set_payload(
-            collection_name=collection_name,
-            payload={"status": new_status},
-            points=[job_id]
-        )
+        update_job_payload(job_id, {"status": new_status})
        
         return Response({
             "message": "Status updated successfully",
@@ -739,17 +699,9 @@ def update_jd_status(request, job_id):
  
 # ... existing imports ...
  
-# ✅ HELPER: Search all collections for a Job ID
+# ✅ HELPER: Find a Job ID in any department
 def find_job_in_any_collection(job_id):
-    # Check every department collection
-    for col_name in DEPARTMENT_MAPPING.values():
-        try:
-            points = qdrant_client.retrieve(collection_name=col_name, ids=[job_id])
-            if points:
-                return points[0] # Found it!
-        except:
-            continue
-    return None
+    return retrieve_job(job_id)
  
 # ✅ 1. ROBUST VIEW FUNCTION
 @api_view(['GET'])
@@ -857,17 +809,11 @@ def download_jd(request, job_id):
  
 def find_job_and_collection(job_id):
     """
-    Searches all department collections for a specific Job ID.
+    Looks up a Job ID (one retrieve against the shared job collection).
     Returns a tuple: (Point, Collection_Name) or (None, None)
     """
-    for col_name in DEPARTMENT_MAPPING.values():
-        try:
-            points = qdrant_client.retrieve(collection_name=col_name, ids=[job_id])
-            if points:
-                return points[0], col_name
-        except:
-            continue
-    return None, None
+    point = retrieve_job(job_id)
+    return (point, JOB_COLLECTION) if point else (None, None)
  
  
  
@@ -974,11 +920,11 @@ def update_job_details(request, job_id):
             "file_name": file_key
         }
  
-        qdrant_client.set_payload(
-            collection_name=collection,
-            payload=updates,
-            points=[job_id]
-        )
+        # Keep the department index in step with an edited department
+        if pdf_data["department"] in DEPARTMENT_MAPPING:
+            updates["department_key"] = DEPARTMENT_MAPPING[pdf_data["department"]]
+
+        update_job_payload(job_id, updates)
  
         return Response({"message": "Job updated successfully"}, status=200)
  
@@ -0,0 +1,98 @@
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.services import embedding_service
+from resume.services.qdrant_service import VECTOR_SIZE
+
+SAMPLE_SKILLS = [
+    "python", "django", "react", "aws", "kubernetes", "docker", "postgresql",
+    "machine learning", "data analysis", "java", "spring boot", "terraform",
+    "azure", "sql", "tableau", "excel", "recruitment", "payroll", "sales forecasting",
+    "financial reporting", "node.js", "typescript", "ci/cd", "microservices",
+]
+
+SAMPLE_SENTENCES = [
+    "Senior software engineer with {n} years of experience building {a} and {b} services.",
+    "Led a team delivering {a} pipelines on {b} for enterprise customers.",
+    "Hands-on experience with {a}, {b} and agile delivery across distributed teams.",
+    "Responsible for {a} migration and {b} automation, reducing costs by {n}%.",
+]
+
+
+def _synthetic_corpus(size: int, seed: int = 42):
+    rnd = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        if i % 3 == 0:
+            corpus.append(rnd.choice(SAMPLE_SKILLS))
+        else:
+            tmpl = rnd.choice(SAMPLE_SENTENCES)
+            corpus.append(tmpl.format(
+                a=rnd.choice(SAMPLE_SKILLS),
+                b=rnd.choice(SAMPLE_SKILLS),
+                n=rnd.randint(1, 15),
+            ))
+    return corpus
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the torch and quantized ONNX embedding backends: cosine drift "
+        "between their vectors and encodes per second for each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=512, help="Number of synthetic texts")
+        parser.add_argument("--batch-size", type=int, default=embedding_service.EMBEDDING_BATCH_SIZE)
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per backend")
+        parser.add_argument(
+            "--max-drift", type=float, default=0.02,
+            help="Fail if 1 - cosine(torch, onnx) exceeds this for any text",
+        )
+
+    def _time_backend(self, model, corpus, batch_size, repeat):
+        model.encode(corpus[:batch_size], batch_size=batch_size, show_progress_bar=False)  # warm up
+        best = None
+        vectors = None
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            vectors = model.encode(
+                corpus, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False,
+            )
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return vectors.astype(np.float32), len(corpus) / best
+
+    def handle(self, *args, **opts):
+        corpus = _synthetic_corpus(opts["size"])
+        results = {}
+
+        for backend in ("torch", "onnx"):
+            try:
+                model = embedding_service.load_model(backend)
+            except Exception as e:
+                raise CommandError(f"Could not load '{backend}' backend: {e}")
+
+            dim = model.get_sentence_embedding_dimension()
+            if dim != VECTOR_SIZE:
+                raise CommandError(f"'{backend}' backend returned dim {dim}, expected {VECTOR_SIZE}")
+
+            vectors, rate = self._time_backend(model, corpus, opts["batch_size"], opts["repeat"])
+            results[backend] = vectors
+            self.stdout.write(f"{backend:>5}: {rate:8.1f} encodes/sec (dim={dim})")
+
+        a, b = results["torch"], results["onnx"]
+        cos = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+        drift = 1.0 - cos
+        self.stdout.write(
+            f"cosine drift: mean={drift.mean():.5f} p99={np.percentile(drift, 99):.5f} max={drift.max():.5f}"
+        )
+
+        if drift.max() > opts["max_drift"]:
+            raise CommandError(
+                f"Parity check failed: max drift {drift.max():.5f} > {opts['max_drift']}"
+            )
+        self.stdout.write(self.style.SUCCESS("Parity check passed"))
@@ -0,0 +1,98 @@
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from qdrant_client.http import models
+
+from resume.services.qdrant_service import VECTOR_SIZE, build_qdrant_client
+
+BENCH_COLLECTION = "bench_transport"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare REST and gRPC latency for retrieve, scroll and search against a "
+        "Qdrant server (default: a local one on localhost:6333/6334)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost:6333")
+        parser.add_argument("--api-key", default="")
+        parser.add_argument("--points", type=int, default=10_000)
+        parser.add_argument("--requests", type=int, default=500, help="Timed calls per operation")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep", action="store_true", help="Keep the bench collection")
+
+    def _setup(self, client, n, rng):
+        if client.collection_exists(BENCH_COLLECTION):
+            client.delete_collection(BENCH_COLLECTION)
+        client.create_collection(
+            collection_name=BENCH_COLLECTION,
+            vectors_config=models.VectorParams(size=VECTOR_SIZE, distance=models.Distance.COSINE),
+        )
+        for start in range(0, n, 1000):
+            count = min(1000, n - start)
+            vecs = rng.normal(size=(count, VECTOR_SIZE)).astype(np.float32)
+            client.upsert(
+                collection_name=BENCH_COLLECTION,
+                points=models.Batch(
+                    ids=list(range(start, start + count)),
+                    vectors=vecs.tolist(),
+                    payloads=[{"cpd_level": (start + i) % 6 + 1} for i in range(count)],
+                ),
+                wait=True,
+            )
+
+    def _time(self, fn, n):
+        fn(0)  # warm the connection
+        lat = []
+        for i in range(n):
+            start = time.perf_counter()
+            fn(i)
+            lat.append((time.perf_counter() - start) * 1000)
+        lat = np.array(lat)
+        return np.percentile(lat, 50), np.percentile(lat, 95), n / (lat.sum() / 1000)
+
+    def handle(self, *args, **opts):
+        rng = np.random.default_rng(opts["seed"])
+        rnd = random.Random(opts["seed"])
+        n = opts["points"]
+
+        clients = {
+            "rest": build_qdrant_client(url=opts["url"], api_key=opts["api_key"], prefer_grpc=False),
+            "grpc": build_qdrant_client(url=opts["url"], api_key=opts["api_key"], prefer_grpc=True),
+        }
+
+        try:
+            self._setup(clients["rest"], n, rng)
+        except Exception as e:
+            raise CommandError(f"Could not set up '{BENCH_COLLECTION}' at {opts['url']}: {e}")
+
+        ids = [rnd.randrange(n) for _ in range(opts["requests"])]
+        queries = rng.normal(size=(opts["requests"], VECTOR_SIZE)).astype(np.float32).tolist()
+
+        self.stdout.write(f"{'transport':<10}{'operation':<10}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>9}")
+        try:
+            for transport, client in clients.items():
+                operations = {
+                    "retrieve": lambda i: client.retrieve(
+                        collection_name=BENCH_COLLECTION, ids=[ids[i]], with_payload=True,
+                    ),
+                    "scroll": lambda i: client.scroll(
+                        collection_name=BENCH_COLLECTION, limit=50, with_payload=True, with_vectors=False,
+                        offset=ids[i],
+                    ),
+                    "search": lambda i: client.search(
+                        collection_name=BENCH_COLLECTION, query_vector=queries[i], limit=10,
+                        with_payload=True,
+                    ),
+                }
+                for op, fn in operations.items():
+                    p50, p95, rps = self._time(fn, opts["requests"])
+                    self.stdout.write(f"{transport:<10}{op:<10}{p50:>9.2f}{p95:>9.2f}{rps:>9.0f}")
+        finally:
+            if not opts["keep"]:
+                clients["rest"].delete_collection(BENCH_COLLECTION)
+            for client in clients.values():
+                client.close()
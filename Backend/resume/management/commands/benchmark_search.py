@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from resume import views
+
+DEFAULT_QUERIES = [
+    "python django developer with aws",
+    "kubernetes docker devops engineer",
+    "recruitment and payroll specialist",
+    "financial reporting excel tally gst",
+    "salesforce crm lead generation",
+    "machine learning sql data engineer",
+]
+
+SAMPLE_JD = (
+    "We are hiring a Backend Developer with 3-5 years experience in python, django, "
+    "postgresql, docker and aws. Experience with kubernetes and ci/cd is a plus."
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Throughput / latency of the search endpoints, called in-process through "
+        "the DRF views. Combine with QDRANT_PATH=:memory: and --seed-resumes to run "
+        "fully offline (seeding happens in this process, so in-memory data survives)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed-resumes", type=int, default=0, help="Seed N synthetic resumes first")
+        parser.add_argument("--seed-jobs", type=int, default=0)
+        parser.add_argument("--random-vectors", action="store_true", help="Seed with random vectors")
+        parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint")
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument(
+            "--jd-match", action="store_true",
+            help="Also benchmark jd_match (calls the LLM for JD keywords, so needs network)",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["seed_resumes"] or opts["seed_jobs"]:
+            seed_args = ["--resumes", str(opts["seed_resumes"]), "--jobs", str(opts["seed_jobs"])]
+            if opts["random_vectors"]:
+                seed_args.append("--random-vectors")
+            call_command("seed_qdrant", *seed_args, stdout=self.stdout)
+
+        factory = APIRequestFactory()
+        search_view = views.ResumeSearchView.as_view()
+
+        endpoints = {
+            "search (query)": lambda i: search_view(factory.post(
+                "/api/search/", {"query": DEFAULT_QUERIES[i % len(DEFAULT_QUERIES)], "filters": {}}, format="json",
+            )),
+            "search (filters only)": lambda i: search_view(factory.post(
+                "/api/search/", {"query": "", "filters": {"cpd_level": str(i % 6 + 1)}}, format="json",
+            )),
+            "filter_resumes": lambda i: views.filter_resumes(factory.get(
+                "/api/filter/", {"cpd_level": str(i % 6 + 1)},
+            )),
+            "analytics_overview": lambda i: views.analytics_overview(factory.get("/api/analytics/")),
+        }
+        if opts["jd_match"]:
+            endpoints["jd_match"] = lambda i: views.jd_match(factory.post(
+                "/api/jd-match/", {"jd_text": SAMPLE_JD}, format="json",
+            ))
+
+        # One untimed call per endpoint (model load, schema checks)
+        for call in endpoints.values():
+            call(0)
+
+        self.stdout.write(f"{'endpoint':<24}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for name, call in endpoints.items():
+            self._run(name, call, opts["requests"], opts["concurrency"])
+
+    def _run(self, name, call, n, concurrency):
+        def _timed(i):
+            start = time.perf_counter()
+            response = call(i)
+            return (time.perf_counter() - start) * 1000, response.status_code >= 400
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            results = list(pool.map(_timed, range(n)))
+        elapsed = time.perf_counter() - start
+
+        lat = np.array([r[0] for r in results])
+        errors = sum(1 for r in results if r[1])
+        self.stdout.write(
+            f"{name:<24}{n / elapsed:>9.1f}{np.percentile(lat, 50):>10.1f}"
+            f"{np.percentile(lat, 95):>10.1f}{errors:>8}"
+        )
@@ -0,0 +1,150 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from qdrant_client.http import models
+
+from resume.services.qdrant_service import (
+    VECTOR_SIZE,
+    build_hnsw_config,
+    build_quantization_config,
+    build_search_params,
+    qdrant_client,
+)
+
+
+def _synthetic_vectors(n: int, dim: int, centers: np.ndarray, rng: np.random.Generator, noise: float) -> np.ndarray:
+    """Normalized points scattered around random cluster centers (closer to real embeddings than pure noise)."""
+    idx = rng.integers(0, len(centers), size=n)
+    vecs = centers[idx] + rng.normal(scale=noise, size=(n, dim)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs.astype(np.float32)
+
+
+def _exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int, block: int = 100_000) -> np.ndarray:
+    """Brute-force cosine top-k ids (vectors are normalized, so dot product == cosine)."""
+    best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+    for start in range(0, len(corpus), block):
+        scores = queries @ corpus[start:start + block].T
+        ids = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+        scores = np.concatenate([best_scores, scores], axis=1)
+        ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argpartition(-scores, min(k, scores.shape[1] - 1), axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, top, axis=1)
+        best_ids = np.take_along_axis(ids, top, axis=1)
+    return best_ids
+
+
+class Command(BaseCommand):
+    help = (
+        "Recall@k vs latency of HNSW / quantization settings on a synthetic corpus. "
+        "Creates throwaway 'bench_*' collections, measures each hnsw_ef value against "
+        "exact (brute-force) neighbours, then drops the collections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=100_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--k", type=int, default=10)
+        parser.add_argument("--clusters", type=int, default=512)
+        parser.add_argument("--noise", type=float, default=0.35, help="Spread of points around cluster centers")
+        parser.add_argument("--m", type=int, default=16)
+        parser.add_argument("--ef-construct", type=int, default=100)
+        parser.add_argument("--ef", default="16,32,64,128,256", help="Comma-separated hnsw_ef values to try")
+        parser.add_argument("--quantization", default="none,scalar,binary",
+                            help="Comma-separated subset of none,scalar,binary")
+        parser.add_argument("--oversampling", type=float, default=2.0)
+        parser.add_argument("--upload-batch", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep", action="store_true", help="Don't delete the bench collections")
+
+    # ---------------- setup ----------------
+    def _create(self, name: str, kind: str, opts):
+        if qdrant_client.collection_exists(name):
+            qdrant_client.delete_collection(name)
+        qdrant_client.create_collection(
+            collection_name=name,
+            vectors_config=models.VectorParams(size=VECTOR_SIZE, distance=models.Distance.COSINE),
+            hnsw_config=build_hnsw_config(opts["m"], opts["ef_construct"]),
+            quantization_config=build_quantization_config(kind),
+        )
+
+    def _upload(self, name: str, corpus: np.ndarray, batch: int):
+        for start in range(0, len(corpus), batch):
+            chunk = corpus[start:start + batch]
+            qdrant_client.upsert(
+                collection_name=name,
+                points=models.Batch(
+                    ids=list(range(start, start + len(chunk))),
+                    vectors=chunk.tolist(),
+                ),
+                wait=False,
+            )
+
+    def _wait_indexed(self, name: str, timeout: float = 3600.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            info = qdrant_client.get_collection(name)
+            if info.status == models.CollectionStatus.GREEN:
+                return
+            time.sleep(2)
+        raise CommandError(f"Timed out waiting for '{name}' to finish indexing")
+
+    # ---------------- measurement ----------------
+    def _measure(self, name: str, queries: np.ndarray, truth: np.ndarray, k: int, params):
+        latencies, hits = [], 0
+        for q, expected in zip(queries, truth):
+            start = time.perf_counter()
+            res = qdrant_client.search(
+                collection_name=name,
+                query_vector=q.tolist(),
+                limit=k,
+                with_payload=False,
+                search_params=params,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len({int(r.id) for r in res} & set(expected.tolist()))
+
+        lat = np.array(latencies)
+        return hits / (len(queries) * k), np.percentile(lat, 50), np.percentile(lat, 95)
+
+    def handle(self, *args, **opts):
+        if not qdrant_client:
+            raise CommandError("Qdrant not initialized")
+
+        kinds = [q.strip() for q in opts["quantization"].split(",") if q.strip()]
+        efs = [int(e) for e in opts["ef"].split(",") if e.strip()]
+        k = opts["k"]
+
+        rng = np.random.default_rng(opts["seed"])
+        centers = rng.normal(size=(opts["clusters"], VECTOR_SIZE)).astype(np.float32)
+        centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+        corpus = _synthetic_vectors(opts["points"], VECTOR_SIZE, centers, rng, opts["noise"])
+        queries = _synthetic_vectors(opts["queries"], VECTOR_SIZE, centers, rng, opts["noise"])
+
+        self.stdout.write(f"Computing exact top-{k} for {len(queries)} queries over {len(corpus)} points...")
+        truth = _exact_top_k(corpus, queries, k)
+
+        self.stdout.write(f"{'quantization':<13}{'rescore':<9}{'hnsw_ef':>8}{'recall@' + str(k):>11}{'p50 ms':>9}{'p95 ms':>9}")
+        for kind in kinds:
+            name = f"bench_resumes_{kind}"
+            self._create(name, kind, opts)
+            start = time.perf_counter()
+            self._upload(name, corpus, opts["upload_batch"])
+            self._wait_indexed(name)
+            self.stdout.write(f"-- {name}: uploaded + indexed in {time.perf_counter() - start:.1f}s")
+
+            try:
+                for rescore in ([True, False] if kind != "none" else [False]):
+                    for ef in efs:
+                        params = build_search_params(hnsw_ef=ef, rescore=rescore, oversampling=opts["oversampling"])
+                        recall, p50, p95 = self._measure(name, queries, truth, k, params)
+                        self.stdout.write(
+                            f"{kind:<13}{str(rescore):<9}{ef:>8}{recall:>11.3f}{p50:>9.2f}{p95:>9.2f}"
+                        )
+            finally:
+                if not opts["keep"]:
+                    qdrant_client.delete_collection(name)
+
+        self.stdout.write(self.style.SUCCESS("Done"))
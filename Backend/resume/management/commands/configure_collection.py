@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.services.qdrant_service import (
+    COLLECTION_NAME,
+    QDRANT_HNSW_EF_CONSTRUCT,
+    QDRANT_HNSW_M,
+    apply_collection_config,
+    build_hnsw_config,
+    build_quantization_config,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply HNSW and quantization settings to an existing collection "
+        "(HNSW defaults come from the QDRANT_HNSW_* env vars; quantization is "
+        "only changed when --quantization is given)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--collection", default=COLLECTION_NAME)
+        parser.add_argument("--m", type=int, default=QDRANT_HNSW_M)
+        parser.add_argument("--ef-construct", type=int, default=QDRANT_HNSW_EF_CONSTRUCT)
+        parser.add_argument(
+            "--quantization", choices=["none", "scalar", "binary"], default=None,
+            help="'none' removes existing quantization; leave out to keep it unchanged",
+        )
+
+    def handle(self, *args, **opts):
+        quantization = opts["quantization"]
+        try:
+            changed = apply_collection_config(
+                opts["collection"],
+                hnsw_config=build_hnsw_config(opts["m"], opts["ef_construct"]),
+                quantization_config=build_quantization_config(quantization) if quantization else None,
+                disable_quantization=quantization == "none",
+            )
+        except Exception as e:
+            raise CommandError(f"Failed to update '{opts['collection']}': {e}")
+
+        if changed:
+            self.stdout.write(self.style.SUCCESS(
+                f"'{opts['collection']}': m={opts['m'] or 'default'}, "
+                f"ef_construct={opts['ef_construct'] or 'default'}, quantization={quantization or 'unchanged'}"
+            ))
+        else:
+            self.stdout.write("Nothing to change")
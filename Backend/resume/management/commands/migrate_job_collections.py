@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.services.qdrant_service import (
+    JOB_COLLECTION,
+    JOB_COLLECTIONS,
+    ensure_schema,
+    qdrant_client,
+    upsert_points_bulk,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the per-department job collections (engineering_it, human_resources, ...) into "
+        "the single job collection, tagging each posting with its department_key. Point ids "
+        "are kept, so existing job links keep working."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=128)
+        parser.add_argument(
+            "--delete-source", action="store_true",
+            help="Drop the per-department collections after a fully successful copy",
+        )
+
+    def handle(self, *args, **opts):
+        if not qdrant_client:
+            raise CommandError("Qdrant not initialized")
+        if JOB_COLLECTION in JOB_COLLECTIONS:
+            raise CommandError(f"QDRANT_JOB_COLLECTION must not be one of {list(JOB_COLLECTIONS)}")
+
+        ensure_schema(JOB_COLLECTION)
+
+        # id -> point; a posting found in several collections keeps its open copy,
+        # the same rule list_jobs used when it merged the collections
+        merged = {}
+        sources = []
+        for source in JOB_COLLECTIONS:
+            if not qdrant_client.collection_exists(source):
+                self.stdout.write(f"'{source}' does not exist, skipping")
+                continue
+            sources.append(source)
+
+            read = 0
+            offset = None
+            while True:
+                records, offset = qdrant_client.scroll(
+                    collection_name=source,
+                    with_payload=True,
+                    with_vectors=True,
+                    limit=opts["batch_size"],
+                    offset=offset,
+                )
+                for rec in records:
+                    payload = dict(rec.payload or {})
+                    payload["department_key"] = source
+                    # the list filter matches on "department"
+                    payload["department"] = (
+                        payload.get("department") or payload.get("dept") or source.replace("_", " ").title()
+                    )
+
+                    existing = merged.get(str(rec.id))
+                    if existing is not None and not (
+                        existing["payload"].get("status") == "Closed"
+                        and (payload.get("status") or "Open") in ["Open", "Active"]
+                    ):
+                        continue
+                    merged[str(rec.id)] = {"id": rec.id, "vector": rec.vector, "payload": payload}
+                read += len(records)
+                if not offset:
+                    break
+            self.stdout.write(f"... {read} postings read from '{source}'")
+
+        if not merged:
+            self.stdout.write(self.style.WARNING("No job postings found to migrate"))
+            return
+
+        result = upsert_points_bulk(
+            list(merged.values()), batch_size=opts["batch_size"], wait=True, collection_name=JOB_COLLECTION,
+        )
+        for pid, err in result["failed"].items():
+            self.stderr.write(f"{pid}: {err}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Copied {len(result['upserted'])} postings into '{JOB_COLLECTION}' ({len(result['failed'])} failed)"
+        ))
+
+        if opts["delete_source"]:
+            if result["failed"]:
+                raise CommandError("Some postings failed to copy; source collections were kept")
+            for source in sources:
+                qdrant_client.delete_collection(source)
+                self.stdout.write(f"🗑️ Dropped '{source}'")
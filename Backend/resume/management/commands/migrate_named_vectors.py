@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from qdrant_client.http import models
+
+from resume.services.embedding_service import get_resume_embeddings
+from resume.services.qdrant_service import (
+    COLLECTION_NAME,
+    RESUME_VECTORS,
+    SPARSE_VECTOR,
+    create_resume_collection,
+    qdrant_client,
+    upsert_points_bulk,
+    uses_named_vectors,
+)
+from resume.services.sparse_service import document_sparse_vector
+from resume.services.text_store import resolve_resume_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy a resumes collection into a new collection with named text/skills/summary "
+        "vectors and the sparse keyword vector, re-embedding every resume. Point the app at "
+        "the result with QDRANT_COLLECTION=<target>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", default=COLLECTION_NAME)
+        parser.add_argument("--target", default=f"{COLLECTION_NAME}_v2")
+        parser.add_argument("--batch-size", type=int, default=64)
+
+    def handle(self, *args, **opts):
+        if not qdrant_client:
+            raise CommandError("Qdrant not initialized")
+
+        source, target = opts["source"], opts["target"]
+        if source == target:
+            raise CommandError("--source and --target must differ")
+        if not qdrant_client.collection_exists(source):
+            raise CommandError(f"Collection '{source}' does not exist")
+
+        create_resume_collection(target)
+        if not uses_named_vectors(target):
+            raise CommandError(f"Target '{target}' exists but does not use named vectors")
+
+        copied = failed = 0
+        offset = None
+        while True:
+            records, offset = qdrant_client.scroll(
+                collection_name=source,
+                with_payload=True,
+                with_vectors=False,
+                limit=opts["batch_size"],
+                offset=offset,
+            )
+            if not records:
+                break
+
+            payloads = [r.payload or {} for r in records]
+            texts = [resolve_resume_text(p) for p in payloads]
+            skills = [p.get("skills") or [] for p in payloads]
+            named = get_resume_embeddings(texts, skills)
+            points = [
+                models.PointStruct(
+                    id=rec.id,
+                    vector={
+                        **{name: named[name][i].tolist() for name in RESUME_VECTORS},
+                        SPARSE_VECTOR: document_sparse_vector(texts[i], skills[i]),
+                    },
+                    payload=payloads[i],
+                )
+                for i, rec in enumerate(records)
+            ]
+
+            result = upsert_points_bulk(points, wait=True, collection_name=target)
+            copied += len(result["upserted"])
+            failed += len(result["failed"])
+            for pid, err in result["failed"].items():
+                self.stderr.write(f"{pid}: {err}")
+            self.stdout.write(f"... {copied} copied")
+
+            if not offset:
+                break
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Copied {copied} points from '{source}' to '{target}' ({failed} failed). "
+            f"Set QDRANT_COLLECTION={target} to switch over."
+        ))
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+
+from qdrant_client.http import models
+
+from resume.services.qdrant_service import COLLECTION_NAME, qdrant_client
+from resume.services.text_store import put_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Move inline resume_text out of Qdrant payloads into the compressed text "
+        "store, leaving a resume_text_ref behind."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        if not qdrant_client:
+            self.stderr.write("Qdrant not initialized")
+            return
+
+        only_inline = models.Filter(
+            must_not=[models.IsEmptyCondition(is_empty=models.PayloadField(key="resume_text"))]
+        )
+
+        moved = skipped = 0
+        offset = None
+        while True:
+            records, offset = qdrant_client.scroll(
+                collection_name=COLLECTION_NAME,
+                scroll_filter=only_inline,
+                with_payload=models.PayloadSelectorInclude(include=["resume_text", "file_hash"]),
+                with_vectors=False,
+                limit=opts["batch_size"],
+                offset=offset,
+            )
+
+            for rec in records:
+                payload = rec.payload or {}
+                text = payload.get("resume_text")
+                file_hash = payload.get("file_hash")
+                if not text or not file_hash:
+                    skipped += 1
+                    continue
+                if opts["dry_run"]:
+                    moved += 1
+                    continue
+
+                ref = put_text(file_hash, text)
+                qdrant_client.set_payload(
+                    collection_name=COLLECTION_NAME,
+                    payload={"resume_text_ref": ref},
+                    points=[rec.id],
+                )
+                qdrant_client.delete_payload(
+                    collection_name=COLLECTION_NAME,
+                    keys=["resume_text"],
+                    points=[rec.id],
+                )
+                moved += 1
+
+            if not offset:
+                break
+
+        verb = "Would move" if opts["dry_run"] else "Moved"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {moved} resume texts ({skipped} skipped)"))
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from qdrant_client.http import models
+
+from resume.services.ingestion_service import normalize_experience_years, normalize_skills
+from resume.services.qdrant_service import COLLECTION_NAME, qdrant_client
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite skills (lowercased, stripped, de-duplicated) and experience_years "
+        "(whole years as an integer) on existing resume points, the form new "
+        "uploads are stored in, so dashboard facets and range counts see them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=256)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        if not qdrant_client:
+            self.stderr.write("Qdrant not initialized")
+            return
+
+        updated = scanned = 0
+        offset = None
+        while True:
+            records, offset = qdrant_client.scroll(
+                collection_name=COLLECTION_NAME,
+                with_payload=models.PayloadSelectorInclude(include=["skills", "experience_years"]),
+                with_vectors=False,
+                limit=opts["batch_size"],
+                offset=offset,
+            )
+
+            for rec in records:
+                scanned += 1
+                payload = rec.payload or {}
+                changes = {}
+
+                if "skills" in payload:
+                    skills = normalize_skills(payload["skills"])
+                    if skills != payload["skills"]:
+                        changes["skills"] = skills
+
+                if "experience_years" in payload:
+                    years = normalize_experience_years(payload["experience_years"])
+                    if years != payload["experience_years"] or type(years) is not type(payload["experience_years"]):
+                        changes["experience_years"] = years
+
+                if not changes:
+                    continue
+                updated += 1
+                if not opts["dry_run"]:
+                    qdrant_client.set_payload(
+                        collection_name=COLLECTION_NAME,
+                        payload=changes,
+                        points=[rec.id],
+                    )
+
+            if not offset:
+                break
+
+        verb = "Would update" if opts["dry_run"] else "Updated"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {updated} of {scanned} resumes"))
@@ -0,0 +1,49 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.services import embedding_service
+from resume.services.embedding_server import run_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the shared embedding worker(s). Point web workers at them with "
+        "EMBEDDING_SERVER_SOCKET (comma-separated when --workers > 1)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--socket", default="/tmp/talentlens-embed.sock",
+                            help="Unix socket path (suffixed .0, .1, ... when --workers > 1)")
+        parser.add_argument("--workers", type=int, default=1, help="Number of server processes")
+        parser.add_argument("--max-batch", type=int, default=64,
+                            help="Max texts coalesced into one forward pass")
+        parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                            help="Max time a request waits for others to join its batch")
+
+    def handle(self, *args, **opts):
+        workers = max(1, opts["workers"])
+        authkey = embedding_service.server_authkey()
+        if not authkey:
+            raise CommandError("EMBEDDING_SERVER_AUTHKEY is not set; refusing to serve unauthenticated pickle traffic")
+
+        if workers == 1:
+            run_server(opts["socket"], opts["max_batch"], opts["max_wait_ms"], authkey)
+            return
+
+        paths = [f"{opts['socket']}.{i}" for i in range(workers)]
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(
+                target=run_server,
+                args=(path, opts["max_batch"], opts["max_wait_ms"], authkey),
+                name=f"embedding-server-{i}",
+            )
+            for i, path in enumerate(paths)
+        ]
+        for p in procs:
+            p.start()
+
+        self.stdout.write(f"EMBEDDING_SERVER_SOCKET={','.join(paths)}")
+        for p in procs:
+            p.join()
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from resume.services import ingestion_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued resume ingestion jobs outside the web process. Several workers "
+        "can run at once; set INGEST_WORKER_IN_PROCESS=false on the web workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Process the jobs queued right now, then exit")
+
+    def handle(self, *args, **opts):
+        if not opts["once"]:
+            ingestion_service.run_worker_forever()
+            return
+
+        processed = 0
+        while True:
+            job = ingestion_service.claim_next_job()
+            if job is None:
+                break
+            ingestion_service.run_job(job)
+            processed += 1
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} ingestion job(s)"))
@@ -0,0 +1,207 @@
+import random
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.services.extract_data import calculate_cpd_level
+from resume.services.qdrant_service import (
+    COLLECTION_NAME,
+    JOB_COLLECTION,
+    JOB_COLLECTIONS,
+    QDRANT_PATH,
+    RESUME_VECTORS,
+    SPARSE_VECTOR,
+    VECTOR_SIZE,
+    qdrant_client,
+    upsert_points_bulk,
+)
+from resume.services.sparse_service import document_sparse_vector
+
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Meera",
+               "Karthik", "Divya", "Rohan", "Isha", "Sanjay", "Neha", "Aditya", "Kavya"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Nair", "Gupta", "Menon", "Rao",
+              "Singh", "Das", "Kulkarni", "Joshi"]
+
+SKILLS_BY_DEPARTMENT = {
+    "engineering_it": ["python", "django", "react", "aws", "kubernetes", "docker", "postgresql",
+                       "java", "spring boot", "terraform", "node.js", "typescript", "ci/cd",
+                       "microservices", "machine learning", "sql", "azure", "go"],
+    "human_resources": ["recruitment", "payroll", "onboarding", "employee relations", "hris",
+                        "talent acquisition", "performance management", "compliance"],
+    "sales_marketing": ["sales forecasting", "crm", "salesforce", "seo", "content marketing",
+                        "lead generation", "negotiation", "google analytics"],
+    "finance_accounting": ["financial reporting", "excel", "tally", "gst", "budgeting",
+                           "auditing", "sap", "tableau", "financial modeling"],
+}
+
+TITLES_BY_DEPARTMENT = {
+    "engineering_it": ["Software Engineer", "Backend Developer", "DevOps Engineer", "Data Engineer"],
+    "human_resources": ["HR Generalist", "Talent Acquisition Specialist", "HR Manager"],
+    "sales_marketing": ["Sales Executive", "Digital Marketing Manager", "Account Manager"],
+    "finance_accounting": ["Accountant", "Financial Analyst", "Audit Associate"],
+}
+
+SENTENCES = [
+    "{title} with {years} years of experience in {a} and {b}.",
+    "Built and maintained {a} solutions, working closely with teams using {b}.",
+    "Led initiatives around {a}, improving delivery by {n}% through {b}.",
+    "Hands-on with {a}, {b} and {c} across multiple client engagements.",
+]
+
+
+def _random_unit_vectors(rng: np.random.Generator, n: int) -> np.ndarray:
+    vecs = rng.normal(size=(n, VECTOR_SIZE)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed the resumes and job collections with synthetic data, e.g. in embedded "
+        "local mode (QDRANT_PATH=:memory: or a directory) for offline benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resumes", type=int, default=1000)
+        parser.add_argument("--jobs", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=256)
+        parser.add_argument(
+            "--random-vectors", action="store_true",
+            help="Use random unit vectors instead of running the embedding model (much faster)",
+        )
+        parser.add_argument(
+            "--allow-remote", action="store_true",
+            help="Allow seeding a remote Qdrant (by default only local mode is seeded)",
+        )
+
+    def handle(self, *args, **opts):
+        if not qdrant_client:
+            raise CommandError("Qdrant not initialized")
+        if not QDRANT_PATH and not opts["allow_remote"]:
+            raise CommandError("QDRANT_PATH is not set; pass --allow-remote to seed a remote Qdrant")
+
+        rnd = random.Random(opts["seed"])
+        rng = np.random.default_rng(opts["seed"])
+
+        resumes = [self._fake_resume(rnd) for _ in range(opts["resumes"])]
+        jobs = [self._fake_job(rnd) for _ in range(opts["jobs"])]
+
+        self._seed_resumes(resumes, rng, opts)
+        self._seed_jobs(jobs, rng, opts)
+
+    # ---------------- synthetic records ----------------
+    def _fake_resume(self, rnd: random.Random):
+        dept = rnd.choice(list(SKILLS_BY_DEPARTMENT))
+        pool = SKILLS_BY_DEPARTMENT[dept]
+        skills = sorted(set(rnd.sample(pool, k=min(len(pool), rnd.randint(3, 8)))))
+        years = rnd.randint(0, 20)
+        title = rnd.choice(TITLES_BY_DEPARTMENT[dept])
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        name = f"{first} {last}"
+
+        lines = [name, title]
+        for _ in range(rnd.randint(6, 20)):
+            a, b, c = (rnd.choice(skills) for _ in range(3))
+            lines.append(rnd.choice(SENTENCES).format(
+                title=title, years=years, a=a, b=b, c=c, n=rnd.randint(5, 40),
+            ))
+        lines.append("Skills: " + ", ".join(skills))
+
+        file_name = f"{first}_{last}_{uuid.UUID(int=rnd.getrandbits(128)).hex[:8]}.pdf"
+        point_id = str(uuid.UUID(int=rnd.getrandbits(128)))
+        return {
+            "id": point_id,
+            "text": "\n".join(lines),
+            "skills": skills,
+            "payload": {
+                "s3_url": f"https://example-bucket.s3.amazonaws.com/resumes/{file_name}",
+                "candidate_name": name,
+                "email": f"{first}.{last}.{point_id[:6]}@example.com".lower(),
+                "file_hash": uuid.UUID(int=rnd.getrandbits(128)).hex * 2,
+                "file_name": file_name,
+                "readable_file_name": file_name,
+                "experience_years": years,
+                "cpd_level": calculate_cpd_level(years),
+                "skills": skills,
+                "salary": float(rnd.randrange(300000, 4000000, 50000)),
+                "salary_currency": "INR",
+                "candidate_type": rnd.choice(["internal", "external"]),
+                # Inline text keeps fixtures independent of the text store backend
+                "resume_text": "\n".join(lines),
+            },
+        }
+
+    def _fake_job(self, rnd: random.Random):
+        dept = rnd.choice(list(JOB_COLLECTIONS))
+        pool = SKILLS_BY_DEPARTMENT[dept]
+        skills = rnd.sample(pool, k=min(len(pool), rnd.randint(3, 6)))
+        title = rnd.choice(TITLES_BY_DEPARTMENT[dept])
+        posted = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 365))
+        return {
+            "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+            "text": f"{title} {', '.join(skills)}",
+            "payload": {
+                "jobTitle": title,
+                "department": JOB_COLLECTIONS[dept],
+                "department_key": dept,
+                "requiredSkills": ", ".join(skills),
+                "summary": f"We are hiring a {title} experienced in {', '.join(skills)}.",
+                "location": rnd.choice(["Bengaluru", "Hyderabad", "Pune", "Remote"]),
+                "jobType": rnd.choice(["Full-time", "Contract"]),
+                "status": rnd.choice(["Open", "Open", "Closed"]),
+                "postingDate": posted.isoformat(),
+                "contactEmail": "hiring.manager@example.com",
+                "hiringManagerName": "Hiring Manager",
+            },
+        }
+
+    # ---------------- writes ----------------
+    def _seed_resumes(self, resumes, rng, opts):
+        if not resumes:
+            return
+
+        if opts["random_vectors"]:
+            named = {name: _random_unit_vectors(rng, len(resumes)) for name in RESUME_VECTORS}
+        else:
+            from resume.services.embedding_service import get_resume_embeddings
+            named = get_resume_embeddings([r["text"] for r in resumes], [r["skills"] for r in resumes])
+
+        points = [
+            {
+                "id": r["id"],
+                "vector": {
+                    **{name: named[name][i].tolist() for name in RESUME_VECTORS},
+                    SPARSE_VECTOR: document_sparse_vector(r["text"], r["skills"]),
+                },
+                "payload": r["payload"],
+            }
+            for i, r in enumerate(resumes)
+        ]
+        result = upsert_points_bulk(points, batch_size=opts["batch_size"], wait=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(result['upserted'])} resumes into '{COLLECTION_NAME}' ({len(result['failed'])} failed)"
+        ))
+
+    def _seed_jobs(self, jobs, rng, opts):
+        if not jobs:
+            return
+
+        if opts["random_vectors"]:
+            vectors = _random_unit_vectors(rng, len(jobs))
+        else:
+            from resume.services.embedding_service import get_text_embeddings
+            vectors = get_text_embeddings([j["text"] for j in jobs])
+
+        points = [
+            {"id": j["id"], "vector": vectors[i].tolist(), "payload": j["payload"]}
+            for i, j in enumerate(jobs)
+        ]
+        result = upsert_points_bulk(
+            points, batch_size=opts["batch_size"], wait=True, collection_name=JOB_COLLECTION,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(result['upserted'])} jobs into '{JOB_COLLECTION}' ({len(result['failed'])} failed)"
+        ))
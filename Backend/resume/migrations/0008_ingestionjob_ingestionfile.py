@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0007_confirmedmatch_candidate_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('batch_meta', models.JSONField(default=dict)),
+                ('file_count', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ingestion_jobs', to='resume.appuser')),
+            ],
+            options={
+                'db_table': 'ingestion_jobs',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='IngestionFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.IntegerField()),
+                ('file_name', models.CharField(max_length=500)),
+                ('content_type', models.CharField(blank=True, default='', max_length=100)),
+                ('staged_path', models.CharField(blank=True, default='', max_length=1000)),
+                ('stage', models.CharField(choices=[('staged', 'Staged'), ('duplicate_check', 'Duplicate check'), ('extracting', 'Extracting'), ('uploading', 'Uploading'), ('embedding', 'Embedding'), ('indexing', 'Indexing'), ('finished', 'Finished')], default='staged', max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('uploaded', 'Uploaded'), ('duplicate', 'Duplicate'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('error', models.TextField(blank=True, default='')),
+                ('point_id', models.CharField(blank=True, default='', max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='resume.ingestionjob')),
+            ],
+            options={
+                'db_table': 'ingestion_files',
+                'ordering': ['position'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0008_ingestionjob_ingestionfile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractionResult',
+            fields=[
+                ('file_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('fields', models.JSONField(default=dict)),
+                ('resume_text_ref', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'extraction_results',
+            },
+        ),
+    ]
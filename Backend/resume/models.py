@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.hashers import make_password, check_password
  
@@ -119,4 +121,98 @@ class ConfirmedMatch(models.Model):
         return f"{self.candidate_name} -> {self.jd_title}"
     hiring_stage = models.CharField(max_length=100, default="Applied")
  
- 
\ No newline at end of file
+ 
+
+# ===============================
+# Resume ingestion jobs (background upload pipeline)
+# ===============================
+class IngestionJob(models.Model):
+    """
+    One upload batch. ResumeUploadView stages the files on disk and returns
+    the job id; an ingestion worker claims queued jobs and processes them.
+    """
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued", db_index=True)
+    created_by = models.ForeignKey(
+        AppUser, on_delete=models.SET_NULL, null=True, blank=True, related_name="ingestion_jobs"
+    )
+    batch_meta = models.JSONField(default=dict)  # salary / salary_currency / candidate_type
+    file_count = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Touched by the worker while it runs; a stale heartbeat lets another
+    # worker pick the job up again
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'ingestion_jobs'
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"Ingestion {self.id} ({self.status}, {self.file_count} files)"
+
+
+class IngestionFile(models.Model):
+    STAGE_CHOICES = [
+        ("staged", "Staged"),
+        ("duplicate_check", "Duplicate check"),
+        ("extracting", "Extracting"),
+        ("uploading", "Uploading"),
+        ("embedding", "Embedding"),
+        ("indexing", "Indexing"),
+        ("finished", "Finished"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("uploaded", "Uploaded"),
+        ("duplicate", "Duplicate"),
+        ("failed", "Failed"),
+    ]
+
+    job = models.ForeignKey(IngestionJob, on_delete=models.CASCADE, related_name="files")
+    position = models.IntegerField()  # order within the upload
+    file_name = models.CharField(max_length=500)
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    staged_path = models.CharField(max_length=1000, blank=True, default="")
+
+    stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default="staged")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    error = models.TextField(blank=True, default="")
+    point_id = models.CharField(max_length=255, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ingestion_files'
+        ordering = ["position"]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.stage}/{self.status})"
+
+
+class ExtractionResult(models.Model):
+    """
+    Fields extract_fields() produced for one file's content, keyed by its
+    SHA-256. A re-upload of the same bytes reuses them instead of calling
+    Bedrock again; the text itself lives in the text store (resume_text_ref).
+    """
+    file_hash = models.CharField(max_length=64, primary_key=True)
+    fields = models.JSONField(default=dict)  # candidate_name / email / experience_years / cpd_level / skills
+    resume_text_ref = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'extraction_results'
+
+    def __str__(self):
+        return f"Extraction {self.file_hash[:12]}"
@@ -0,0 +1,377 @@
+# resume/services/async_qdrant_service.py
+"""
+Async twin of qdrant_service for the read-heavy endpoints, built on
+AsyncQdrantClient so one ASGI worker can keep many Qdrant calls in flight.
+
+Schema checks, vector layout detection and request building are shared with
+qdrant_service (the sync helpers are only run off the event loop on their
+first, uncached call). In embedded local mode (QDRANT_PATH) the storage can't
+be opened twice, so calls go through the sync client on a worker thread.
+
+Clients are cached per event loop. Under ASGI that is one client per worker
+process, kept for its lifetime. Under runserver/WSGI async_to_sync runs every
+async view on a fresh loop, so the views close the loop's client at the end of
+the request (close_async_client) instead of leaking one per request.
+"""
+import asyncio
+import weakref
+from typing import Any, Dict, List, Optional
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from . import qdrant_service as qs
+from .qdrant_service import (
+    COLLECTION_NAME,
+    JOB_COLLECTION,
+    QDRANT_PATH,
+    QDRANT_URL,
+    TEXT_VECTOR,
+    VECTOR_SIZE,
+    _combine_weighted_results,
+    _fusion_mode,
+    _hybrid_prefetch,
+    _payload_selector,
+    _weighted_search_requests,
+    build_search_params,
+    job_department_filter,
+    remote_client_kwargs,
+)
+
+# event loop -> client; entries go away with their loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncQdrantClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client() -> Optional[AsyncQdrantClient]:
+    """AsyncQdrantClient for the running event loop, or None in local mode / without a URL."""
+    if QDRANT_PATH or not QDRANT_URL:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncQdrantClient(**remote_client_kwargs())
+    return client
+
+
+async def close_async_client():
+    """Close and forget the running loop's client (its connections die with the loop)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"⚠️ Failed to close async Qdrant client: {e}")
+
+
+# ======================================================
+# Schema (shared with the sync service)
+# ======================================================
+async def _ensure_schema(collection_name: str):
+    if collection_name not in qs._confirmed_collections:
+        await asyncio.to_thread(qs.ensure_schema, collection_name)
+
+
+async def _layout(collection_name: str) -> Dict[str, bool]:
+    layout = qs._vector_layout.get(collection_name)
+    if layout is None:
+        layout = await asyncio.to_thread(qs._get_vector_layout, collection_name)
+    return layout
+
+
+async def with_schema(collection_name: str, make_call):
+    """Async version of qdrant_service.with_schema: `make_call()` returns a coroutine."""
+    await _ensure_schema(collection_name)
+    try:
+        return await make_call()
+    except Exception as e:
+        if not qs._is_missing_collection_error(e):
+            raise
+        print(f"⚠️ Collection '{collection_name}' missing, re-initializing schema")
+        qs.invalidate_schema(collection_name)
+        await _ensure_schema(collection_name)
+        return await make_call()
+
+
+# ======================================================
+# Search
+# ======================================================
+async def search_collection(
+    query_vector: List[float],
+    query_filter: Optional[models.Filter] = None,
+    limit: int = 50,
+    min_score: float = 0.30,
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: bool = False,
+    vector_name: str = TEXT_VECTOR,
+):
+    client = get_async_client()
+    if client is None:
+        return await asyncio.to_thread(
+            qs.search_collection, query_vector, query_filter, limit, min_score,
+            fields, exclude_fields, hnsw_ef, exact, vector_name,
+        )
+
+    if not query_vector or len(query_vector) != VECTOR_SIZE:
+        query_vector = [0.0] * VECTOR_SIZE
+    q_filter = query_filter if isinstance(query_filter, models.Filter) else None
+
+    if (await _layout(COLLECTION_NAME))["named"]:
+        query_vector = models.NamedVector(name=vector_name, vector=query_vector)
+
+    try:
+        results = await with_schema(COLLECTION_NAME, lambda: client.search(
+            collection_name=COLLECTION_NAME,
+            query_vector=query_vector,
+            query_filter=q_filter,
+            limit=limit,
+            with_payload=_payload_selector(fields, exclude_fields),
+            with_vectors=False,
+            search_params=build_search_params(hnsw_ef=hnsw_ef, exact=exact),
+        ))
+    except Exception as e:
+        print(f"❌ Qdrant search error: {e}")
+        return []
+
+    strong_matches = [r for r in results if (r.score is not None and r.score >= min_score)]
+    return strong_matches if strong_matches else results
+
+
+async def search_resumes_weighted(
+    query_vectors: Dict[str, List[float]],
+    weights: Dict[str, float],
+    query_filter: Optional[models.Filter] = None,
+    limit: int = 50,
+    min_score: float = 0.30,
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+):
+    client = get_async_client()
+    if client is None:
+        return await asyncio.to_thread(
+            qs.search_resumes_weighted, query_vectors, weights, query_filter,
+            limit, min_score, fields, exclude_fields,
+        )
+
+    weights = {n: w for n, w in (weights or {}).items() if query_vectors.get(n)}
+    if not weights:
+        weights = {TEXT_VECTOR: 1.0}
+
+    if not (await _layout(COLLECTION_NAME))["named"] or len(weights) == 1:
+        name = next(iter(weights))
+        return await search_collection(
+            query_vectors.get(name) or query_vectors.get(TEXT_VECTOR),
+            query_filter=query_filter,
+            limit=limit,
+            min_score=min_score,
+            fields=fields,
+            exclude_fields=exclude_fields,
+            vector_name=name,
+        )
+
+    names = list(weights)
+    requests = _weighted_search_requests(query_vectors, names, query_filter, limit, fields, exclude_fields)
+    try:
+        batches = await with_schema(COLLECTION_NAME, lambda: client.search_batch(
+            collection_name=COLLECTION_NAME,
+            requests=requests,
+        ))
+    except Exception as e:
+        print(f"❌ Qdrant weighted search error: {e}")
+        return []
+
+    return _combine_weighted_results(names, batches, weights, limit, min_score)
+
+
+async def hybrid_search(
+    query_vectors: Dict[str, List[float]],
+    sparse_vector: models.SparseVector,
+    vector_names: Optional[List[str]] = None,
+    fusion: str = "rrf",
+    query_filter: Optional[models.Filter] = None,
+    limit: int = 50,
+    prefetch_limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+):
+    """Same contract as qdrant_service.hybrid_search (None without a sparse vector)."""
+    client = get_async_client()
+    if client is None:
+        return await asyncio.to_thread(
+            qs.hybrid_search, query_vectors, sparse_vector, vector_names, fusion,
+            query_filter, limit, prefetch_limit, fields, exclude_fields,
+        )
+
+    layout = await _layout(COLLECTION_NAME)
+    if not (layout["named"] and layout["sparse"]):
+        return None
+
+    q_filter = query_filter if isinstance(query_filter, models.Filter) else None
+    prefetch = _hybrid_prefetch(query_vectors, sparse_vector, vector_names, q_filter, prefetch_limit or limit * 2)
+    if not prefetch:
+        return []
+
+    try:
+        response = await with_schema(COLLECTION_NAME, lambda: client.query_points(
+            collection_name=COLLECTION_NAME,
+            prefetch=prefetch,
+            query=models.FusionQuery(fusion=_fusion_mode(fusion)),
+            query_filter=q_filter,
+            limit=limit,
+            with_payload=_payload_selector(fields, exclude_fields),
+            with_vectors=False,
+        ))
+    except Exception as e:
+        print(f"❌ Qdrant hybrid search error: {e}")
+        return []
+
+    return response.points
+
+
+# ======================================================
+# Listing / Retrieval
+# ======================================================
+async def list_points_filtered(*args, **kwargs) -> Dict[str, Any]:
+    """
+    Cursor listing from qdrant_service, run on a worker thread: its tie-group
+    state machine makes several dependent scroll calls per page.
+    """
+    return await asyncio.to_thread(qs.list_points_filtered, *args, **kwargs)
+
+
+async def get_points_paginated(
+    collection_name: str = COLLECTION_NAME,
+    offset=None,
+    limit: int = 12,
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+):
+    client = get_async_client()
+    if client is None:
+        return await asyncio.to_thread(
+            qs.get_points_paginated, collection_name, offset, limit, fields, exclude_fields,
+        )
+
+    try:
+        return await with_schema(collection_name, lambda: client.scroll(
+            collection_name=collection_name,
+            with_payload=_payload_selector(fields, exclude_fields),
+            with_vectors=False,
+            limit=limit,
+            offset=offset,
+        ))
+    except Exception as e:
+        print(f"❌ Pagination Scroll failed: {e}")
+        return [], None
+
+
+async def retrieve_point(point_id: str, fields: Optional[List[str]] = None, collection_name: str = COLLECTION_NAME):
+    """Single record by id, or None."""
+    client = get_async_client()
+    if client is None:
+        try:
+            return await asyncio.to_thread(qs.retrieve_point, point_id, fields)
+        except Exception:
+            return None
+
+    records = await with_schema(collection_name, lambda: client.retrieve(
+        collection_name=collection_name,
+        ids=[point_id],
+        with_payload=_payload_selector(fields),
+    ))
+    return records[0] if records else None
+
+
+async def get_all_job_postings(collection_key: Optional[str] = None,
+                               query_filter: Optional[models.Filter] = None) -> List[Any]:
+    """Postings of one department (or all) from the shared job collection."""
+    q_filter = job_department_filter(collection_key, query_filter)
+
+    client = get_async_client()
+    if client is None:
+        return await asyncio.to_thread(
+            lambda: list(qs.iter_job_postings(query_filter=q_filter, prefetch=False))
+        )
+
+    all_records, offset = [], None
+    try:
+        while True:
+            records, offset = await with_schema(JOB_COLLECTION, lambda: client.scroll(
+                collection_name=JOB_COLLECTION,
+                scroll_filter=q_filter,
+                with_payload=True,
+                with_vectors=False,
+                limit=200,
+                offset=offset,
+            ))
+            all_records.extend(records)
+            if offset is None:
+                return all_records
+    except Exception as e:
+        print(f"❌ Scroll failed for {JOB_COLLECTION}: {e}")
+        return []
+
+
+async def retrieve_job(job_id: str):
+    """The posting with this id in any department, or None."""
+    client = get_async_client()
+    if client is None:
+        return await asyncio.to_thread(qs.retrieve_job, job_id)
+
+    try:
+        records = await with_schema(JOB_COLLECTION, lambda: client.retrieve(
+            collection_name=JOB_COLLECTION, ids=[job_id],
+        ))
+    except Exception as e:
+        print(f"❌ Job retrieve failed for {job_id}: {e}")
+        return None
+    return records[0] if records else None
+
+
+# ======================================================
+# Aggregations
+# ======================================================
+async def count_points(query_filter: Optional[models.Filter] = None, collection_name: str = COLLECTION_NAME) -> int:
+    client = get_async_client()
+    if client is None:
+        return await asyncio.to_thread(qs.count_points, query_filter, collection_name)
+
+    result = await with_schema(collection_name, lambda: client.count(
+        collection_name=collection_name,
+        count_filter=query_filter,
+        exact=True,
+    ))
+    return result.count
+
+
+async def count_by_filters(
+    filters: Dict[str, Optional[models.Filter]],
+    collection_name: str = COLLECTION_NAME,
+) -> Dict[str, int]:
+    names = list(filters)
+    counts = await asyncio.gather(*(count_points(filters[n], collection_name) for n in names))
+    return dict(zip(names, counts))
+
+
+async def facet_counts(
+    key: str,
+    limit: int = 20,
+    query_filter: Optional[models.Filter] = None,
+    exact: bool = False,
+    collection_name: str = COLLECTION_NAME,
+) -> Dict[Any, int]:
+    client = get_async_client()
+    if client is None:
+        return await asyncio.to_thread(qs.facet_counts, key, limit, query_filter, exact, collection_name)
+
+    response = await with_schema(collection_name, lambda: client.facet(
+        collection_name=collection_name,
+        key=key,
+        facet_filter=query_filter,
+        limit=limit,
+        exact=exact,
+    ))
+    return {hit.value: hit.count for hit in response.hits}
@@ -0,0 +1,140 @@
+# resume/services/embedding_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive form of a text, used for cache keys."""
+    return " ".join((text or "").split())
+
+
+def make_key(model_id: str, text: str) -> str:
+    """SHA-256 of the model id plus the normalized text."""
+    raw = f"{model_id}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+# ======================================================
+# Embedding Cache (LRU memory tier + optional SQLite tier)
+# ======================================================
+class EmbeddingCache:
+    """
+    Content-addressed cache of float32 embedding rows.
+    Lookups hit the in-process LRU first, then the on-disk SQLite table
+    (if a path is configured); disk hits are promoted into memory.
+    """
+
+    def __init__(self, max_items: int = 10000, disk_path: Optional[str] = None):
+        self.max_items = max(0, int(max_items))
+        self.disk_path = disk_path or None
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.disk_path)), exist_ok=True)
+                self._conn = sqlite3.connect(self.disk_path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+                )
+                self._conn.commit()
+            except Exception as e:
+                print(f"⚠️ Embedding disk cache disabled ({self.disk_path}): {e}")
+                self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0 or self._conn is not None
+
+    # ---------------- memory tier ----------------
+    def _remember(self, key: str, vec: np.ndarray):
+        if self.max_items <= 0:
+            return
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    # ---------------- public API ----------------
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                vec = self._memory.get(key)
+                if vec is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vec
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            if missing and self._conn is not None:
+                try:
+                    placeholders = ",".join("?" * len(missing))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        missing,
+                    ).fetchall()
+                except Exception as e:
+                    print(f"⚠️ Embedding disk cache read failed: {e}")
+                    rows = []
+
+                for key, blob in rows:
+                    vec = np.frombuffer(blob, dtype=np.float32)
+                    found[key] = vec
+                    self._remember(key, vec)
+                    self.disk_hits += 1
+
+            self.misses += sum(1 for k in set(missing) if k not in found)
+
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, np.ndarray]]):
+        rows = []
+        with self._lock:
+            for key, vec in items:
+                vec = np.asarray(vec, dtype=np.float32)
+                self._remember(key, vec)
+                rows.append((key, vec.tobytes()))
+
+            if rows and self._conn is not None:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    print(f"⚠️ Embedding disk cache write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_items": len(self._memory),
+                "max_items": self.max_items,
+                "disk_enabled": self._conn is not None,
+            }
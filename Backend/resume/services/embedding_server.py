@@ -0,0 +1,150 @@
+# resume/services/embedding_server.py
+#
+# Out-of-process embedding worker. Web workers connect over a Unix socket
+# (EMBEDDING_SERVER_SOCKET) instead of each loading their own copy of the model;
+# concurrent encode requests are coalesced into micro-batches.
+import os
+import queue
+import threading
+import time
+from multiprocessing.connection import Listener
+from typing import List, Optional
+
+import numpy as np
+
+from . import embedding_service
+
+
+class _EncodeRequest:
+    __slots__ = ("texts", "done", "result", "error")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result: Optional[np.ndarray] = None
+        self.error: Optional[str] = None
+
+
+# ======================================================
+# Embedding Server
+# ======================================================
+class EmbeddingServer:
+    """
+    Serves ("encode", texts, batch_size), ("chunk", texts, window, overlap) and
+    ("info",) requests. Encode requests from all connections go through one
+    batcher thread: it waits up to max_wait_ms for more requests (or until
+    max_batch texts are queued) and runs a single forward pass for all of them.
+    """
+
+    def __init__(self, socket_path: str, max_batch: int = 64, max_wait_ms: float = 5.0,
+                 authkey: Optional[bytes] = None):
+        # requests are pickled, so never accept unauthenticated connections
+        if not authkey:
+            raise ValueError("Embedding server requires an authkey (EMBEDDING_SERVER_AUTHKEY)")
+        self.socket_path = socket_path
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.authkey = authkey
+        self._queue: "queue.Queue[_EncodeRequest]" = queue.Queue()
+
+    # ---------------- batching ----------------
+    def _collect_batch(self) -> List[_EncodeRequest]:
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                req = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(req)
+            size += len(req.texts)
+        return batch
+
+    def _batch_loop(self):
+        while True:
+            batch = self._collect_batch()
+            texts = [t for req in batch for t in req.texts]
+            try:
+                emb = embedding_service._local_encode(texts, self.max_batch)
+                pos = 0
+                for req in batch:
+                    req.result = emb[pos:pos + len(req.texts)]
+                    pos += len(req.texts)
+            except Exception as e:
+                for req in batch:
+                    req.error = str(e)
+            for req in batch:
+                req.done.set()
+
+    # ---------------- connections ----------------
+    def _handle(self, op: str, args):
+        if op == "encode":
+            req = _EncodeRequest(list(args[0]))
+            if not req.texts:
+                dim = embedding_service.get_model().get_sentence_embedding_dimension()
+                return np.zeros((0, dim), dtype=np.float32)
+            self._queue.put(req)
+            req.done.wait()
+            if req.error:
+                raise RuntimeError(req.error)
+            return req.result
+        if op == "chunk":
+            texts, window, overlap = args
+            return embedding_service._local_chunk_texts(texts, window, overlap)
+        if op == "info":
+            model = embedding_service.get_model()
+            return {
+                "dim": model.get_sentence_embedding_dimension(),
+                "max_seq_length": model.max_seq_length,
+                "model_id": embedding_service.model_id(),
+            }
+        raise ValueError(f"Unknown op '{op}'")
+
+    def _serve_connection(self, conn):
+        try:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    conn.send(("ok", self._handle(op, args)))
+                except Exception as e:
+                    conn.send(("error", str(e)))
+        finally:
+            conn.close()
+
+    def serve_forever(self):
+        embedding_service.warmup_local()
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        threading.Thread(target=self._batch_loop, name="embedding-batcher", daemon=True).start()
+
+        # Create the socket with 0660 permissions from the start (no chmod window)
+        old_umask = os.umask(0o117)
+        try:
+            listener = Listener(self.socket_path, family="AF_UNIX", authkey=self.authkey)
+        finally:
+            os.umask(old_umask)
+
+        with listener:
+            print(f"✅ Embedding server listening on {self.socket_path} "
+                  f"(max_batch={self.max_batch}, max_wait={self.max_wait * 1000:.1f}ms)")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"⚠️ Embedding server accept failed: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+
+def run_server(socket_path: str, max_batch: int, max_wait_ms: float, authkey: Optional[bytes] = None):
+    EmbeddingServer(socket_path, max_batch, max_wait_ms, authkey).serve_forever()
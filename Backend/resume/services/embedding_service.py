@@ -1,9 +1,404 @@
-from sentence_transformers import SentenceTransformer
+import itertools
+import os
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from .embedding_cache import EmbeddingCache, make_key
+
+MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+# "torch" (default) or "onnx": same model run through ONNX Runtime with an
+# int8 dynamically-quantized graph. Both return 384-dim vectors.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").strip().lower()
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx").strip()
+
+# Number of texts sent through a single SentenceTransformer.encode forward pass
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+
+# Resume text is split into overlapping token windows before embedding.
+# 0 means "use the model's max_seq_length" (minus room for special tokens).
+EMBEDDING_CHUNK_TOKENS = int(os.getenv("EMBEDDING_CHUNK_TOKENS", "0"))
+EMBEDDING_CHUNK_OVERLAP = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "32"))
+
+# Comma-separated Unix socket path(s) of `manage.py run_embedding_server`.
+# When set, encoding and chunking are done by the server process(es) and this
+# process never loads the model.
+EMBEDDING_SERVER_SOCKET = os.getenv("EMBEDDING_SERVER_SOCKET", "").strip()
+
+# In-process LRU entries (0 disables) and optional SQLite file for the disk tier
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "").strip()
+
+embedding_cache = EmbeddingCache(
+    max_items=EMBEDDING_CACHE_SIZE,
+    disk_path=EMBEDDING_CACHE_PATH or None,
+)
+
+
+def model_id(backend: str = EMBEDDING_BACKEND) -> str:
+    """Identifies model + backend; quantized vectors differ slightly, so they get their own cache keys."""
+    if backend == "onnx":
+        return f"{MODEL_NAME}:onnx:{EMBEDDING_ONNX_FILE}"
+    return MODEL_NAME
+
+
+# ======================================================
+# Lazy model loader
+# ======================================================
+# The model (and torch) is only imported on first use, so manage.py commands,
+# migrations and freshly forked workers don't pay for it unless they embed.
+_model = None
+_model_lock = threading.Lock()
+# HF fast tokenizers are not safe to call from several threads at once
+_tokenizer_lock = threading.Lock()
+
+
+def load_model(backend: str = EMBEDDING_BACKEND):
+    """Build a SentenceTransformer for the given backend ("torch" or "onnx")."""
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "onnx":
+        # optional dependency, only needed for this backend
+        try:
+            import optimum.onnxruntime  # noqa: F401
+        except ImportError:
+            raise RuntimeError(
+                "EMBEDDING_BACKEND=onnx needs optimum[onnxruntime]: pip install -r requirements-onnx.txt"
+            )
+        return SentenceTransformer(
+            MODEL_NAME,
+            backend="onnx",
+            model_kwargs={"file_name": EMBEDDING_ONNX_FILE},
+        )
+    if backend != "torch":
+        raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}' (expected 'torch' or 'onnx')")
+    return SentenceTransformer(MODEL_NAME)
+
+
+def get_model():
+    """Return the process-wide SentenceTransformer, loading it on first call."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                print(f"⏳ Loading embedding model '{model_id()}'...")
+                _model = load_model()
+                print(f"✅ Embedding model '{model_id()}' loaded")
+    return _model
+
+
+def is_ready() -> bool:
+    """True once the model has been loaded in this process (or the embedding server answers a ping)."""
+    if EMBEDDING_SERVER_SOCKET:
+        try:
+            _remote_info_cache.update(_remote_call("info"))
+            return True
+        except Exception:
+            return False
+    return _model is not None
+
+
+def warmup() -> bool:
+    """Load the model and run one encode so the first real request is not slow."""
+    _encode(["warmup"], EMBEDDING_BATCH_SIZE)
+    return is_ready()
+
+
+def warmup_local():
+    """Warm the in-process model even when an embedding server is configured (used by the server itself)."""
+    get_model().encode(["warmup"], show_progress_bar=False)
+
+
+def start_background_warmup():
+    """Warm the model on a daemon thread (used by wsgi/asgi when EMBEDDING_WARMUP_ON_START is set)."""
+    def _run():
+        try:
+            warmup()
+        except Exception as e:
+            print(f"⚠️ Embedding warmup failed: {e}")
+
+    t = threading.Thread(target=_run, name="embedding-warmup", daemon=True)
+    t.start()
+    return t
+
+
+# ======================================================
+# Embedding server client
+# ======================================================
+_remote = threading.local()
+_remote_info_cache: Dict[str, int] = {}
+# Round-robin over the server pool; each thread keeps the slot it was given
+_socket_counter = itertools.count()
+
+
+def server_authkey() -> bytes:
+    """Shared secret for the embedding server socket (settings.EMBEDDING_SERVER_AUTHKEY)."""
+    from django.conf import settings
+
+    return (getattr(settings, "EMBEDDING_SERVER_AUTHKEY", "") or "").encode()
+
+
+def _server_sockets() -> List[str]:
+    return [p.strip() for p in EMBEDDING_SERVER_SOCKET.split(",") if p.strip()]
+
+
+def _remote_conn():
+    conn = getattr(_remote, "conn", None)
+    if conn is None:
+        from multiprocessing.connection import Client
+
+        authkey = server_authkey()
+        if not authkey:
+            raise RuntimeError("EMBEDDING_SERVER_AUTHKEY is not set")
+
+        sockets = _server_sockets()
+        slot = getattr(_remote, "slot", None)
+        if slot is None:
+            slot = _remote.slot = next(_socket_counter)
+        conn = Client(sockets[slot % len(sockets)], family="AF_UNIX", authkey=authkey)
+        _remote.conn = conn
+    return conn
+
+
+def _remote_call(op: str, *args):
+    """Send one request to the embedding server, reconnecting once on a dropped socket."""
+    for attempt in (1, 2):
+        try:
+            conn = _remote_conn()
+            conn.send((op, args))
+            status, result = conn.recv()
+            break
+        except (OSError, EOFError):
+            try:
+                _remote.conn.close()
+            except Exception:
+                pass
+            _remote.conn = None
+            # the server may have restarted with another model
+            _remote_info_cache.clear()
+            if attempt == 2:
+                raise
+    if status != "ok":
+        raise RuntimeError(f"Embedding server error: {result}")
+    return result
+
+
+def _remote_info() -> Dict[str, int]:
+    if not _remote_info_cache:
+        _remote_info_cache.update(_remote_call("info"))
+    return _remote_info_cache
+
+
+# ======================================================
+# Encoding
+# ======================================================
+def embedding_dim() -> int:
+    if EMBEDDING_SERVER_SOCKET:
+        return int(_remote_info()["dim"])
+    return get_model().get_sentence_embedding_dimension()
+
+
+def _local_encode(texts: List[str], batch_size: int) -> np.ndarray:
+    emb = get_model().encode(
+        texts,
+        batch_size=max(1, int(batch_size)),
+        convert_to_numpy=True,
+        show_progress_bar=False,
+    )
+    return emb.astype(np.float32, copy=False)
+
+
+def _encode(texts: List[str], batch_size: int) -> np.ndarray:
+    if EMBEDDING_SERVER_SOCKET:
+        return np.asarray(_remote_call("encode", texts, batch_size), dtype=np.float32)
+    return _local_encode(texts, batch_size)
+
+
+def get_text_embeddings(
+    texts: List[str],
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    use_cache: bool = True,
+) -> np.ndarray:
+    """
+    Encode a list of texts in batches.
+    Returns a float32 matrix of shape (len(texts), dim); empty texts get zero rows.
+    Texts already in the embedding cache skip the model.
+    """
+    # Only non-empty texts go through the cache/model
+    indexes = [i for i, t in enumerate(texts) if t]
+    if not indexes:
+        return np.zeros((len(texts), embedding_dim()), dtype=np.float32)
+
+    if not (use_cache and embedding_cache.enabled):
+        emb = _encode([texts[i] for i in indexes], batch_size)
+        matrix = np.zeros((len(texts), emb.shape[1]), dtype=np.float32)
+        matrix[indexes] = emb
+        return matrix
+
+    keys = {i: make_key(model_id(), texts[i]) for i in indexes}
+    cached = embedding_cache.get_many(keys.values())
+
+    # Encode each distinct missing text once
+    to_encode: Dict[str, str] = {}
+    for i in indexes:
+        if keys[i] not in cached and keys[i] not in to_encode:
+            to_encode[keys[i]] = texts[i]
+
+    if to_encode:
+        emb = _encode(list(to_encode.values()), batch_size)
+        fresh = list(zip(to_encode.keys(), emb))
+        embedding_cache.put_many(fresh)
+        cached.update(fresh)
+
+    dim = len(next(iter(cached.values())))
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for i in indexes:
+        matrix[i] = cached[keys[i]]
+    return matrix
+
+
+# ======================================================
+# Chunked document embeddings
+# ======================================================
+def _local_chunk_texts(texts: List[str], window: int, overlap: int) -> List[List[str]]:
+    model = get_model()
+    window = window or EMBEDDING_CHUNK_TOKENS or (model.max_seq_length - 2)  # [CLS] + [SEP]
+    overlap = max(0, min(int(overlap), window - 1))
+    step = window - overlap
+
+    out = []
+    for text in texts:
+        if not text or not text.strip():
+            out.append([])
+            continue
+
+        with _tokenizer_lock:
+            enc = model.tokenizer(
+                text,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                verbose=False,
+            )
+        offsets = enc["offset_mapping"]
+        if len(offsets) <= window:
+            out.append([text])
+            continue
+
+        chunks = []
+        for start in range(0, len(offsets), step):
+            end = min(start + window, len(offsets))
+            chunks.append(text[offsets[start][0]:offsets[end - 1][1]])
+            if end == len(offsets):
+                break
+        out.append(chunks)
+    return out
+
+
+def chunk_texts(texts: List[str], window: int = 0, overlap: int = EMBEDDING_CHUNK_OVERLAP) -> List[List[str]]:
+    """
+    Split each text into overlapping windows of at most `window` tokens
+    (model tokenizer), so nothing past max_seq_length gets truncated away.
+    """
+    if EMBEDDING_SERVER_SOCKET:
+        return _remote_call("chunk", texts, window, overlap)
+    return _local_chunk_texts(texts, window, overlap)
+
+
+def chunk_text(text: str, window: int = 0, overlap: int = EMBEDDING_CHUNK_OVERLAP) -> List[str]:
+    return chunk_texts([text], window, overlap)[0]
+
+
+def get_document_chunk_embeddings(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[np.ndarray]:
+    """
+    Chunk every document and embed all chunks in one batched pass.
+    Returns one (n_chunks, dim) float32 matrix per document (empty for empty text).
+    """
+    per_doc = chunk_texts(texts)
+    flat = [c for chunks in per_doc for c in chunks]
+
+    # Resume chunks are rarely repeated, keep them out of the LRU
+    emb = get_text_embeddings(flat, batch_size=batch_size, use_cache=False) if flat else None
+    dim = emb.shape[1] if emb is not None else embedding_dim()
+
+    out, pos = [], 0
+    for chunks in per_doc:
+        if chunks:
+            out.append(emb[pos:pos + len(chunks)])
+        else:
+            out.append(np.zeros((0, dim), dtype=np.float32))
+        pos += len(chunks)
+    return out
+
+
+def pool_chunk_embeddings(chunk_matrix: np.ndarray) -> np.ndarray:
+    """Mean-pool chunk vectors and L2-normalize; empty input gives a zero vector."""
+    dim = chunk_matrix.shape[1]
+    if chunk_matrix.shape[0] == 0:
+        return np.zeros(dim, dtype=np.float32)
+    vec = chunk_matrix.mean(axis=0)
+    norm = np.linalg.norm(vec)
+    return (vec / norm if norm > 0 else vec).astype(np.float32)
+
+
+def get_document_embeddings(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    """One pooled vector per document, covering the full text instead of the first window."""
+    chunked = get_document_chunk_embeddings(texts, batch_size=batch_size)
+    if not chunked:
+        return np.zeros((0, embedding_dim()), dtype=np.float32)
+    return np.vstack([pool_chunk_embeddings(m) for m in chunked])
+
+
+def get_skills_embeddings(skills_lists: List[List[str]], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    """
+    One vector per skill list: mean of the individual skill embeddings, L2-normalized.
+    All skills go through one cached batch (skills repeat a lot across resumes).
+    """
+    lists = [[s for s in (skills or []) if s] for skills in skills_lists]
+    flat = [s for skills in lists for s in skills]
+    emb = get_text_embeddings(flat, batch_size=batch_size) if flat else None
+    dim = emb.shape[1] if emb is not None else embedding_dim()
+
+    out, pos = np.zeros((len(lists), dim), dtype=np.float32), 0
+    for i, skills in enumerate(lists):
+        if skills:
+            out[i] = pool_chunk_embeddings(emb[pos:pos + len(skills)])
+        pos += len(skills)
+    return out
+
+
+def get_resume_embeddings(
+    texts: List[str],
+    skills_lists: List[List[str]],
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+) -> Dict[str, np.ndarray]:
+    """
+    All named vectors of a batch of resumes, keyed like the resumes collection:
+      text    -> pooled embedding of every chunk of the full text
+      summary -> embedding of the first chunk (header / profile section)
+      skills  -> mean of the extracted skill embeddings
+    Each value is a (len(texts), dim) float32 matrix.
+    """
+    chunked = get_document_chunk_embeddings(texts, batch_size=batch_size)
+    dim = chunked[0].shape[1] if chunked else embedding_dim()
+
+    summary = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, m in enumerate(chunked):
+        if m.shape[0]:
+            summary[i] = m[0]
+
+    return {
+        "text": np.vstack([pool_chunk_embeddings(m) for m in chunked]) if chunked
+        else np.zeros((0, dim), dtype=np.float32),
+        "summary": summary,
+        "skills": get_skills_embeddings(skills_lists, batch_size=batch_size),
+    }
+
+
+def cache_stats() -> Dict[str, int]:
+    return embedding_cache.stats()
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
 def get_text_embedding(text: str):
-    if not text:
-        return [0.0] * model.get_sentence_embedding_dimension()
-    emb = model.encode(text)
-    return emb.tolist()
+    return get_text_embeddings([text])[0].tolist()
@@ -3,7 +3,7 @@
 import fitz
 from docx import Document
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional
 import os
 import logging
  
@@ -26,12 +26,19 @@ def extract_file_content(file_obj) -> str:
     # ---- PDF ----
     if file_type == "pdf":
         try:
-            doc = fitz.open(stream=file_obj.read(), filetype="pdf")
-            full_text = ""
-            for page in doc:
-                txt = page.get_text("text")
-                if txt:
-                    full_text += txt + "\n"
+            # staged uploads expose their path: let PyMuPDF read the file
+            # itself rather than from another in-memory copy
+            path = getattr(file_obj, "path", None)
+            if path:
+                doc = fitz.open(path, filetype="pdf")
+            else:
+                doc = fitz.open(stream=file_obj.read(), filetype="pdf")
+            with doc:
+                full_text = ""
+                for page in doc:
+                    txt = page.get_text("text")
+                    if txt:
+                        full_text += txt + "\n"
             return full_text.strip()
         except:
             return ""
@@ -215,6 +222,11 @@ def expand_skill(skill: str, depth=2):
 # ======================================================================
  
 def extract_skills_with_llama3(text: str) -> List[str]:
+    return _llm_skills(text) or []
+
+
+def _llm_skills(text: str) -> Optional[List[str]]:
+    """Skills from the model; None when the Bedrock call failed (not just "no skills")."""
     try:
         prompt = f"""
 You are an AI that extracts ALL technical skills from resumes.
@@ -235,14 +247,14 @@ Return ONLY the comma-separated skills list.
 """
  
         resp = invoke_llama3_model(prompt)
-        if not resp:
-            return []
+        if resp is None:
+            return None
  
         raw = [x.strip() for x in re.split(r",|;|\n", resp) if x.strip()]
         return [s for s in raw if looks_like_tech(s)]
  
     except:
-        return []
+        return None
  
 # ======================================================================
 #                EXPERIENCE → CPD LEVEL
@@ -275,6 +287,10 @@ def extract_fields(file_obj) -> Dict:
     text = extract_file_content(file_obj)
     raw_filename = os.path.basename(file_obj.name or "")
  
+    # False when a Bedrock call failed; the result is then a fallback that
+    # callers should not cache
+    llm_ok = True
+
     # ---------------- NAME ----------------
     candidate_name = "Unknown"
  
@@ -288,15 +304,17 @@ Extract ONLY the candidate's real name (1–2 words). No titles.
 {text[:1200]}
 """
  
-        raw = invoke_llama3_model(name_prompt) or ""
-        raw = re.sub(r"[^A-Za-z\s]", "", raw).strip()
+        raw = invoke_llama3_model(name_prompt)
+        if raw is None:
+            llm_ok = False
+        raw = re.sub(r"[^A-Za-z\s]", "", raw or "").strip()
  
         # NEW VALIDATION
         if is_valid_name(raw):
             candidate_name = raw
  
     except:
-        pass
+        llm_ok = False
  
     # Fallback to email username
     if candidate_name == "Unknown" and email_local:
@@ -318,8 +336,10 @@ Extract ONLY the candidate's real name (1–2 words). No titles.
             pass
  
     # ---------------- SKILLS ----------------
-    raw = extract_skills_with_llama3(text)
-    cleaned = clean_skills(raw)
+    raw = _llm_skills(text)
+    if raw is None:
+        llm_ok = False
+    cleaned = clean_skills(raw or [])
  
     expanded = cleaned[:]  
  
@@ -334,7 +354,8 @@ Extract ONLY the candidate's real name (1–2 words). No titles.
         "display_skills": sorted(expanded),
         "resume_text": text,
         "file_name": raw_filename,
-        "readable_file_name": raw_filename
+        "readable_file_name": raw_filename,
+        "llm_ok": llm_ok,
     }
  
  
\ No newline at end of file
@@ -0,0 +1,803 @@
+# resume/services/ingestion_service.py
+"""
+Resume ingestion pipeline and background ingestion jobs.
+
+ResumeUploadView stages the uploaded files on disk (INGEST_STAGING_DIR),
+records an IngestionJob with one IngestionFile row per file and returns the
+job id. An ingestion worker claims queued jobs from the database
+(SELECT ... FOR UPDATE SKIP LOCKED, so several workers can share the queue)
+and runs every file through the pipeline, recording its stage as it goes:
+
+    duplicate_check -> extracting -> uploading -> embedding -> indexing -> finished
+
+Files are prepared on a bounded thread pool, and every external stage takes
+a slot from its own process-wide semaphore so a large batch can't flood
+Bedrock, S3 or Qdrant:
+
+    INGEST_WORKERS             files in flight per job       (default 8)
+    INGEST_LLM_CONCURRENCY     concurrent extract_fields     (default 4)
+    INGEST_S3_CONCURRENCY      concurrent S3 writes          (default 8)
+    INGEST_QDRANT_CONCURRENCY  concurrent Qdrant calls       (default 4)
+
+Embedding and the Qdrant upsert run once per chunk of INGEST_CHUNK_SIZE files.
+
+A file whose content hash is already indexed, or repeats an earlier file of
+the same job, is marked duplicate before extraction. Extraction results are kept per hash (ExtractionResult), so the
+same bytes uploaded again later never go through Bedrock twice.
+
+A staged file is never read into memory whole: one read-only handle
+(StagedFile) is hashed in 1 MB chunks, opened by PyMuPDF from its path and
+streamed to S3 (multipart above S3_MULTIPART_THRESHOLD_MB). Uploads larger than
+INGEST_MAX_FILE_MB (default 25) are rejected, and each job logs its peak RSS.
+
+The worker runs as a daemon thread in the web process (started on the first
+upload, or at boot with INGEST_WORKER_ON_START=true), or on its own with
+`python manage.py run_ingestion_worker` (then set INGEST_WORKER_IN_PROCESS=false).
+While a job runs, a heartbeat thread touches it every INGEST_HEARTBEAT_SECONDS,
+however long a single Bedrock or S3 call takes. A job whose heartbeat is older
+than INGEST_STALE_SECONDS (at least 4 heartbeats) is taken to have lost its
+worker and is picked up again; files that already finished are not redone.
+"""
+import hashlib
+import io
+import os
+import re
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# Optional packages
+try:
+    import resource  # Unix only; used to log peak memory per job
+except ImportError:
+    resource = None
+
+from ..models import ExtractionResult, IngestionFile, IngestionJob
+from .embedding_service import get_resume_embeddings
+from .extract_data import extract_fields
+from .qdrant_service import (
+    RESUME_VECTORS,
+    SPARSE_VECTOR,
+    find_existing_filenames,
+    find_existing_point_ids,
+    find_points_by_hashes,
+    qdrant_client,
+    upsert_points_bulk,
+)
+from .s3_service import upload_resume_to_s3
+from .sparse_service import document_sparse_vector
+from .text_store import get_text, put_text
+
+INGEST_WORKERS = max(1, int(os.getenv("INGEST_WORKERS", "8")))
+INGEST_LLM_CONCURRENCY = max(1, int(os.getenv("INGEST_LLM_CONCURRENCY", "4")))
+INGEST_S3_CONCURRENCY = max(1, int(os.getenv("INGEST_S3_CONCURRENCY", "8")))
+INGEST_QDRANT_CONCURRENCY = max(1, int(os.getenv("INGEST_QDRANT_CONCURRENCY", "4")))
+
+INGEST_MAX_FILES = max(1, int(os.getenv("INGEST_MAX_FILES", "500")))
+INGEST_MAX_FILE_MB = max(1, int(os.getenv("INGEST_MAX_FILE_MB", "25")))
+INGEST_CHUNK_SIZE = max(1, int(os.getenv("INGEST_CHUNK_SIZE", "25")))
+INGEST_STAGING_DIR = os.getenv("INGEST_STAGING_DIR", "").strip() or os.path.join(str(settings.BASE_DIR), "ingest_staging")
+INGEST_POLL_SECONDS = float(os.getenv("INGEST_POLL_SECONDS", "5"))
+INGEST_HEARTBEAT_SECONDS = max(1.0, float(os.getenv("INGEST_HEARTBEAT_SECONDS", "30")))
+INGEST_STALE_SECONDS = max(
+    int(os.getenv("INGEST_STALE_SECONDS", "600")), int(4 * INGEST_HEARTBEAT_SECONDS)
+)
+INGEST_WORKER_IN_PROCESS = os.getenv("INGEST_WORKER_IN_PROCESS", "true").lower() == "true"
+
+_STAGES = {
+    "llm": threading.BoundedSemaphore(INGEST_LLM_CONCURRENCY),
+    "s3": threading.BoundedSemaphore(INGEST_S3_CONCURRENCY),
+    "qdrant": threading.BoundedSemaphore(INGEST_QDRANT_CONCURRENCY),
+}
+
+FINISHED_STATUSES = ("uploaded", "duplicate", "failed")
+
+
+# ======================================================
+# Concurrency limits
+# ======================================================
+@contextmanager
+def stage(name: str):
+    """Hold a slot of the named stage ("llm", "s3" or "qdrant") for the block."""
+    slot = _STAGES[name]
+    slot.acquire()
+    try:
+        yield
+    finally:
+        slot.release()
+
+
+def run_in_stage(name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    with stage(name):
+        return fn(*args, **kwargs)
+
+
+def map_files(fn: Callable[[Any], Any], items: Iterable[Any], workers: int = INGEST_WORKERS) -> List[Any]:
+    """
+    fn(item) for every item on a bounded pool; results come back in input
+    order. fn is expected to report per-file failures in its return value,
+    an exception escaping it is re-raised here.
+    """
+    items = list(items)
+    if len(items) <= 1 or workers <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix="ingest") as pool:
+        return list(pool.map(fn, items))
+
+
+# ======================================================
+# Filename identity
+# ======================================================
+def normalize_filename(fn: str) -> str:
+    """
+    Normalization used across upload/check/migration:
+      - strip whitespace
+      - collapse internal whitespace
+      - strip leading/trailing dots/spaces
+      - lowercase (for deterministic id)
+    Returns normalized lowercase string (suitable for uuid5).
+    """
+    if not fn:
+        return ""
+    s = fn.strip()
+    s = re.sub(r"\s+", " ", s)
+    s = s.strip(". ")
+    return s.lower()
+
+
+def filename_to_point_id(fn: str) -> str:
+    """
+    Convert a filename (string) to a deterministic UUID string (UUID5).
+    Falls back to a random UUID if something goes wrong.
+    """
+    try:
+        normalized = normalize_filename(fn)
+        if not normalized:
+            return str(uuid.uuid4())
+        return str(uuid.uuid5(uuid.NAMESPACE_DNS, normalized))
+    except Exception:
+        return str(uuid.uuid4())
+
+
+# ======================================================
+# Payload normalization
+# ======================================================
+# The dashboard counts skills with a facet and experience with numeric range
+# filters, so these have to be stored in one canonical form.
+def normalize_skills(skills) -> List[str]:
+    """Lowercased, stripped, de-duplicated skills in their original order."""
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    out: List[str] = []
+    for skill in skills or []:
+        skill = str(skill).strip().lower()
+        if skill and skill not in out:
+            out.append(skill)
+    return out
+
+
+def normalize_experience_years(value) -> Optional[int]:
+    """Whole years as an int ("10.5" -> 10); None when missing or not a number."""
+    if value is None or value == "":
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# ======================================================
+# Per-file pipeline
+# ======================================================
+class StagedFile(io.FileIO):
+    """
+    Read-only handle on a staged upload that reports the uploaded file name
+    (extract_fields and upload_resume_to_s3 go by its extension); `path`
+    lets PyMuPDF open the file directly instead of from a bytes copy.
+    """
+
+    def __init__(self, path: str, name: str):
+        super().__init__(path, "rb")
+        self.path = path
+        self.name = name
+
+
+def hash_file(fh, chunk_size: int = 1024 * 1024):
+    """(sha256 hex, size) of a file object, read through one reused buffer."""
+    digest = hashlib.sha256()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    size = 0
+    fh.seek(0)
+    while True:
+        n = fh.readinto(buf)
+        if not n:
+            break
+        digest.update(view[:n])
+        size += n
+    fh.seek(0)
+    return digest.hexdigest(), size
+
+
+def _filename_variants(readable_file_name: str) -> Set[str]:
+    return {
+        readable_file_name,
+        readable_file_name.lower(),
+        f"resumes/{readable_file_name}",
+        f"resumes/{readable_file_name.lower()}",
+    }
+
+
+def find_duplicate_filenames(file_names: List[str]) -> Set[str]:
+    """
+    The incoming names (stripped) that already exist, checked for the whole
+    batch at once: one MatchAny scroll over every name variant plus one
+    retrieve of every deterministic point id.
+    """
+    names = {(n or "").strip() for n in file_names} - {""}
+    if not names or not qdrant_client:
+        return set()
+
+    variants = {name: _filename_variants(name) for name in names}
+    with stage("qdrant"):
+        stored = find_existing_filenames([v for vs in variants.values() for v in vs])
+        ids = {name: filename_to_point_id(normalize_filename(name)) for name in names}
+        existing_ids = find_existing_point_ids(list(ids.values()))
+
+    return {name for name in names if variants[name] & stored or ids[name] in existing_ids}
+
+
+def repeated_in_batch(keys: List[Optional[str]]) -> Set[int]:
+    """
+    Positions whose key already appeared earlier in the list (the first copy
+    is kept, later ones are duplicates). Empty keys are never matched.
+    """
+    seen: Set[str] = set()
+    repeats: Set[int] = set()
+    for i, key in enumerate(keys):
+        if not key:
+            continue
+        if key in seen:
+            repeats.add(i)
+        else:
+            seen.add(key)
+    return repeats
+
+
+EXTRACTION_CACHE_FIELDS = ("candidate_name", "email", "experience_years", "cpd_level", "skills", "display_skills")
+
+
+def _cached_extraction(file_hash: str) -> Optional[Dict[str, Any]]:
+    """extract_fields()-shaped result stored for this hash, or None."""
+    row = ExtractionResult.objects.filter(pk=file_hash).first()
+    if row is None:
+        return None
+    try:
+        text = get_text(row.resume_text_ref)
+    except Exception as e:
+        print(f"⚠️ Cached extraction text missing for {file_hash[:12]}, extracting again: {e}")
+        return None
+    return {**row.fields, "resume_text": text}
+
+
+def _store_extraction(file_hash: str, extracted_data: Dict[str, Any], resume_text_ref: str):
+    try:
+        ExtractionResult.objects.update_or_create(
+            file_hash=file_hash,
+            defaults={
+                "fields": {k: extracted_data.get(k) for k in EXTRACTION_CACHE_FIELDS},
+                "resume_text_ref": resume_text_ref,
+            },
+        )
+    except Exception as e:
+        print(f"⚠️ Failed to cache extraction for {file_hash[:12]}: {e}")
+
+
+def prepare_file(
+    file_name: str,
+    content_type: str,
+    staged_path: str,
+    batch_meta: Dict[str, Any],
+    on_stage: Optional[Callable[[str], None]] = None,
+    file_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Everything that happens to one file before embedding: content hash
+    duplicate check, extraction (or the cached result for the hash), S3
+    upload and text store write. The filename duplicate check runs for the
+    whole batch first, see find_duplicate_filenames. Returns
+    {"status": "duplicate" | "error" | "ready", ...}; "ready" carries the
+    item for index_prepared().
+    """
+    on_stage = on_stage or (lambda _stage: None)
+    try:
+        readable_file_name = (file_name or "").strip()
+        if not readable_file_name:
+            return {"status": "error", "error": f"{file_name or 'unknown'}: missing filename"}
+
+        normalized_key = normalize_filename(readable_file_name)
+
+        # One read-only handle on the staged file is shared by hashing,
+        # extraction and the S3 upload; the file is never held in memory whole
+        with StagedFile(staged_path, readable_file_name) as fh:
+            if file_hash is None:
+                file_hash, file_size = hash_file(fh)
+            else:
+                # already hashed by the job's pre-pass
+                file_size = os.fstat(fh.fileno()).st_size
+            if not file_size:
+                return {"status": "error", "error": f"{readable_file_name}: file empty or unreadable"}
+
+            # === Content duplicate check (a renamed copy of an indexed file) ===
+            on_stage("duplicate_check")
+            try:
+                is_duplicate = bool(run_in_stage("qdrant", find_points_by_hashes, [file_hash]))
+            except Exception as e:
+                print(f"⚠️ hash duplicate check failed for {readable_file_name}: {e}")
+                is_duplicate = False
+
+            if is_duplicate:
+                print(f"⚠️ Duplicate content detected (same file_hash already indexed): {readable_file_name}")
+                return {"status": "duplicate", "file": readable_file_name}
+
+            # Extract fields (reused when these bytes were extracted before)
+            on_stage("extracting")
+            extracted_data = _cached_extraction(file_hash)
+            from_cache = extracted_data is not None
+            if from_cache:
+                print(f"♻️ Reusing cached extraction for {readable_file_name}")
+            else:
+                try:
+                    extracted_data = run_in_stage("llm", extract_fields, fh)
+                except Exception as e:
+                    print(f"⚠️ Text extraction failed for {readable_file_name}: {e}")
+                    return {"status": "error", "error": f"{readable_file_name}: extraction failed ({str(e)})"}
+
+            candidate_name = (
+                extracted_data.get("name")
+                or extracted_data.get("candidate_name")
+                or "Unknown"
+            )
+            candidate_email = (extracted_data.get("email") or "").strip().lower() or None
+
+            # S3 upload
+            on_stage("uploading")
+            try:
+                s3_url = run_in_stage("s3", upload_resume_to_s3, fh, content_type, candidate_name)
+                print(f"✅ Uploaded to S3: {s3_url}")
+            except Exception as e:
+                print(f"❌ S3 upload failed for {readable_file_name}: {e}")
+                return {"status": "error", "error": f"{readable_file_name}: s3 upload failed ({str(e)})"}
+
+            # object/file name
+            try:
+                object_name = urlparse(s3_url).path.lstrip("/")
+                stored_file_name = object_name.split("/")[-1] or readable_file_name
+            except Exception:
+                stored_file_name = readable_file_name
+
+            resume_text = extracted_data.get("resume_text", "") or extracted_data.get("text", "")
+            extracted_skills = normalize_skills(extracted_data.get("skills"))
+
+            salary = batch_meta.get("salary")
+            payload = {
+                "s3_url": s3_url,
+                "candidate_name": candidate_name,
+                "email": candidate_email,
+                "file_hash": file_hash,
+                "file_name": stored_file_name,
+                "readable_file_name": readable_file_name,
+                "experience_years": normalize_experience_years(extracted_data.get("experience_years")),
+                "cpd_level": extracted_data.get("cpd_level"),
+                "skills": extracted_skills,
+                "salary": float(salary) if salary else None,
+                "salary_currency": batch_meta.get("salary_currency") or None,
+                "candidate_type": (batch_meta.get("candidate_type") or "external").lower(),
+            }
+
+            # Full text lives in the compressed text store, keyed by file_hash;
+            # the payload only carries the reference
+            try:
+                payload["resume_text_ref"] = run_in_stage("s3", put_text, file_hash, resume_text)
+            except Exception as e:
+                print(f"⚠️ Text store write failed for {readable_file_name}, keeping text inline: {e}")
+                payload["resume_text"] = resume_text
+            else:
+                # only cache complete extractions: a fallback result (Bedrock
+                # down, no text) would otherwise be reused for this file forever
+                if not from_cache and extracted_data.get("llm_ok") and resume_text:
+                    _store_extraction(file_hash, extracted_data, payload["resume_text_ref"])
+
+            return {
+                "status": "ready",
+                "item": {
+                    "point_id": filename_to_point_id(normalized_key),
+                    "file": readable_file_name,
+                    "resume_text": resume_text,
+                    "skills": extracted_skills,
+                    "payload": payload,
+                },
+            }
+
+    except Exception as e:
+        print(f"❌ Unexpected error processing {file_name}: {e}")
+        return {"status": "error", "error": f"{file_name}: unexpected error ({str(e)})"}
+
+
+def index_prepared(pending: List[Dict[str, Any]], on_stage: Optional[Callable[[str], None]] = None) -> List[Optional[str]]:
+    """
+    Embed and upsert prepared items in one batch. Returns one entry per item:
+    None when it was saved, else the error message.
+    """
+    on_stage = on_stage or (lambda _stage: None)
+    if not pending:
+        return []
+
+    # Embedding: every file's text is chunked and all chunks go through one
+    # batched encode, then pooled back to one text vector per resume; the
+    # summary (first chunk) and skills vectors come out of the same pass
+    on_stage("embedding")
+    try:
+        named = get_resume_embeddings(
+            [item["resume_text"] for item in pending],
+            [item["skills"] for item in pending],
+        )
+        embeddings = [
+            {
+                **{name: named[name][i].tolist() for name in RESUME_VECTORS},
+                SPARSE_VECTOR: document_sparse_vector(item["resume_text"], item["skills"]),
+            }
+            for i, item in enumerate(pending)
+        ]
+    except Exception as e:
+        print(f"⚠️ Embedding generation failed for batch: {e}")
+        return [f"{item['file']}: embedding failed ({str(e)})" for item in pending]
+
+    # Upsert (one bulk write for the whole batch)
+    on_stage("indexing")
+    points = [
+        {"id": item["point_id"], "vector": embedding, "payload": item["payload"]}
+        for item, embedding in zip(pending, embeddings)
+    ]
+    try:
+        result = run_in_stage("qdrant", upsert_points_bulk, points, wait=True)
+    except Exception as e:
+        result = {"upserted": [], "failed": {item["point_id"]: str(e) for item in pending}}
+
+    outcome = []
+    for item in pending:
+        point_id = item["point_id"]
+        if point_id in result["failed"]:
+            print(f"❌ Qdrant upsert failed for {item['file']}: {result['failed'][point_id]}")
+            outcome.append(f"{item['file']}: qdrant upsert failed ({result['failed'][point_id]})")
+        else:
+            print(f"✅ Saved to Qdrant: {point_id} ({item['file']})")
+            outcome.append(None)
+    return outcome
+
+
+# ======================================================
+# Ingestion jobs
+# ======================================================
+def create_job(uploaded_files, batch_meta: Dict[str, Any], created_by=None) -> IngestionJob:
+    """
+    Stage the uploaded files under INGEST_STAGING_DIR/<job id>/ and queue an
+    IngestionJob for them; the worker is woken once the rows are committed.
+    """
+    job_id = uuid.uuid4()
+    job_dir = os.path.join(INGEST_STAGING_DIR, str(job_id))
+    os.makedirs(job_dir, exist_ok=True)
+
+    try:
+        rows = []
+        for position, uploaded in enumerate(uploaded_files):
+            path = os.path.join(job_dir, f"{position:05d}")
+            temp_path = getattr(uploaded, "temporary_file_path", None)
+            if temp_path:
+                # large uploads were already spooled to disk by Django
+                # (FILE_UPLOAD_MAX_MEMORY_SIZE); move rather than copy
+                shutil.move(temp_path(), path)
+            else:
+                with open(path, "wb") as out:
+                    for chunk in uploaded.chunks():
+                        out.write(chunk)
+            rows.append(IngestionFile(
+                position=position,
+                file_name=uploaded.name or "",
+                content_type=uploaded.content_type or "",
+                staged_path=path,
+            ))
+
+        with transaction.atomic():
+            job = IngestionJob.objects.create(
+                id=job_id,
+                created_by=created_by,
+                batch_meta=batch_meta,
+                file_count=len(rows),
+            )
+            for row in rows:
+                row.job = job
+            IngestionFile.objects.bulk_create(rows)
+            transaction.on_commit(wake_worker)
+    except Exception:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
+
+    print(f"📥 Queued ingestion job {job.id} ({job.file_count} files)")
+    return job
+
+
+def claim_next_job() -> Optional[IngestionJob]:
+    """Take the oldest queued job (or one whose worker went quiet) and mark it running."""
+    stale_before = timezone.now() - timedelta(seconds=INGEST_STALE_SECONDS)
+    with transaction.atomic():
+        job = (
+            IngestionJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(Q(status="queued") | Q(status="running", heartbeat_at__lt=stale_before))
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+
+        now = timezone.now()
+        job.status = "running"
+        job.started_at = job.started_at or now
+        job.heartbeat_at = now
+        job.save(update_fields=["status", "started_at", "heartbeat_at"])
+        return job
+
+
+def _set_file_state(file_ids: List[int], **fields):
+    IngestionFile.objects.filter(pk__in=file_ids).update(updated_at=timezone.now(), **fields)
+
+
+def _finish_file(row: IngestionFile, status: str, error: str = "", point_id: str = ""):
+    _set_file_state([row.pk], stage="finished", status=status, error=error, point_id=point_id)
+    try:
+        if row.staged_path and os.path.exists(row.staged_path):
+            os.remove(row.staged_path)
+    except OSError as e:
+        print(f"⚠️ Could not remove staged file {row.staged_path}: {e}")
+
+
+def _hash_staged(row: IngestionFile) -> Optional[str]:
+    """Content hash of a staged file; None when it is empty or unreadable (prepare_file reports those)."""
+    try:
+        with open(row.staged_path, "rb") as fh:
+            file_hash, size = hash_file(fh)
+    except OSError:
+        return None
+    return file_hash if size else None
+
+
+def _prepare_staged(row: IngestionFile, batch_meta: Dict[str, Any], file_hash: Optional[str] = None) -> Dict[str, Any]:
+    try:
+        return prepare_file(
+            row.file_name,
+            row.content_type,
+            row.staged_path,
+            batch_meta,
+            on_stage=lambda name: _set_file_state([row.pk], stage=name, status="running"),
+            file_hash=file_hash,
+        )
+    finally:
+        # pool threads each opened their own DB connection
+        if threading.current_thread().name.startswith("ingest_"):
+            connection.close()
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def process_job(job: IngestionJob):
+    files = list(job.files.exclude(status__in=FINISHED_STATUSES).order_by("position"))
+    staged_mb = sum(
+        os.path.getsize(row.staged_path) for row in files if os.path.exists(row.staged_path)
+    ) / (1024 * 1024)
+    rss_before = _peak_rss_mb()
+    print(
+        f"⚙️ Ingestion job {job.id}: {len(files)} of {job.file_count} files to process "
+        f"({staged_mb:.1f} MB staged)"
+    )
+
+    # Filename duplicate check for the whole batch in two Qdrant calls, plus
+    # repeats inside the batch (same normalized name -> same point id)
+    _set_file_state([row.pk for row in files], stage="duplicate_check", status="running")
+    try:
+        duplicates = find_duplicate_filenames([row.file_name for row in files])
+    except Exception as e:
+        print(f"⚠️ filename duplicate check failed for job {job.id}: {e}")
+        duplicates = set()
+    repeats = repeated_in_batch([normalize_filename(row.file_name) for row in files])
+
+    remaining = []
+    for i, row in enumerate(files):
+        if i in repeats or row.file_name.strip() in duplicates:
+            print(
+                f"⚠️ Duplicate filename detected (skipping upload for user-facing flow): {row.file_name.strip()}"
+            )
+            _finish_file(row, "duplicate")
+        else:
+            remaining.append(row)
+    files = remaining
+
+    # Identical content inside the job: hash every staged file up front and
+    # keep only the first copy of each hash (across all chunks)
+    hashes = map_files(_hash_staged, files)
+    repeats = repeated_in_batch(hashes)
+    remaining = []
+    for i, (row, file_hash) in enumerate(zip(files, hashes)):
+        if i in repeats:
+            print(f"⚠️ Duplicate content in this upload (skipping): {row.file_name.strip()}")
+            _finish_file(row, "duplicate")
+        else:
+            remaining.append((row, file_hash))
+    files = [row for row, _ in remaining]
+    file_hashes = {row.pk: file_hash for row, file_hash in remaining}
+
+    for start in range(0, len(files), INGEST_CHUNK_SIZE):
+        chunk = files[start:start + INGEST_CHUNK_SIZE]
+        outcomes = map_files(lambda row: _prepare_staged(row, job.batch_meta, file_hashes[row.pk]), chunk)
+
+        ready = []
+        for row, outcome in zip(chunk, outcomes):
+            if outcome["status"] == "duplicate":
+                _finish_file(row, "duplicate")
+            elif outcome["status"] == "error":
+                _finish_file(row, "failed", error=outcome["error"])
+            else:
+                ready.append((row, outcome["item"]))
+
+        if ready:
+            ready_ids = [row.pk for row, _ in ready]
+            errors = index_prepared(
+                [item for _, item in ready],
+                on_stage=lambda name: _set_file_state(ready_ids, stage=name),
+            )
+            for (row, item), error in zip(ready, errors):
+                if error:
+                    _finish_file(row, "failed", error=error)
+                else:
+                    _finish_file(row, "uploaded", point_id=item["point_id"])
+
+    IngestionJob.objects.filter(pk=job.pk).update(status="done", finished_at=timezone.now())
+    shutil.rmtree(os.path.join(INGEST_STAGING_DIR, str(job.id)), ignore_errors=True)
+    rss_after = _peak_rss_mb()
+    if rss_after is None:
+        print(f"✅ Ingestion job {job.id} finished")
+    else:
+        # peak RSS only grows, so the delta is how far this job pushed it
+        print(
+            f"✅ Ingestion job {job.id} finished "
+            f"(peak RSS {rss_after:.0f} MB, +{rss_after - rss_before:.0f} MB during the job)"
+        )
+
+
+def job_status(job: IngestionJob) -> Dict[str, Any]:
+    """Per-file stage/status plus the upload summary (same keys ResumeUploadView used to return)."""
+    files = list(job.files.order_by("position"))
+    counts = {status: 0 for status, _ in IngestionFile.STATUS_CHOICES}
+    for row in files:
+        counts[row.status] = counts.get(row.status, 0) + 1
+
+    uploaded = [{"point_id": row.point_id, "file": row.file_name} for row in files if row.status == "uploaded"]
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "file_count": job.file_count,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "error": job.error or None,
+        "counts": counts,
+        "files": [
+            {
+                "file": row.file_name,
+                "stage": row.stage,
+                "status": row.status,
+                "error": row.error or None,
+                "point_id": row.point_id or None,
+            }
+            for row in files
+        ],
+        "uploaded_count": len(uploaded),
+        "uploaded_data": uploaded,
+        "skipped_duplicates": [row.file_name for row in files if row.status == "duplicate"],
+        "errors": [row.error for row in files if row.status == "failed"],
+    }
+
+
+# ======================================================
+# Worker
+# ======================================================
+_wake = threading.Event()
+_worker_thread: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+@contextmanager
+def _heartbeat(job: IngestionJob):
+    """Keep job.heartbeat_at fresh from a side thread while the block runs."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(INGEST_HEARTBEAT_SECONDS):
+                try:
+                    IngestionJob.objects.filter(pk=job.pk, status="running").update(heartbeat_at=timezone.now())
+                except Exception as e:
+                    print(f"⚠️ Ingestion job {job.id} heartbeat failed: {e}")
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"ingest-heartbeat-{job.id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job: IngestionJob):
+    """process_job() under a heartbeat, marking the job failed if it raises."""
+    try:
+        with _heartbeat(job):
+            process_job(job)
+    except Exception as e:
+        print(f"❌ Ingestion job {job.id} failed: {e}")
+        IngestionJob.objects.filter(pk=job.pk).update(
+            status="failed", error=str(e), finished_at=timezone.now()
+        )
+
+
+def run_worker_forever():
+    """Claim and process jobs until the process exits."""
+    print(f"✅ Ingestion worker started (poll={INGEST_POLL_SECONDS}s, workers={INGEST_WORKERS})")
+    while True:
+        close_old_connections()
+        try:
+            job = claim_next_job()
+        except Exception as e:
+            print(f"⚠️ Ingestion worker could not claim a job: {e}")
+            job = None
+
+        if job is None:
+            _wake.wait(INGEST_POLL_SECONDS)
+            _wake.clear()
+            continue
+
+        run_job(job)
+
+
+def start_worker():
+    """Start the in-process worker thread once per process."""
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        _worker_thread = threading.Thread(target=run_worker_forever, name="ingestion-worker", daemon=True)
+        _worker_thread.start()
+
+
+def wake_worker():
+    if INGEST_WORKER_IN_PROCESS:
+        start_worker()
+    _wake.set()
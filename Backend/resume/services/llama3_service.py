@@ -1,7 +1,32 @@
 import boto3
 import json
 import os
+import threading
+from botocore.config import Config
 from dotenv import load_dotenv
+
+_bedrock_client = None
+_bedrock_lock = threading.Lock()
+
+
+def _get_bedrock_client(aws_region: str):
+    """
+    One bedrock-runtime client per process. Clients are thread-safe, but
+    creating them from the default session is not, and the upload pipeline
+    calls the model from several threads at once.
+    """
+    global _bedrock_client
+    if _bedrock_client is None:
+        with _bedrock_lock:
+            if _bedrock_client is None:
+                print(f"Connecting to Bedrock in region: {aws_region}...")
+                _bedrock_client = boto3.client(
+                    service_name="bedrock-runtime",
+                    region_name=aws_region,
+                    config=Config(max_pool_connections=int(os.getenv("BEDROCK_MAX_CONNECTIONS", "16"))),
+                )
+    return _bedrock_client
+
  
 def invoke_llama3_model(prompt: str):
     load_dotenv()
@@ -9,13 +34,8 @@ def invoke_llama3_model(prompt: str):
     if not aws_region:
         raise ValueError("AWS_REGION is not set in your .env file.")
  
-    print(f"Connecting to Bedrock in region: {aws_region}...")
- 
     try:
-        bedrock_runtime_client = boto3.client(
-            service_name="bedrock-runtime",
-            region_name=aws_region
-        )
+        bedrock_runtime_client = _get_bedrock_client(aws_region)
  
         model_id = "meta.llama3-70b-instruct-v1:0"
  
@@ -1,10 +1,15 @@
 # resume/services/qdrant_service.py
+import base64
+import json
 import os
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Callable, Iterator
 
+import httpx
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import (
@@ -22,23 +27,116 @@ load_dotenv()
 
 QDRANT_URL = os.getenv("QDRANT_URL", "").strip()
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", "").strip()
-COLLECTION_NAME = "resumes"
+# Embedded local mode (no server): ":memory:" or a directory path. Takes
+# precedence over QDRANT_URL; meant for tests, benchmarks and single-node installs.
+QDRANT_PATH = os.getenv("QDRANT_PATH", "").strip()
+
+# ---- Transport / connection pool ----
+# gRPC is usually faster for the many small calls (dedup, retrieve, search)
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "10"))  # seconds, per request
+# REST: max open connections / idle keep-alive connections / idle expiry (s)
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "20"))
+QDRANT_KEEPALIVE_CONNECTIONS = int(os.getenv("QDRANT_KEEPALIVE_CONNECTIONS", str(QDRANT_POOL_SIZE)))
+QDRANT_KEEPALIVE_EXPIRY = float(os.getenv("QDRANT_KEEPALIVE_EXPIRY", "30"))
+# gRPC: HTTP/2 keep-alive ping interval so idle channels aren't dropped by proxies
+QDRANT_GRPC_KEEPALIVE_MS = int(os.getenv("QDRANT_GRPC_KEEPALIVE_MS", "30000"))
+# Override to point the app at a migrated collection (see migrate_named_vectors)
+COLLECTION_NAME = os.getenv("QDRANT_COLLECTION", "resumes").strip() or "resumes"
 VECTOR_SIZE = 384  # must match embedding size
 
-if not QDRANT_URL or not QDRANT_API_KEY:
+# Named vectors of the resumes collection (all written in one ingestion pass)
+TEXT_VECTOR = "text"        # pooled full-text chunks
+SKILLS_VECTOR = "skills"    # mean of the extracted skill embeddings
+SUMMARY_VECTOR = "summary"  # first chunk: headline / profile section
+RESUME_VECTORS = (TEXT_VECTOR, SKILLS_VECTOR, SUMMARY_VECTOR)
+# Sparse BM25 term vector (see sparse_service); IDF is applied by Qdrant
+SPARSE_VECTOR = "keywords"
+
+# ---- Index / search tuning ----
+# HNSW graph: m = links per node, ef_construct = build-time beam width (0 = Qdrant default)
+QDRANT_HNSW_M = int(os.getenv("QDRANT_HNSW_M", "0"))
+QDRANT_HNSW_EF_CONSTRUCT = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "0"))
+# "none", "scalar" (int8) or "binary"; quantized vectors are searched first,
+# then the top candidates are rescored with the original float32 vectors
+QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "none").strip().lower()
+QDRANT_QUANTIZATION_ALWAYS_RAM = os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "true").lower() == "true"
+# Query-time beam width (0 = Qdrant default) and rescoring settings
+QDRANT_SEARCH_HNSW_EF = int(os.getenv("QDRANT_SEARCH_HNSW_EF", "0"))
+QDRANT_SEARCH_RESCORE = os.getenv("QDRANT_SEARCH_RESCORE", "true").lower() == "true"
+QDRANT_SEARCH_OVERSAMPLING = float(os.getenv("QDRANT_SEARCH_OVERSAMPLING", "2.0"))
+
+if not QDRANT_PATH and (not QDRANT_URL or not QDRANT_API_KEY):
     print("⚠️ Missing Qdrant credentials in .env")
 
 # ======================================================
-# Connect to Qdrant (cloud) with retry
+# Connect to Qdrant (cloud or embedded local mode) with retry
 # ======================================================
+def connect_qdrant_local(path: str = QDRANT_PATH) -> QdrantClient:
+    """qdrant-client's embedded mode: same API, data in memory or in `path`."""
+    if path == ":memory:":
+        client = QdrantClient(location=":memory:")
+    else:
+        os.makedirs(path, exist_ok=True)
+        client = QdrantClient(path=path)
+    print(f"✅ Using embedded local Qdrant: {path}")
+    return client
+
+
+def build_qdrant_client(
+    url: str = QDRANT_URL,
+    api_key: str = QDRANT_API_KEY,
+    prefer_grpc: bool = QDRANT_PREFER_GRPC,
+    timeout: int = QDRANT_TIMEOUT,
+    pool_size: int = QDRANT_POOL_SIZE,
+) -> QdrantClient:
+    """Remote client with explicit timeouts, REST pool limits and gRPC keep-alive."""
+    return QdrantClient(**remote_client_kwargs(url, api_key, prefer_grpc, timeout, pool_size))
+
+
+def remote_client_kwargs(
+    url: str = QDRANT_URL,
+    api_key: str = QDRANT_API_KEY,
+    prefer_grpc: bool = QDRANT_PREFER_GRPC,
+    timeout: int = QDRANT_TIMEOUT,
+    pool_size: int = QDRANT_POOL_SIZE,
+) -> Dict[str, Any]:
+    """Constructor kwargs shared by the sync and async (AsyncQdrantClient) clients."""
+    return dict(
+        url=url,
+        api_key=api_key or None,
+        prefer_grpc=prefer_grpc,
+        grpc_port=QDRANT_GRPC_PORT,
+        timeout=timeout,
+        grpc_options={
+            "grpc.keepalive_time_ms": QDRANT_GRPC_KEEPALIVE_MS,
+            "grpc.keepalive_timeout_ms": 10000,
+            "grpc.keepalive_permit_without_calls": 1,
+            "grpc.http2.max_pings_without_data": 0,
+        },
+        # Passed through to the REST (httpx) client
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=min(QDRANT_KEEPALIVE_CONNECTIONS, pool_size),
+            keepalive_expiry=QDRANT_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
 def connect_qdrant_with_retry(retries: int = 3, delay: int = 2) -> Optional[QdrantClient]:
+    if QDRANT_PATH:
+        try:
+            return connect_qdrant_local(QDRANT_PATH)
+        except Exception as e:
+            # e.g. the on-disk storage is locked by another process
+            print(f"❌ Failed to open local Qdrant at {QDRANT_PATH}: {e}")
+            return None
+
     for attempt in range(1, retries + 1):
         try:
-            client = QdrantClient(
-                url=QDRANT_URL,
-                api_key=QDRANT_API_KEY,
-            )
-            print(f"✅ Connected to Qdrant Cloud: {QDRANT_URL}")
+            client = build_qdrant_client()
+            print(f"✅ Connected to Qdrant Cloud: {QDRANT_URL} ({'gRPC' if QDRANT_PREFER_GRPC else 'REST'})")
             return client
         except Exception as e:
             print(f"⚠️ Retry {attempt}/{retries} failed: {e}")
@@ -49,134 +147,519 @@ def connect_qdrant_with_retry(retries: int = 3, delay: int = 2) -> Optional[Qdra
 qdrant_client: Optional[QdrantClient] = connect_qdrant_with_retry()
 
 # ======================================================
-# Automatically Create Collection if Not Exists
+# Job Collections Config
+# ======================================================
+# All postings live in one collection; the department is the indexed
+# "department_key" payload field (one of the JOB_COLLECTIONS keys, which were
+# the per-department collection names before migrate_job_collections).
+JOB_COLLECTION = os.getenv("QDRANT_JOB_COLLECTION", "jobs").strip() or "jobs"
+
+JOB_COLLECTIONS = {
+    "engineering_it": "Engineering/IT",
+    "human_resources": "Human Resources",
+    "sales_marketing": "Sales and Marketing",
+    "finance_accounting": "Finance and Accounting",
+}
+
+# ======================================================
+# Payload indexes per collection
+# ======================================================
+RESUME_INDEX_FIELDS = {
+    "experience_years": models.PayloadSchemaType.INTEGER,
+    "cpd_level": models.PayloadSchemaType.INTEGER,
+    "email": models.PayloadSchemaType.KEYWORD,
+    "file_hash": models.PayloadSchemaType.KEYWORD,
+    "file_name": models.PayloadSchemaType.KEYWORD,
+    "readable_file_name": models.PayloadSchemaType.KEYWORD,
+    "skills": models.PayloadSchemaType.KEYWORD,
+}
+
+JOB_INDEX_FIELDS = {
+    "department_key": models.PayloadSchemaType.KEYWORD,
+    "s3_url": models.PayloadSchemaType.KEYWORD,
+    "job_title": models.PayloadSchemaType.KEYWORD,
+    "department": models.PayloadSchemaType.KEYWORD,
+    "posting_date": models.PayloadSchemaType.DATETIME,
+    "deadline": models.PayloadSchemaType.DATETIME,
+}
+
+# ======================================================
+# HNSW / Quantization / Search params
 # ======================================================
-def auto_create_collection():
+def build_hnsw_config(m: int = QDRANT_HNSW_M, ef_construct: int = QDRANT_HNSW_EF_CONSTRUCT) -> Optional[models.HnswConfigDiff]:
+    """HNSW overrides for collection creation/update (None keeps Qdrant's defaults)."""
+    if not m and not ef_construct:
+        return None
+    return models.HnswConfigDiff(m=m or None, ef_construct=ef_construct or None)
+
+
+def build_quantization_config(kind: str = QDRANT_QUANTIZATION, always_ram: bool = QDRANT_QUANTIZATION_ALWAYS_RAM):
+    """Quantization config for "scalar" (int8) or "binary"; None for "none"."""
+    if kind in ("", "none"):
+        return None
+    if kind == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=always_ram,
+            )
+        )
+    if kind == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=always_ram)
+        )
+    raise ValueError(f"Unknown quantization '{kind}' (expected 'none', 'scalar' or 'binary')")
+
+
+def build_search_params(
+    hnsw_ef: Optional[int] = None,
+    exact: bool = False,
+    rescore: bool = QDRANT_SEARCH_RESCORE,
+    oversampling: float = QDRANT_SEARCH_OVERSAMPLING,
+) -> SearchParams:
+    """
+    Per-query search params. Quantization settings are ignored by Qdrant on
+    collections without quantization, so they are always safe to send.
+    """
+    hnsw_ef = QDRANT_SEARCH_HNSW_EF if hnsw_ef is None else hnsw_ef
+    return SearchParams(
+        hnsw_ef=hnsw_ef or None,
+        exact=exact,
+        quantization=models.QuantizationSearchParams(
+            ignore=False,
+            rescore=rescore,
+            oversampling=oversampling,
+        ),
+    )
+
+
+def apply_collection_config(
+    collection_name: str,
+    hnsw_config: Optional[models.HnswConfigDiff] = None,
+    quantization_config=None,
+    disable_quantization: bool = False,
+):
+    """
+    Update HNSW / quantization settings of an existing collection in place.
+    Qdrant rebuilds the index and quantized vectors in the background.
+    """
     if not qdrant_client:
-        print("⚠️ auto_create_collection: qdrant_client is None")
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    if disable_quantization:
+        quantization_config = models.Disabled.DISABLED
+
+    if hnsw_config is None and quantization_config is None:
+        return False
+
+    qdrant_client.update_collection(
+        collection_name=collection_name,
+        hnsw_config=hnsw_config,
+        quantization_config=quantization_config,
+    )
+    print(f"✅ Updated index config of '{collection_name}'")
+    return True
+
+# ======================================================
+# Schema Manager (once per process, thread-safe)
+# ======================================================
+# Collections whose existence + payload indexes have been confirmed in this
+# process. Operations only re-check a collection after they fail with a
+# missing-collection error.
+_schema_lock = threading.RLock()
+_confirmed_collections: Set[str] = set()
+_confirmed_indexes: Dict[str, Set[str]] = {}
+# collection -> {"named": stores named dense vectors, "sparse": has SPARSE_VECTOR}
+# (older resume collections have neither)
+_vector_layout: Dict[str, Dict[str, bool]] = {}
+
+
+def _index_fields_for(collection_name: str) -> Optional[Dict[str, Any]]:
+    if collection_name == COLLECTION_NAME:
+        return RESUME_INDEX_FIELDS
+    if collection_name == JOB_COLLECTION or collection_name in JOB_COLLECTIONS:
+        return JOB_INDEX_FIELDS
+    return None
+
+
+def _vector_params() -> models.VectorParams:
+    return models.VectorParams(size=VECTOR_SIZE, distance=models.Distance.COSINE)
+
+
+def _resume_vectors_config() -> Dict[str, models.VectorParams]:
+    return {name: _vector_params() for name in RESUME_VECTORS}
+
+
+def _resume_sparse_vectors_config() -> Dict[str, models.SparseVectorParams]:
+    return {SPARSE_VECTOR: models.SparseVectorParams(modifier=models.Modifier.IDF)}
+
+
+def _create_collection_if_missing(collection_name: str):
+    if qdrant_client.collection_exists(collection_name):
         return
 
+    is_resumes = collection_name == COLLECTION_NAME
     try:
-        collections = qdrant_client.get_collections().collections
-        existing = [c.name for c in collections]
+        qdrant_client.create_collection(
+            collection_name=collection_name,
+            vectors_config=_resume_vectors_config() if is_resumes else _vector_params(),
+            sparse_vectors_config=_resume_sparse_vectors_config() if is_resumes else None,
+            hnsw_config=build_hnsw_config(),
+            quantization_config=build_quantization_config(),
+        )
+        print(f"✅ Collection '{collection_name}' created automatically!")
     except Exception as e:
-        print(f"⚠️ Failed to list collections: {e}")
-        existing = []
+        # another worker may have created it in the meantime
+        if "already exists" not in str(e).lower():
+            raise
+
+
+def ensure_schema(collection_name: str = COLLECTION_NAME):
+    """Create the collection and its payload indexes once per process."""
+    if collection_name in _confirmed_collections:
+        return
+
+    index_fields = _index_fields_for(collection_name)
+    if index_fields is None or not qdrant_client:
+        return
+
+    with _schema_lock:
+        if collection_name in _confirmed_collections:
+            return
 
-    if COLLECTION_NAME not in existing:
         try:
-            qdrant_client.recreate_collection(
-                collection_name=COLLECTION_NAME,
-                vectors_config=models.VectorParams(
-                    size=VECTOR_SIZE,
-                    distance=models.Distance.COSINE,
-                ),
-            )
-            print(f"✅ Collection '{COLLECTION_NAME}' created automatically!")
+            _create_collection_if_missing(collection_name)
         except Exception as e:
-            print(f"❌ Failed to create collection '{COLLECTION_NAME}': {e}")
-    else:
-        print(f"ℹ️ Collection '{COLLECTION_NAME}' already exists.")
+            print(f"❌ Failed to create collection '{collection_name}': {e}")
+            return
 
-# ======================================================
-# Initialize Collection
-# ======================================================
-def initialize_qdrant_collection():
-    if not qdrant_client:
-        print("⚠️ Qdrant not initialized, skipping setup.")
-        return
+        done = _confirmed_indexes.setdefault(collection_name, set())
+        for name, schema in index_fields.items():
+            if name in done:
+                continue
+            try:
+                qdrant_client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=name,
+                    field_schema=schema,
+                )
+                done.add(name)
+            except Exception as e:
+                # ignore if already exists
+                if "already exists" in str(e).lower():
+                    done.add(name)
+                else:
+                    print(f"⚠️ Failed index {name} in {collection_name}: {e}")
 
-    auto_create_collection()
+        # Only confirm once every index is in place; otherwise retry next call
+        if len(done) == len(index_fields):
+            _confirmed_collections.add(collection_name)
+
+
+def invalidate_schema(collection_name: str):
+    with _schema_lock:
+        _confirmed_collections.discard(collection_name)
+        _confirmed_indexes.pop(collection_name, None)
+        _vector_layout.pop(collection_name, None)
 
-    INDEX_FIELDS = {
-        "experience_years": models.PayloadSchemaType.INTEGER,
-        "cpd_level": models.PayloadSchemaType.INTEGER,
-        "email": models.PayloadSchemaType.KEYWORD,
-        "file_hash": models.PayloadSchemaType.KEYWORD,
-        "file_name": models.PayloadSchemaType.KEYWORD,
-        "readable_file_name": models.PayloadSchemaType.KEYWORD,
-        "skills": models.PayloadSchemaType.KEYWORD,  
-    }
 
-    for name, schema in INDEX_FIELDS.items():
+def create_resume_collection(collection_name: str):
+    """Create a resumes-style collection (named + sparse vectors, resume payload indexes) under any name."""
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    if not qdrant_client.collection_exists(collection_name):
+        qdrant_client.create_collection(
+            collection_name=collection_name,
+            vectors_config=_resume_vectors_config(),
+            sparse_vectors_config=_resume_sparse_vectors_config(),
+            hnsw_config=build_hnsw_config(),
+            quantization_config=build_quantization_config(),
+        )
+        print(f"✅ Collection '{collection_name}' created")
+    for name, schema in RESUME_INDEX_FIELDS.items():
         try:
             qdrant_client.create_payload_index(
-                collection_name=COLLECTION_NAME,
+                collection_name=collection_name,
                 field_name=name,
                 field_schema=schema,
             )
-            print(f"Index created for {name}")
         except Exception as e:
-            # ignore if already exists
             if "already exists" not in str(e).lower():
-                print(f"⚠️ Failed index {name}: {e}")
+                print(f"⚠️ Failed index {name} in {collection_name}: {e}")
+
+
+def _get_vector_layout(collection_name: str) -> Dict[str, bool]:
+    """Vector layout of a collection (read once per process)."""
+    layout = _vector_layout.get(collection_name)
+    if layout is not None:
+        return layout
+    if not qdrant_client:
+        return {"named": False, "sparse": False}
+
+    ensure_schema(collection_name)
+    try:
+        params = qdrant_client.get_collection(collection_name).config.params
+    except Exception as e:
+        print(f"⚠️ Could not read vector layout of '{collection_name}': {e}")
+        return {"named": False, "sparse": False}
+
+    layout = {
+        "named": isinstance(params.vectors, dict),
+        "sparse": SPARSE_VECTOR in (params.sparse_vectors or {}),
+    }
+    _vector_layout[collection_name] = layout
+    return layout
+
+
+def uses_named_vectors(collection_name: str = COLLECTION_NAME) -> bool:
+    """Whether the collection stores named dense vectors."""
+    return _get_vector_layout(collection_name)["named"]
+
+
+def uses_sparse_vectors(collection_name: str = COLLECTION_NAME) -> bool:
+    """Whether the collection has the SPARSE_VECTOR slot for hybrid search."""
+    return _get_vector_layout(collection_name)["sparse"]
+
+
+def _fit_vector(collection_name: str, vector: Any) -> Any:
+    """
+    Adapt a vector (plain list or {name: list}) to the collection's layout.
+    Single-vector collections keep the full-text vector; named collections get
+    a plain list as their TEXT_VECTOR. The sparse vector is dropped where the
+    collection has no slot for it.
+    """
+    named = uses_named_vectors(collection_name)
+    if isinstance(vector, dict):
+        if named:
+            sparse = uses_sparse_vectors(collection_name)
+            return {
+                k: v for k, v in vector.items()
+                if v is not None and (k != SPARSE_VECTOR or sparse)
+            }
+        return vector.get(TEXT_VECTOR)
+    if named:
+        return {TEXT_VECTOR: vector}
+    return vector
+
+
+def _vector_size_error(vector: Any) -> Optional[str]:
+    if isinstance(vector, dict):
+        vectors = [v for k, v in vector.items() if k != SPARSE_VECTOR]
+    else:
+        vectors = [vector]
+    for vec in vectors:
+        if not vec or len(vec) != VECTOR_SIZE:
+            return f"Invalid embedding size: got {len(vec) if vec else 0}, expected {VECTOR_SIZE}"
+    return None
+
+
+def _is_missing_collection_error(e: Exception) -> bool:
+    msg = str(e).lower()
+    return ("not found" in msg and "collection" in msg) or "doesn't exist" in msg or "does not exist" in msg
+
+
+def with_schema(collection_name: str, fn: Callable[[], Any]) -> Any:
+    """
+    Run fn() against a collection whose schema is confirmed. If it fails because
+    the collection is gone (e.g. deleted out from under us), re-create the schema
+    and retry once.
+    """
+    ensure_schema(collection_name)
+    try:
+        return fn()
+    except Exception as e:
+        if not _is_missing_collection_error(e):
+            raise
+        print(f"⚠️ Collection '{collection_name}' missing, re-initializing schema")
+        invalidate_schema(collection_name)
+        ensure_schema(collection_name)
+        return fn()
+
+
+def initialize_qdrant_collection():
+    """Force a fresh schema check of the resumes collection."""
+    if not qdrant_client:
+        print("⚠️ Qdrant not initialized, skipping setup.")
+        return
+    invalidate_schema(COLLECTION_NAME)
+    ensure_schema(COLLECTION_NAME)
+
+# ======================================================
+# Payload projection
+# ======================================================
+def _payload_selector(fields: Optional[List[str]] = None, exclude_fields: Optional[List[str]] = None):
+    """
+    Map a field list to Qdrant's with_payload selector.
+    fields -> include only those keys; exclude_fields -> everything but those; neither -> full payload.
+    """
+    if fields is not None:
+        return models.PayloadSelectorInclude(include=list(fields))
+    if exclude_fields:
+        return models.PayloadSelectorExclude(exclude=list(exclude_fields))
+    return True
 
 # ======================================================
 # Insert Resume
 # ======================================================
 def insert_resume(resume_data: Dict[str, Any], vector: Optional[List[float]] = None):
-    initialize_qdrant_collection()
-
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
     vec = vector if vector else [0.0] * VECTOR_SIZE
 
-    if len(vec) != VECTOR_SIZE:
-        raise ValueError(f"❌ Invalid embedding size: got {len(vec)}, expected {VECTOR_SIZE}")
+    error = _vector_size_error(vec)
+    if error:
+        raise ValueError(f"❌ {error}")
 
     point = PointStruct(
         id=str(uuid.uuid4()),
-        vector=vec,
+        vector=_fit_vector(COLLECTION_NAME, vec),
         payload=resume_data
     )
 
-    qdrant_client.upsert(
+    with_schema(COLLECTION_NAME, lambda: qdrant_client.upsert(
         collection_name=COLLECTION_NAME,
         points=[point],
         wait=True
-    )
+    ))
 
     print(f"✅ Inserted resume: {resume_data.get('candidate_name', resume_data.get('name', 'Unknown'))}")
 
 # ======================================================
 # Upsert Resume (given deterministic id)
 # ======================================================
-def upsert_point(point_id: str, vector: List[float], payload: Dict[str, Any]):
-    initialize_qdrant_collection()
+def upsert_point(point_id: str, vector: Any, payload: Dict[str, Any]):
+    """`vector` is a plain list or a {name: list} dict of named vectors."""
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
-    if not vector or len(vector) != VECTOR_SIZE:
-        raise ValueError(
-            f"❌ Invalid embedding size: got {len(vector) if vector else 0}, expected {VECTOR_SIZE}"
-        )
+    error = _vector_size_error(vector)
+    if error:
+        raise ValueError(f"❌ {error}")
 
-    qdrant_client.upsert(
+    with_schema(COLLECTION_NAME, lambda: qdrant_client.upsert(
         collection_name=COLLECTION_NAME,
         points=[
             PointStruct(
                 id=str(point_id),
-                vector=vector,
+                vector=_fit_vector(COLLECTION_NAME, vector),
                 payload=payload,   # ← all keys you add in views.py go here
             ),
         ],
         wait=True,
-    )
+    ))
 
     print(f"✅ Upserted: {point_id}")
 
 
+# ======================================================
+# Bulk Upsert (batched, optionally parallel / non-blocking)
+# ======================================================
+def _as_point_struct(point: Any) -> PointStruct:
+    if isinstance(point, PointStruct):
+        return point
+    return PointStruct(id=str(point["id"]), vector=point["vector"], payload=point.get("payload") or {})
+
+
+def _upsert_batch(collection_name: str, batch: List[PointStruct], wait: bool) -> Dict[str, Any]:
+    upserted, failed = [], {}
+    try:
+        with_schema(collection_name, lambda: qdrant_client.upsert(
+            collection_name=collection_name,
+            points=batch,
+            wait=wait,
+        ))
+        upserted.extend(str(p.id) for p in batch)
+    except Exception as e:
+        if len(batch) == 1:
+            failed[str(batch[0].id)] = str(e)
+        else:
+            # Retry point by point so a single bad point doesn't fail the whole batch
+            print(f"⚠️ Batch upsert of {len(batch)} points failed ({e}), retrying individually")
+            for p in batch:
+                result = _upsert_batch(collection_name, [p], wait)
+                upserted.extend(result["upserted"])
+                failed.update(result["failed"])
+    return {"upserted": upserted, "failed": failed}
+
+
+def upsert_points_bulk(
+    points: List[Any],
+    batch_size: int = 64,
+    wait: bool = False,
+    parallel: int = 1,
+    collection_name: str = COLLECTION_NAME,
+) -> Dict[str, Any]:
+    """
+    Upsert many points in batches of `batch_size`.
+    Points are PointStructs or dicts with id/vector/payload; vectors may be
+    plain lists or {name: list} dicts and are fitted to the collection's
+    layout. With wait=False
+    Qdrant acknowledges each batch without waiting for it to be applied;
+    parallel > 1 sends batches concurrently.
+    Returns {"upserted": [ids], "failed": {id: error}}.
+    """
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    upserted: List[str] = []
+    failed: Dict[str, str] = {}
+
+    valid: List[PointStruct] = []
+    for point in points:
+        try:
+            ps = _as_point_struct(point)
+        except Exception as e:
+            pid = point.get("id") if isinstance(point, dict) else None
+            failed[str(pid)] = f"invalid point: {e}"
+            continue
+        error = _vector_size_error(ps.vector)
+        if error:
+            failed[str(ps.id)] = error
+            continue
+        ps.vector = _fit_vector(collection_name, ps.vector)
+        valid.append(ps)
+
+    batch_size = max(1, int(batch_size))
+    batches = [valid[i:i + batch_size] for i in range(0, len(valid), batch_size)]
+
+    if parallel > 1 and len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            results = list(pool.map(lambda b: _upsert_batch(collection_name, b, wait), batches))
+    else:
+        results = [_upsert_batch(collection_name, b, wait) for b in batches]
+
+    for r in results:
+        upserted.extend(r["upserted"])
+        failed.update(r["failed"])
+
+    print(f"✅ Bulk upserted {len(upserted)} points ({len(failed)} failed, {len(batches)} batches)")
+    return {"upserted": upserted, "failed": failed}
+
+
 # ======================================================
 # Search Collection
 # ======================================================
-def search_collection(query_vector: List[float], query_filter: Optional[models.Filter] = None, limit: int = 50, min_score: float = 0.30):
+def search_collection(
+    query_vector: List[float],
+    query_filter: Optional[models.Filter] = None,
+    limit: int = 50,
+    min_score: float = 0.30,
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: bool = False,
+    vector_name: str = TEXT_VECTOR,
+):
     """
     Returns list of matches (objects returned by QdrantClient.search).
     If there are no matches above min_score, returns the full result list (so UI can still show results).
+    `fields` / `exclude_fields` limit which payload keys come back.
+    `hnsw_ef` overrides QDRANT_SEARCH_HNSW_EF for this query; `exact` skips the index.
+    `vector_name` picks the named vector to search (ignored on single-vector collections).
     """
-    initialize_qdrant_collection()
-
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
@@ -188,16 +671,19 @@ def search_collection(query_vector: List[float], query_filter: Optional[models.F
     # Accept models.Filter or None
     q_filter = query_filter if isinstance(query_filter, models.Filter) else None
 
+    if uses_named_vectors(COLLECTION_NAME):
+        query_vector = models.NamedVector(name=vector_name, vector=query_vector)
+
     try:
-        results = qdrant_client.search(
+        results = with_schema(COLLECTION_NAME, lambda: qdrant_client.search(
             collection_name=COLLECTION_NAME,
             query_vector=query_vector,
             query_filter=q_filter,
             limit=limit,
-            with_payload=True,
+            with_payload=_payload_selector(fields, exclude_fields),
             with_vectors=False,
-            search_params=SearchParams(exact=False),
-        )
+            search_params=build_search_params(hnsw_ef=hnsw_ef, exact=exact),
+        ))
     except Exception as e:
         print(f"❌ Qdrant search error: {e}")
         return []
@@ -206,32 +692,272 @@ def search_collection(query_vector: List[float], query_filter: Optional[models.F
     strong_matches = [r for r in results if (r.score is not None and r.score >= min_score)]
     return strong_matches if strong_matches else results
 
-# ======================================================
-# Get All Points
-# ======================================================
-def get_all_points():
-    initialize_qdrant_collection()
 
+def parse_vector_weights(value: Any) -> Dict[str, float]:
+    """
+    Accepts {"skills": 0.7, "text": 0.3}, a JSON string of that, "skills:0.7,text:0.3"
+    or a single vector name. Unknown names and non-positive weights are dropped.
+    Raises ValueError for anything else.
+    """
+    if not value:
+        return {}
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("{"):
+            value = json.loads(value)
+        else:
+            parsed = {}
+            for part in value.split(","):
+                name, _, weight = part.partition(":")
+                parsed[name.strip()] = float(weight) if weight.strip() else 1.0
+            value = parsed
+
+    if not isinstance(value, dict):
+        raise ValueError(f"vector weights must be an object, got {type(value).__name__}")
+
+    weights = {}
+    for name, weight in value.items():
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            continue
+        if name in RESUME_VECTORS and weight > 0:
+            weights[name] = weight
+    return weights
+
+
+def search_resumes_weighted(
+    query_vectors: Dict[str, List[float]],
+    weights: Dict[str, float],
+    query_filter: Optional[models.Filter] = None,
+    limit: int = 50,
+    min_score: float = 0.30,
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+):
+    """
+    Search several named vectors in one batch request and combine their scores
+    as sum(weight * score) / sum(weight). A point missing from one vector's
+    candidate list contributes 0 for that vector.
+    Single-vector collections (or a single weight) fall back to search_collection.
+    """
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    weights = {n: w for n, w in (weights or {}).items() if query_vectors.get(n)}
+    if not weights:
+        weights = {TEXT_VECTOR: 1.0}
+
+    if not uses_named_vectors(COLLECTION_NAME) or len(weights) == 1:
+        name = next(iter(weights))
+        return search_collection(
+            query_vectors.get(name) or query_vectors.get(TEXT_VECTOR),
+            query_filter=query_filter,
+            limit=limit,
+            min_score=min_score,
+            fields=fields,
+            exclude_fields=exclude_fields,
+            vector_name=name,
+        )
+
+    names = list(weights)
+    requests = _weighted_search_requests(query_vectors, names, query_filter, limit, fields, exclude_fields)
+
+    try:
+        batches = with_schema(COLLECTION_NAME, lambda: qdrant_client.search_batch(
+            collection_name=COLLECTION_NAME,
+            requests=requests,
+        ))
+    except Exception as e:
+        print(f"❌ Qdrant weighted search error: {e}")
+        return []
+
+    return _combine_weighted_results(names, batches, weights, limit, min_score)
+
+
+def _weighted_search_requests(query_vectors, names, query_filter, limit, fields, exclude_fields):
+    q_filter = query_filter if isinstance(query_filter, models.Filter) else None
+    # Oversample so points ranked low on one vector but high on another survive
+    return [
+        models.SearchRequest(
+            vector=models.NamedVector(name=name, vector=query_vectors[name]),
+            filter=q_filter,
+            limit=limit * 2,
+            with_payload=_payload_selector(fields, exclude_fields),
+            with_vector=False,
+            params=build_search_params(),
+        )
+        for name in names
+    ]
+
+
+def _combine_weighted_results(names, batches, weights, limit, min_score):
+    total = sum(weights.values())
+    combined: Dict[Any, float] = {}
+    hits: Dict[Any, Any] = {}
+    for name, batch in zip(names, batches):
+        for hit in batch:
+            combined[hit.id] = combined.get(hit.id, 0.0) + weights[name] * (hit.score or 0.0)
+            hits.setdefault(hit.id, hit)
+
+    results = [
+        models.ScoredPoint(
+            id=pid,
+            version=hits[pid].version,
+            score=score / total,
+            payload=hits[pid].payload,
+        )
+        for pid, score in combined.items()
+    ]
+    results.sort(key=lambda r: r.score, reverse=True)
+    results = results[:limit]
+
+    strong_matches = [r for r in results if r.score >= min_score]
+    return strong_matches if strong_matches else results
+
+
+def hybrid_search(
+    query_vectors: Dict[str, List[float]],
+    sparse_vector: models.SparseVector,
+    vector_names: Optional[List[str]] = None,
+    fusion: str = "rrf",
+    query_filter: Optional[models.Filter] = None,
+    limit: int = 50,
+    prefetch_limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+):
+    """
+    Dense + sparse search fused inside Qdrant: one prefetch per dense named
+    vector plus one over the sparse keyword vector, combined with RRF
+    (rank-based) or DBSF (distribution-normalized scores).
+    Scores are fusion scores, not cosines. Returns None when the collection
+    has no sparse vector so callers can fall back to dense search.
+    """
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
-    all_records = []
-    next_offset = None
+    if not (uses_named_vectors(COLLECTION_NAME) and uses_sparse_vectors(COLLECTION_NAME)):
+        return None
+
+    q_filter = query_filter if isinstance(query_filter, models.Filter) else None
+    prefetch = _hybrid_prefetch(query_vectors, sparse_vector, vector_names, q_filter, prefetch_limit or limit * 2)
+    if not prefetch:
+        return []
 
     try:
+        response = with_schema(COLLECTION_NAME, lambda: qdrant_client.query_points(
+            collection_name=COLLECTION_NAME,
+            prefetch=prefetch,
+            query=models.FusionQuery(fusion=_fusion_mode(fusion)),
+            query_filter=q_filter,
+            limit=limit,
+            with_payload=_payload_selector(fields, exclude_fields),
+            with_vectors=False,
+        ))
+    except Exception as e:
+        print(f"❌ Qdrant hybrid search error: {e}")
+        return []
+
+    return response.points
+
+
+def _fusion_mode(fusion: str):
+    return models.Fusion.DBSF if fusion == "dbsf" else models.Fusion.RRF
+
+
+def _hybrid_prefetch(query_vectors, sparse_vector, vector_names, q_filter, prefetch_limit) -> List[models.Prefetch]:
+    names = [n for n in (vector_names or [TEXT_VECTOR]) if query_vectors.get(n)]
+    prefetch = [
+        models.Prefetch(
+            query=query_vectors[name],
+            using=name,
+            filter=q_filter,
+            limit=prefetch_limit,
+            params=build_search_params(),
+        )
+        for name in names
+    ]
+    if sparse_vector.indices:
+        prefetch.append(models.Prefetch(
+            query=sparse_vector,
+            using=SPARSE_VECTOR,
+            filter=q_filter,
+            limit=prefetch_limit,
+        ))
+    return prefetch
+
+# ======================================================
+# Stream Points (lazy pages, next page prefetched)
+# ======================================================
+def iter_point_pages(
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    query_filter: Optional[models.Filter] = None,
+    page_size: int = 200,
+    prefetch: bool = True,
+    collection_name: str = COLLECTION_NAME,
+) -> Iterator[List[Any]]:
+    """
+    Yield scroll pages lazily. With prefetch=True the next page is requested on
+    a background thread while the caller processes the current one, so only
+    ~2 pages are held in memory and network I/O overlaps the caller's work.
+    """
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    selector = _payload_selector(fields, exclude_fields)
+
+    def _fetch(offset):
+        return with_schema(collection_name, lambda: qdrant_client.scroll(
+            collection_name=collection_name,
+            scroll_filter=query_filter,
+            with_payload=selector,
+            with_vectors=False,
+            limit=page_size,
+            offset=offset,
+        ))
+
+    if not prefetch:
+        offset = None
         while True:
-            records, next_offset = qdrant_client.scroll(
-                collection_name=COLLECTION_NAME,
-                with_payload=True,
-                with_vectors=False,
-                limit=200,
-                offset=next_offset,
-            )
-            all_records.extend(records)
+            records, offset = _fetch(offset)
+            if records:
+                yield records
+            if offset is None:
+                return
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="qdrant-prefetch") as pool:
+        future = pool.submit(_fetch, None)
+        while future is not None:
+            records, offset = future.result()
+            future = pool.submit(_fetch, offset) if offset is not None else None
+            if records:
+                yield records
+
+
+def iter_points(
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    query_filter: Optional[models.Filter] = None,
+    page_size: int = 200,
+    prefetch: bool = True,
+    collection_name: str = COLLECTION_NAME,
+) -> Iterator[Any]:
+    """Record-by-record version of iter_point_pages."""
+    for page in iter_point_pages(fields, exclude_fields, query_filter, page_size, prefetch, collection_name):
+        yield from page
 
-            if not next_offset:
-                break
+# ======================================================
+# Get All Points
+# ======================================================
+def get_all_points(fields: Optional[List[str]] = None, exclude_fields: Optional[List[str]] = None):
+    """Every point as one list; prefer iter_points() for large collections."""
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
 
+    try:
+        all_records = list(iter_points(fields=fields, exclude_fields=exclude_fields))
         print(f"✅ Total points fetched: {len(all_records)}")
         return all_records
 
@@ -239,30 +965,242 @@ def get_all_points():
         print(f"❌ Scroll failed: {e}")
         return []
 
+# ======================================================
+# Filtered Listing (scroll + count, no vector search)
+# ======================================================
+def count_points(query_filter: Optional[models.Filter] = None, collection_name: str = COLLECTION_NAME) -> int:
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    result = with_schema(collection_name, lambda: qdrant_client.count(
+        collection_name=collection_name,
+        count_filter=query_filter,
+        exact=True,
+    ))
+    return result.count
+
+
+def _encode_cursor(state: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not state:
+        return None
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _decode_cursor(cursor: Optional[str], order_by: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Cursor state for list_points_filtered. Cursors come from clients, so the
+    phase and the keys it needs are checked here (ValueError -> 400 in the
+    views) rather than failing later inside a Qdrant request.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(state, dict):
+        raise ValueError("Invalid cursor")
+
+    phase = state.get("p")
+    value = state.get("v")
+    offset = state.get("off")
+    if phase == "id":
+        valid = not order_by
+    elif phase == "group":
+        valid = bool(order_by) and _is_number(value)
+    elif phase == "ordered":
+        valid = bool(order_by) and (value is None or _is_number(value))
+    elif phase == "missing":
+        valid = bool(order_by)
+    else:
+        valid = False
+    # scroll offsets are point ids: uuid strings or unsigned ints
+    if offset is not None and not (isinstance(offset, str) or (isinstance(offset, int) and _is_number(offset))):
+        valid = False
+    if not valid:
+        raise ValueError("Invalid cursor")
+    return {"p": phase, "v": value, "off": offset}
+
+
+def _and_filter(query_filter: Optional[models.Filter], *conditions) -> models.Filter:
+    """query_filter AND all extra conditions."""
+    return models.Filter(must=([query_filter] if query_filter is not None else []) + list(conditions))
+
+
+def list_points_filtered(
+    query_filter: Optional[models.Filter] = None,
+    order_by: Optional[str] = None,
+    direction: str = "desc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    with_total: bool = True,
+    collection_name: str = COLLECTION_NAME,
+) -> Dict[str, Any]:
+    """
+    Filter-only listing: scroll instead of searching with a dummy vector.
+    Ordered by the payload key `order_by` (needs a range index) or, without it,
+    by point id. Returns {"points", "next_cursor", "total"}; pass next_cursor
+    back to get the following page.
+
+    Qdrant can't break ties in order_by, so each run of equal values is read
+    as its own id-ordered scroll (cursor stays O(1) however many resumes share
+    a cpd_level). Points without the key are listed last.
+    """
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    limit = max(1, int(limit))
+    state = _decode_cursor(cursor, order_by) or {"p": "ordered" if order_by else "id", "v": None, "off": None}
+    selector = _payload_selector(
+        (list(fields) + [order_by]) if (fields is not None and order_by) else fields
+    )
+    descending = direction != "asc"
+
+    def _scroll(flt, offset, n, ordering=None):
+        return with_schema(collection_name, lambda: qdrant_client.scroll(
+            collection_name=collection_name,
+            scroll_filter=flt,
+            limit=n,
+            offset=offset,
+            order_by=ordering,
+            with_payload=selector,
+            with_vectors=False,
+        ))
+
+    page: List[Any] = []
+    while len(page) < limit and state is not None:
+        need = limit - len(page)
+        phase = state["p"]
+
+        if phase in ("id", "group", "missing"):
+            if phase == "id":
+                flt = query_filter
+            elif phase == "group":
+                flt = _and_filter(query_filter, FieldCondition(
+                    key=order_by, range=models.Range(gte=state["v"], lte=state["v"]),
+                ))
+            else:
+                flt = _and_filter(query_filter, models.IsEmptyCondition(
+                    is_empty=models.PayloadField(key=order_by),
+                ))
+            records, next_off = _scroll(flt, state.get("off"), need)
+            page.extend(records)
+            if next_off is not None:
+                state = {"p": phase, "v": state.get("v"), "off": next_off}
+            elif phase == "group":
+                state = {"p": "ordered", "v": state["v"], "off": None}
+            else:
+                state = None
+            continue
+
+        # phase == "ordered": values strictly past the last fully-read group
+        conditions = []
+        if state.get("v") is not None:
+            bound = models.Range(lt=state["v"]) if descending else models.Range(gt=state["v"])
+            conditions.append(FieldCondition(key=order_by, range=bound))
+        flt = _and_filter(query_filter, *conditions) if conditions else query_filter
+        records, _ = _scroll(flt, None, need, models.OrderBy(
+            key=order_by,
+            direction=models.Direction.DESC if descending else models.Direction.ASC,
+        ))
+
+        if len(records) < need:
+            page.extend(records)
+            state = {"p": "missing", "v": None, "off": None}
+            continue
+
+        # The last value's group may continue past this batch: hand it to an
+        # id-ordered group scroll instead of splitting it here
+        last = (records[-1].payload or {}).get(order_by)
+        page.extend(r for r in records if (r.payload or {}).get(order_by) != last)
+        state = {"p": "group", "v": last, "off": None}
+
+    if fields is not None and order_by and order_by not in fields:
+        for r in page:
+            (r.payload or {}).pop(order_by, None)
+
+    total = None
+    if with_total:
+        try:
+            total = count_points(query_filter, collection_name)
+        except Exception as e:
+            print(f"⚠️ Count failed: {e}")
+
+    return {"points": page, "next_cursor": _encode_cursor(state), "total": total}
+
+# ======================================================
+# Aggregations (count / facet, no scrolling)
+# ======================================================
+def count_by_filters(
+    filters: Dict[str, Optional[models.Filter]],
+    collection_name: str = COLLECTION_NAME,
+    parallel: int = 8,
+) -> Dict[str, int]:
+    """Exact count for each named filter; the count calls run concurrently."""
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+    if not filters:
+        return {}
+
+    names = list(filters)
+    with ThreadPoolExecutor(max_workers=max(1, min(parallel, len(names)))) as pool:
+        counts = list(pool.map(lambda n: count_points(filters[n], collection_name), names))
+    return dict(zip(names, counts))
+
+
+def facet_counts(
+    key: str,
+    limit: int = 20,
+    query_filter: Optional[models.Filter] = None,
+    exact: bool = False,
+    collection_name: str = COLLECTION_NAME,
+) -> Dict[Any, int]:
+    """
+    Most frequent values of an indexed keyword/integer payload field,
+    {value: count} in descending order. exact=False lets Qdrant approximate
+    counts, which is much cheaper on large collections.
+    """
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    response = with_schema(collection_name, lambda: qdrant_client.facet(
+        collection_name=collection_name,
+        key=key,
+        facet_filter=query_filter,
+        limit=limit,
+        exact=exact,
+    ))
+    return {hit.value: hit.count for hit in response.hits}
+
 # ======================================================
 # Delete Point
 # ======================================================
 def delete_point(point_id: str):
-    initialize_qdrant_collection()
-
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
     try:
-        qdrant_client.delete(
+        with_schema(COLLECTION_NAME, lambda: qdrant_client.delete(
             collection_name=COLLECTION_NAME,
             points_selector=models.PointIdsList(points=[point_id]),
             wait=True,
-        )
+        ))
     except Exception as e:
         print(f"❌ Qdrant delete error: {e}")
 
     # verify deletion (best-effort)
     try:
-        check = qdrant_client.retrieve(
+        check = with_schema(COLLECTION_NAME, lambda: qdrant_client.retrieve(
             collection_name=COLLECTION_NAME,
             ids=[point_id]
-        )
+        ))
         if check:
             print(f"❌ Point {point_id} NOT deleted!")
         else:
@@ -274,18 +1212,16 @@ def delete_point(point_id: str):
 # ======================================================
 # Retrieve Point
 # ======================================================
-def retrieve_point(point_id: str):
-    initialize_qdrant_collection()
-
+def retrieve_point(point_id: str, fields: Optional[List[str]] = None):
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
     try:
-        records = qdrant_client.retrieve(
+        records = with_schema(COLLECTION_NAME, lambda: qdrant_client.retrieve(
             collection_name=COLLECTION_NAME,
             ids=[point_id],
-            with_payload=True,
-        )
+            with_payload=_payload_selector(fields),
+        ))
     except Exception as e:
         raise RuntimeError(f"Qdrant retrieve failed: {e}")
 
@@ -297,8 +1233,6 @@ def retrieve_point(point_id: str):
 # Find by Filename
 # ======================================================
 def find_point_by_filename(file_name: str):
-    initialize_qdrant_collection()
-
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
@@ -312,12 +1246,12 @@ def find_point_by_filename(file_name: str):
     )
 
     try:
-        records, _ = qdrant_client.scroll(
+        records, _ = with_schema(COLLECTION_NAME, lambda: qdrant_client.scroll(
             collection_name=COLLECTION_NAME,
             scroll_filter=f,
             limit=1,
             with_payload=True,
-        )
+        ))
         return records[0] if records else None
     except Exception as e:
         print(f"❌ find_point_by_filename error: {e}")
@@ -343,12 +1277,12 @@ def find_points_by_hashes(hashes: List[str]):
             ]
         )
 
-        found_points, _ = qdrant_client.scroll(
+        found_points, _ = with_schema(COLLECTION_NAME, lambda: qdrant_client.scroll(
             collection_name=COLLECTION_NAME,
             scroll_filter=hash_filter,
             limit=len(hashes),
             with_payload=["file_hash"]
-        )
+        ))
 
         return {point.payload["file_hash"] for point in found_points if "file_hash" in point.payload}
 
@@ -357,80 +1291,84 @@ def find_points_by_hashes(hashes: List[str]):
         return set()
 
 # ======================================================
-# Job Collections Config (unchanged)
+# Batched existence checks (upload duplicate pre-pass)
 # ======================================================
-JOB_COLLECTIONS = {
-    "engineering_it": "Engineering/IT",
-    "human_resources": "Human Resources",
-    "sales_marketing": "Sales and Marketing",
-    "finance_accounting": "Finance and Accounting",
-}
+def find_existing_filenames(file_names: List[str]) -> Set[str]:
+    """The given readable_file_name values that are already stored, in one MatchAny scroll."""
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
 
-# ======================================================
-# Auto-create Job Collections
-# ======================================================
-def auto_create_job_collections():
+    values = sorted({n for n in file_names if n})
+    if not values:
+        return set()
+
+    name_filter = models.Filter(must=[
+        FieldCondition(key="readable_file_name", match=models.MatchAny(any=values))
+    ])
+
+    found: Set[str] = set()
+    offset = None
+    while True:
+        records, offset = with_schema(COLLECTION_NAME, lambda: qdrant_client.scroll(
+            collection_name=COLLECTION_NAME,
+            scroll_filter=name_filter,
+            limit=max(len(values), 64),
+            offset=offset,
+            with_payload=["readable_file_name"],
+            with_vectors=False,
+        ))
+        found.update((r.payload or {}).get("readable_file_name") for r in records)
+        # several points can share a name; stop once every name is accounted for
+        if offset is None or found.issuperset(values):
+            return found & set(values)
+
+
+def find_existing_point_ids(point_ids: List[str]) -> Set[str]:
+    """The given point ids that exist, in one retrieve."""
     if not qdrant_client:
-        return
+        raise RuntimeError("❌ Qdrant not initialized")
 
-    try:
-        collections = qdrant_client.get_collections().collections
-        existing = [c.name for c in collections]
-    except Exception:
-        existing = []
+    ids = sorted({str(pid) for pid in point_ids if pid})
+    if not ids:
+        return set()
 
-    for collection_key in JOB_COLLECTIONS.keys():
-        if collection_key not in existing:
-            try:
-                qdrant_client.recreate_collection(
-                    collection_name=collection_key,
-                    vectors_config=models.VectorParams(
-                        size=VECTOR_SIZE,
-                        distance=models.Distance.COSINE,
-                    ),
-                )
-                print(f"✅ Created {collection_key}")
-            except Exception as e:
-                print(f"⚠️ Failed to create {collection_key}: {e}")
+    records = with_schema(COLLECTION_NAME, lambda: qdrant_client.retrieve(
+        collection_name=COLLECTION_NAME,
+        ids=ids,
+        with_payload=False,
+        with_vectors=False,
+    ))
+    return {str(r.id) for r in records}
 
 # ======================================================
-# Initialize Job Collections
+# Initialize Job Collection
 # ======================================================
 def initialize_job_collections():
+    """Force a fresh schema check of the job collection."""
     if not qdrant_client:
         return
+    invalidate_schema(JOB_COLLECTION)
+    ensure_schema(JOB_COLLECTION)
 
-    auto_create_job_collections()
-
-    JOB_INDEX_FIELDS = {
-        "s3_url": models.PayloadSchemaType.KEYWORD,
-        "job_title": models.PayloadSchemaType.KEYWORD,
-        "department": models.PayloadSchemaType.KEYWORD,
-        "posting_date": models.PayloadSchemaType.DATETIME,
-        "deadline": models.PayloadSchemaType.DATETIME,
-    }
 
-    for collection_key in JOB_COLLECTIONS.keys():
-        for field_name, field_schema in JOB_INDEX_FIELDS.items():
-            try:
-                qdrant_client.create_payload_index(
-                    collection_name=collection_key,
-                    field_name=field_name,
-                    field_schema=field_schema,
-                )
-            except Exception as e:
-                if "already exists" not in str(e).lower():
-                    print(f"⚠️ Failed index {field_name} in {collection_key}: {e}")
+def job_department_filter(collection_key: Optional[str], query_filter: Optional[models.Filter] = None) -> Optional[models.Filter]:
+    """query_filter narrowed to one department (None = every department)."""
+    if collection_key is None:
+        return query_filter
+    if collection_key not in JOB_COLLECTIONS:
+        raise ValueError("Invalid collection_key")
+    return _and_filter(query_filter, models.FieldCondition(
+        key="department_key", match=models.MatchValue(value=collection_key),
+    ))
 
 # ======================================================
 # Insert Job Posting
 # ======================================================
-def insert_job_posting(collection_key: str, job_data: Dict[str, Any], vector: Optional[List[float]] = None):
+def insert_job_posting(collection_key: str, job_data: Dict[str, Any], vector: Optional[List[float]] = None,
+                       point_id: Optional[str] = None) -> str:
     if collection_key not in JOB_COLLECTIONS:
         raise ValueError("Invalid collection key")
 
-    initialize_job_collections()
-
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
@@ -439,27 +1377,66 @@ def insert_job_posting(collection_key: str, job_data: Dict[str, Any], vector: Op
         raise ValueError(f"❌ Invalid embedding size for job posting: got {len(vec)}, expected {VECTOR_SIZE}")
 
     point = PointStruct(
-        id=str(uuid.uuid4()),
+        id=point_id or str(uuid.uuid4()),
         vector=vec,
-        payload=job_data
+        payload={**job_data, "department_key": collection_key}
     )
 
-    qdrant_client.upsert(
-        collection_name=collection_key,
+    with_schema(JOB_COLLECTION, lambda: qdrant_client.upsert(
+        collection_name=JOB_COLLECTION,
         points=[point],
         wait=True
-    )
+    ))
 
     print(f"✅ Inserted job posting: {job_data.get('job_title', 'Unknown')}")
+    return str(point.id)
 
 # ======================================================
-# Search Job Collection
+# Retrieve / Update / Delete Job Posting
 # ======================================================
-def search_job_collection(collection_key: str, query_vector: List[float], query_filter: Optional[models.Filter] = None, limit: int = 50, min_score: float = 0.30):
-    if collection_key not in JOB_COLLECTIONS:
-        raise ValueError("Invalid collection_key")
+def retrieve_job(job_id: str, fields: Optional[List[str]] = None):
+    """The posting with this id in any department, or None (one retrieve call)."""
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
 
-    initialize_job_collections()
+    try:
+        records = with_schema(JOB_COLLECTION, lambda: qdrant_client.retrieve(
+            collection_name=JOB_COLLECTION,
+            ids=[job_id],
+            with_payload=_payload_selector(fields),
+        ))
+    except Exception as e:
+        print(f"❌ Job retrieve failed for {job_id}: {e}")
+        return None
+    return records[0] if records else None
+
+
+def update_job_payload(job_id: str, payload: Dict[str, Any]):
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    with_schema(JOB_COLLECTION, lambda: qdrant_client.set_payload(
+        collection_name=JOB_COLLECTION,
+        payload=payload,
+        points=[job_id],
+    ))
+
+
+def delete_job(job_id: str):
+    if not qdrant_client:
+        raise RuntimeError("❌ Qdrant not initialized")
+
+    with_schema(JOB_COLLECTION, lambda: qdrant_client.delete(
+        collection_name=JOB_COLLECTION,
+        points_selector=models.PointIdsList(points=[job_id]),
+        wait=True,
+    ))
+
+# ======================================================
+# Search Job Collection
+# ======================================================
+def search_job_collection(collection_key: Optional[str], query_vector: List[float], query_filter: Optional[models.Filter] = None, limit: int = 50, min_score: float = 0.30):
+    q_filter = job_department_filter(collection_key, query_filter)
 
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
@@ -468,14 +1445,15 @@ def search_job_collection(collection_key: str, query_vector: List[float], query_
         query_vector = [0.0] * VECTOR_SIZE
 
     try:
-        results = qdrant_client.search(
-            collection_name=collection_key,
+        results = with_schema(JOB_COLLECTION, lambda: qdrant_client.search(
+            collection_name=JOB_COLLECTION,
             query_vector=query_vector,
-            query_filter=query_filter,
+            query_filter=q_filter,
             limit=limit,
             with_payload=True,
             with_vectors=False,
-        )
+            search_params=build_search_params(),
+        ))
     except Exception as e:
         print(f"❌ Job collection search error: {e}")
         return []
@@ -486,71 +1464,55 @@ def search_job_collection(collection_key: str, query_vector: List[float], query_
 # ======================================================
 # Get All Job Postings
 # ======================================================
-def get_all_job_postings(collection_key: str):
-    if collection_key not in JOB_COLLECTIONS:
-        raise ValueError("Invalid collection_key")
+def iter_job_postings(
+    collection_key: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    query_filter: Optional[models.Filter] = None,
+    page_size: int = 200,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """Postings of one department, or of all of them when collection_key is None."""
+    return iter_points(
+        fields=fields,
+        query_filter=job_department_filter(collection_key, query_filter),
+        page_size=page_size,
+        prefetch=prefetch,
+        collection_name=JOB_COLLECTION,
+    )
 
-    initialize_job_collections()
+
+def get_all_job_postings(collection_key: Optional[str] = None):
+    """Every posting as one list; prefer iter_job_postings() for large collections."""
+    if collection_key is not None and collection_key not in JOB_COLLECTIONS:
+        raise ValueError("Invalid collection_key")
 
     if not qdrant_client:
         raise RuntimeError("❌ Qdrant not initialized")
 
-    all_records = []
-    next_offset = None
-
     try:
-        while True:
-            records, next_offset = qdrant_client.scroll(
-                collection_name=collection_key,
-                with_payload=True,
-                with_vectors=False,
-                limit=200,
-                offset=next_offset,
-            )
-            all_records.extend(records)
-
-            if not next_offset:
-                break
-
-        return all_records
+        return list(iter_job_postings(collection_key))
 
     except Exception as e:
-        print(f"❌ Scroll failed for {collection_key}: {e}")
+        print(f"❌ Scroll failed for {collection_key or JOB_COLLECTION}: {e}")
         return []
 
-# ======================================================
-# Initialize Job Collections on Import
-# ======================================================
-try:
-    initialize_qdrant_collection()
-    initialize_job_collections()
-except Exception as e:
-    print(f"❌ Job collections initialization error: {e}")
-
 # ======================================================
 # ADDITIONAL HELPERS (Minimal additions requested)
 # ======================================================
-from .embedding_service import get_text_embedding
+from .embedding_service import get_text_embeddings
 
 def _average_embeddings(texts: List[str]) -> List[float]:
     """Compute average embedding for list of texts (safe fallback)."""
+    texts = [t for t in (texts or []) if t]
     if not texts:
         return [0.0] * VECTOR_SIZE
 
-    embeddings = []
-    for t in texts:
-        try:
-            emb = get_text_embedding(t)
-            if emb:
-                embeddings.append(emb)
-        except Exception:
-            pass
-
-    if not embeddings:
+    try:
+        embeddings = get_text_embeddings(texts)
+    except Exception:
         return [0.0] * VECTOR_SIZE
 
-    import numpy as _np
-    mean_vec = _np.mean(_np.array(embeddings, dtype=float), axis=0).tolist()
+    mean_vec = embeddings.mean(axis=0).tolist()
 
     if len(mean_vec) < VECTOR_SIZE:
         mean_vec += [0.0] * (VECTOR_SIZE - len(mean_vec))
@@ -560,17 +1522,38 @@ def _average_embeddings(texts: List[str]) -> List[float]:
     return mean_vec
 
 def upsert_resume_with_skills(resume_payload: Dict[str, Any], skills: List[str], point_id: Optional[str] = None) -> str:
-    """Create/Upsert a resume but compute vector from skills average."""
+    """
+    Create/Upsert a resume with a vector computed from the skills average.
+    On a named-vector collection this only fills the skills slot: an existing
+    point keeps its text/summary vectors.
+    """
     pid = point_id if point_id else str(uuid.uuid4())
     vec = _average_embeddings(skills)
+
+    if uses_named_vectors(COLLECTION_NAME):
+        existing = with_schema(COLLECTION_NAME, lambda: qdrant_client.retrieve(
+            collection_name=COLLECTION_NAME, ids=[pid], with_payload=False,
+        ))
+        if existing:
+            with_schema(COLLECTION_NAME, lambda: qdrant_client.update_vectors(
+                collection_name=COLLECTION_NAME,
+                points=[models.PointVectors(id=pid, vector={SKILLS_VECTOR: vec})],
+                wait=True,
+            ))
+            with_schema(COLLECTION_NAME, lambda: qdrant_client.set_payload(
+                collection_name=COLLECTION_NAME, payload=resume_payload, points=[pid], wait=True,
+            ))
+            return pid
+        upsert_point(pid, {SKILLS_VECTOR: vec}, resume_payload)
+        return pid
+
     upsert_point(pid, vec, resume_payload)
     return pid
 
 def add_job_posting_with_embeddings(collection_key: str, job_data: Dict[str, Any], jd_keywords: List[str]) -> str:
     pid = str(uuid.uuid4())
     vec = _average_embeddings(jd_keywords)
-    insert_job_posting(collection_key, {**job_data, "point_id": pid}, vec)
-    return pid
+    return insert_job_posting(collection_key, {**job_data, "point_id": pid}, vec, point_id=pid)
 
 def match_resume_to_jobs(collection_key: str, resume_skills: List[str], top_k: int = 10):
     vec = _average_embeddings(resume_skills)
@@ -594,18 +1577,23 @@ def cosine_similarity(a: List[float], b: List[float]) -> float:
 
 # In qdrant_service.py (Add to bottom)
 
-def get_points_paginated(collection_name: str = COLLECTION_NAME, offset=None, limit: int = 12):
-    initialize_qdrant_collection()
+def get_points_paginated(
+    collection_name: str = COLLECTION_NAME,
+    offset=None,
+    limit: int = 12,
+    fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+):
     if not qdrant_client: return [], None
 
     try:
-        records, next_offset = qdrant_client.scroll(
+        records, next_offset = with_schema(collection_name, lambda: qdrant_client.scroll(
             collection_name=collection_name,
-            with_payload=True,
+            with_payload=_payload_selector(fields, exclude_fields),
             with_vectors=False,
             limit=limit,
             offset=offset
-        )
+        ))
         return records, next_offset
     except Exception as e:
         print(f"❌ Pagination Scroll failed: {e}")
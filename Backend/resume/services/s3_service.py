@@ -2,6 +2,7 @@ import boto3
 import uuid
 import re
 import os
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from django.conf import settings
 from dotenv import load_dotenv
@@ -25,12 +26,23 @@ def _get_s3_client():
 s3 = _get_s3_client()
 BUCKET = settings.AWS_STORAGE_BUCKET_NAME
 
+# Resumes are streamed from their file handle; above the threshold they go up
+# as a multipart upload, and at most chunksize * max_concurrency bytes of one
+# file are buffered at a time
+MB = 1024 * 1024
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8")) * MB,
+    multipart_chunksize=int(os.getenv("S3_MULTIPART_CHUNK_MB", "8")) * MB,
+    max_concurrency=int(os.getenv("S3_UPLOAD_CONCURRENCY", "2")),
+)
+
 
 # ======================================================
 # Upload Resume
 # ======================================================
 def upload_resume_to_s3(file_obj, content_type, candidate_name=None):
-    s3_client = _get_s3_client()
+    # shared client: safe to use from the upload pipeline's worker threads
+    s3_client = s3
     file_extension = file_obj.name.split('.')[-1]
 
     # Prepare clean file name
@@ -50,6 +62,7 @@ def upload_resume_to_s3(file_obj, content_type, candidate_name=None):
             Bucket=BUCKET,
             Key=object_name,
             ExtraArgs={"ContentType": content_type},
+            Config=UPLOAD_TRANSFER_CONFIG,
         )
 
         s3_url = f"https://{BUCKET}.s3.{settings.AWS_REGION_NAME}.amazonaws.com/{object_name}"
@@ -0,0 +1,98 @@
+# resume/services/sparse_service.py
+"""
+BM25-style sparse vectors for Qdrant hybrid search.
+
+Terms are mapped to ids by hashing (no vocabulary file to keep in sync), so
+any process can build a query vector for any term. Documents store the BM25
+term-frequency part; the IDF part is applied by Qdrant (Modifier.IDF on the
+sparse vector), so it always reflects the current corpus.
+"""
+import hashlib
+import os
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from qdrant_client.http import models
+
+BM25_K1 = float(os.getenv("SPARSE_BM25_K1", "1.2"))
+BM25_B = float(os.getenv("SPARSE_BM25_B", "0.75"))
+# Typical resume length in tokens (BM25 length normalization)
+BM25_AVG_DOC_LEN = float(os.getenv("SPARSE_AVG_DOC_LEN", "400"))
+# Extracted skills count as this many occurrences of the skill phrase
+SKILL_TERM_WEIGHT = float(os.getenv("SPARSE_SKILL_TERM_WEIGHT", "3"))
+
+# Keeps c++, c#, node.js, ci/cd-style tokens intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9\+\#\./]*")
+_SHORT_TERMS = {"c", "r", "go"}
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "our", "that", "the", "their", "to",
+    "was", "were", "will", "with", "we", "you", "your", "i", "my", "me", "this",
+    "experience", "years", "year", "work", "worked", "working", "using", "used",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for tok in _TOKEN_RE.findall((text or "").lower()):
+        tok = tok.rstrip("./")
+        if not tok or tok in _STOPWORDS:
+            continue
+        if len(tok) < 2 and tok not in _SHORT_TERMS:
+            continue
+        tokens.append(tok)
+    return tokens
+
+
+def _skill_term(skill: str) -> str:
+    return "skill:" + " ".join(tokenize(skill) or (skill or "").lower().split())
+
+
+def term_id(term: str) -> int:
+    """Stable 31-bit id for a term."""
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little") & 0x7FFFFFFF
+
+
+def _to_sparse(weights: dict) -> models.SparseVector:
+    by_id = {}
+    for term, weight in weights.items():
+        tid = term_id(term)
+        by_id[tid] = by_id.get(tid, 0.0) + weight
+    indices = sorted(by_id)
+    return models.SparseVector(indices=indices, values=[float(by_id[i]) for i in indices])
+
+
+def _bm25_tf(tf: float, doc_len: int) -> float:
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / BM25_AVG_DOC_LEN)
+    return tf * (BM25_K1 + 1) / (tf + norm)
+
+
+def document_sparse_vector(text: str, skills: Optional[Iterable[str]] = None) -> models.SparseVector:
+    """BM25 term weights for resume text plus one phrase term per extracted skill."""
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+    for skill in skills or []:
+        if skill:
+            counts[_skill_term(skill)] += SKILL_TERM_WEIGHT
+
+    doc_len = max(1, len(tokens))
+    return _to_sparse({term: _bm25_tf(tf, doc_len) for term, tf in counts.items()})
+
+
+def query_sparse_vector(text: str, keywords: Optional[Iterable[str]] = None) -> models.SparseVector:
+    """
+    Unit weight per distinct query term. Word 1-3-grams and the given keywords
+    are also tried as skill phrases, so "machine learning" hits the skill term.
+    """
+    tokens = tokenize(text)
+    terms = set(tokens)
+    for n in (1, 2, 3):
+        for i in range(len(tokens) - n + 1):
+            terms.add("skill:" + " ".join(tokens[i:i + n]))
+    for kw in keywords or []:
+        if kw:
+            terms.update(tokenize(kw))
+            terms.add(_skill_term(kw))
+    return _to_sparse({term: 1.0 for term in terms})
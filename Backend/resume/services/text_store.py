@@ -0,0 +1,131 @@
+# resume/services/text_store.py
+"""
+Content-addressed store for extracted resume text.
+
+The full text is kept out of the Qdrant payload: it is compressed (zstd when
+the `zstandard` package is installed, gzip otherwise) and stored under a key
+derived from the resume's file_hash. Only that key ("resume_text_ref") goes
+into the payload.
+
+Backends (TEXT_STORE_BACKEND):
+  - "local": files under TEXT_STORE_DIR (default <BASE_DIR>/text_store)
+  - "s3":    objects under the `text/` prefix of the resume bucket
+"""
+import gzip
+import os
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+
+# Optional packages
+try:
+    import zstandard
+    _ZSTD_AVAILABLE = True
+except Exception:
+    _ZSTD_AVAILABLE = False
+
+TEXT_STORE_BACKEND = os.getenv("TEXT_STORE_BACKEND", "local").strip().lower()
+TEXT_STORE_DIR = os.getenv("TEXT_STORE_DIR", "").strip() or os.path.join(str(settings.BASE_DIR), "text_store")
+TEXT_PREFIX = "text/"
+
+_HASH_RE = re.compile(r"^[0-9a-f]{16,128}$")
+
+
+# ======================================================
+# Compression
+# ======================================================
+def _compress(text: str) -> Tuple[bytes, str]:
+    raw = (text or "").encode("utf-8")
+    if _ZSTD_AVAILABLE:
+        return zstandard.ZstdCompressor(level=10).compress(raw), "zst"
+    return gzip.compress(raw, compresslevel=6), "gz"
+
+
+def _decompress(blob: bytes, ext: str) -> str:
+    if ext == "zst":
+        if not _ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is required to read .zst resume text")
+        return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+    return gzip.decompress(blob).decode("utf-8")
+
+
+def _key_for(file_hash: str, ext: str) -> str:
+    if not _HASH_RE.match(file_hash or ""):
+        raise ValueError(f"Invalid file_hash for text store: {file_hash!r}")
+    return f"{TEXT_PREFIX}{file_hash[:2]}/{file_hash}.txt.{ext}"
+
+
+# ======================================================
+# Backends
+# ======================================================
+def _local_path(key: str) -> str:
+    return os.path.join(TEXT_STORE_DIR, *key.split("/"))
+
+
+def _write(key: str, blob: bytes):
+    if TEXT_STORE_BACKEND == "s3":
+        from .s3_service import s3, BUCKET
+        s3.put_object(Bucket=BUCKET, Key=key, Body=blob, ContentType="application/octet-stream")
+        return
+
+    path = _local_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as fh:
+        fh.write(blob)
+    os.replace(tmp, path)
+
+
+def _read(key: str) -> bytes:
+    if TEXT_STORE_BACKEND == "s3":
+        from .s3_service import s3, BUCKET
+        return s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+
+    with open(_local_path(key), "rb") as fh:
+        return fh.read()
+
+
+def _exists(key: str) -> bool:
+    if TEXT_STORE_BACKEND == "s3":
+        from .s3_service import s3, BUCKET
+        try:
+            s3.head_object(Bucket=BUCKET, Key=key)
+            return True
+        except Exception:
+            return False
+    return os.path.exists(_local_path(key))
+
+
+# ======================================================
+# Public API
+# ======================================================
+def put_text(file_hash: str, text: str) -> str:
+    """Store text for a file hash (no-op if already stored) and return its ref."""
+    blob, ext = _compress(text)
+    key = _key_for(file_hash, ext)
+    if not _exists(key):
+        _write(key, blob)
+    return key
+
+
+def get_text(ref: str) -> str:
+    if not ref or not ref.startswith(TEXT_PREFIX) or ".." in ref:
+        raise ValueError(f"Invalid resume text ref: {ref!r}")
+    ext = ref.rsplit(".", 1)[-1]
+    return _decompress(_read(ref), ext)
+
+
+def resolve_resume_text(payload: Optional[Dict[str, Any]]) -> str:
+    """Text for a resume payload: inline (older points) or fetched from the store."""
+    payload = payload or {}
+    if payload.get("resume_text"):
+        return payload["resume_text"]
+    ref = payload.get("resume_text_ref")
+    if not ref:
+        return ""
+    try:
+        return get_text(ref)
+    except Exception as e:
+        print(f"⚠️ Failed to load resume text {ref}: {e}")
+        return ""
@@ -0,0 +1,313 @@
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from .models import IngestionFile, IngestionJob
+from .services import ingestion_service
+from .services import qdrant_service as qs
+from .services import sparse_service
+
+
+# ======================================================
+# Cursor pagination (list_points_filtered)
+# ======================================================
+class CursorTests(SimpleTestCase):
+    def test_cursor_round_trip(self):
+        for state in (
+            {"p": "id", "v": None, "off": None},
+            {"p": "group", "v": 3, "off": str(uuid.uuid4())},
+            {"p": "ordered", "v": 4.5, "off": None},
+            {"p": "missing", "v": None, "off": 17},
+        ):
+            order_by = None if state["p"] == "id" else "cpd_level"
+            self.assertEqual(qs._decode_cursor(qs._encode_cursor(state), order_by), state)
+
+    def test_invalid_cursors_raise_value_error(self):
+        bad = [
+            "not-base64-json",
+            qs._encode_cursor({"p": "ordered", "v": None, "off": None}),  # needs order_by
+            qs._encode_cursor({"p": "sideways", "v": None, "off": None}),
+        ]
+        for cursor in bad:
+            with self.assertRaises(ValueError):
+                qs._decode_cursor(cursor)
+
+        for state in (
+            {"p": "group", "v": "3", "off": None},
+            {"p": "group", "v": None, "off": None},
+            {"p": "missing", "v": None, "off": True},
+            {"p": "id", "v": None, "off": None},
+        ):
+            with self.assertRaises(ValueError):
+                qs._decode_cursor(qs._encode_cursor(state), "cpd_level")
+
+
+class ListPointsFilteredTests(SimpleTestCase):
+    """Pages through a real (in-memory) Qdrant collection with many tied values."""
+
+    collection = "test_cursor_listing"
+
+    def setUp(self):
+        self.client = QdrantClient(":memory:")
+        self.client.create_collection(
+            collection_name=self.collection,
+            vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE),
+        )
+        # cpd levels with long runs of ties, plus points without the key
+        levels = [5] * 4 + [4] * 5 + [2] * 3 + [None] * 3
+        self.points = {}
+        for i, level in enumerate(levels, 1):
+            payload = {"candidate_name": f"c{i}"}
+            if level is not None:
+                payload["cpd_level"] = level
+            self.points[i] = level
+            self.client.upsert(
+                collection_name=self.collection,
+                points=[models.PointStruct(id=i, vector=[1.0, 0.5], payload=payload)],
+            )
+        patcher = mock.patch.object(qs, "qdrant_client", self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _all_pages(self, limit):
+        seen, cursor, pages = [], None, 0
+        while True:
+            listing = qs.list_points_filtered(
+                order_by="cpd_level",
+                limit=limit,
+                cursor=cursor,
+                with_total=False,
+                collection_name=self.collection,
+            )
+            self.assertLessEqual(len(listing["points"]), limit)
+            seen.extend(p.id for p in listing["points"])
+            cursor = listing["next_cursor"]
+            pages += 1
+            self.assertLess(pages, 50)
+            if cursor is None:
+                return seen
+
+    def test_every_point_listed_once_in_order(self):
+        for limit in (1, 2, 3, 7, 20):
+            seen = self._all_pages(limit)
+            self.assertEqual(sorted(seen), sorted(self.points))
+
+            levels = [self.points[i] for i in seen]
+            ranked = [lvl for lvl in levels if lvl is not None]
+            self.assertEqual(ranked, sorted(ranked, reverse=True))
+            # points without cpd_level come last
+            self.assertEqual(levels[len(ranked):], [None] * (len(levels) - len(ranked)))
+
+    def test_forged_cursor_is_rejected(self):
+        forged = qs._encode_cursor({"p": "group", "v": "x", "off": None})
+        with self.assertRaises(ValueError):
+            qs.list_points_filtered(order_by="cpd_level", cursor=forged, collection_name=self.collection)
+
+
+# ======================================================
+# Hybrid search (dense + sparse fused in Qdrant)
+# ======================================================
+def _unit(axis):
+    vector = [0.0] * qs.VECTOR_SIZE
+    vector[axis] = 1.0
+    return vector
+
+
+class HybridSearchTests(SimpleTestCase):
+    collection = "test_hybrid_resumes"
+
+    def setUp(self):
+        self.client = QdrantClient(":memory:")
+        for patcher in (
+            mock.patch.object(qs, "qdrant_client", self.client),
+            mock.patch.object(qs, "COLLECTION_NAME", self.collection),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(qs.invalidate_schema, self.collection)
+        qs.invalidate_schema(self.collection)
+        qs.create_resume_collection(self.collection)
+
+        # 1: best dense match, 2: only keyword match, 3: neither
+        docs = [(1, _unit(0), "java spring developer"), (2, _unit(1), "kubernetes operator"), (3, _unit(2), "chef")]
+        self.client.upsert(collection_name=self.collection, points=[
+            models.PointStruct(
+                id=pid,
+                vector={
+                    **{name: dense for name in qs.RESUME_VECTORS},
+                    qs.SPARSE_VECTOR: sparse_service.document_sparse_vector(text),
+                },
+                payload={"candidate_name": text},
+            )
+            for pid, dense, text in docs
+        ])
+
+    def test_fusion_ranks_dense_and_keyword_hits_first(self):
+        for fusion in ("rrf", "dbsf"):
+            hits = qs.hybrid_search(
+                {qs.TEXT_VECTOR: _unit(0)},
+                sparse_service.query_sparse_vector("kubernetes"),
+                fusion=fusion,
+                limit=3,
+            )
+            ids = [hit.id for hit in hits]
+            self.assertEqual(set(ids[:2]), {1, 2}, fusion)
+            self.assertEqual(ids[2:], [3], fusion)
+
+    def test_collection_without_sparse_vectors_falls_back(self):
+        self.client.delete_collection(self.collection)
+        self.client.create_collection(
+            collection_name=self.collection,
+            vectors_config=models.VectorParams(size=qs.VECTOR_SIZE, distance=models.Distance.COSINE),
+        )
+        qs.invalidate_schema(self.collection)
+        self.assertIsNone(qs.hybrid_search({qs.TEXT_VECTOR: _unit(0)}, sparse_service.query_sparse_vector("java")))
+
+
+# ======================================================
+# Ingestion: stage limits and in-batch duplicates
+# ======================================================
+class StageLimitTests(SimpleTestCase):
+    def test_map_files_keeps_order_and_respects_stage_limit(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work(n):
+            nonlocal active, peak
+            with ingestion_service.stage("llm"):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.01)
+                with lock:
+                    active -= 1
+            return n * 2
+
+        with mock.patch.dict(ingestion_service._STAGES, {"llm": threading.BoundedSemaphore(2)}):
+            results = ingestion_service.map_files(work, range(12), workers=6)
+
+        self.assertEqual(results, [n * 2 for n in range(12)])
+        self.assertLessEqual(peak, 2)
+
+    def test_repeated_in_batch_keeps_first_copy(self):
+        keys = ["cv.pdf", "a.pdf", "cv.pdf", None, None, "a.pdf", "b.pdf"]
+        self.assertEqual(ingestion_service.repeated_in_batch(keys), {2, 5})
+
+
+class ProcessJobDuplicateTests(TransactionTestCase):
+    """process_job end to end with the external services (Bedrock, S3, Qdrant) patched out."""
+
+    def setUp(self):
+        self.staging = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.staging, ignore_errors=True)
+
+        self.extract = mock.Mock(side_effect=lambda fh: {
+            "candidate_name": "Jane Doe",
+            "email": "jane@example.com",
+            "experience_years": 4,
+            "cpd_level": 3,
+            "skills": ["Python", "python "],
+            "resume_text": fh.read().decode(),
+            "llm_ok": True,
+        })
+        self.indexed = []
+
+        def index_prepared(pending, on_stage=None):
+            self.indexed.extend(pending)
+            return [None] * len(pending)
+
+        patches = [
+            mock.patch.object(ingestion_service, "INGEST_STAGING_DIR", self.staging),
+            mock.patch.object(ingestion_service, "wake_worker", mock.Mock()),
+            mock.patch.object(ingestion_service, "find_duplicate_filenames", mock.Mock(return_value=set())),
+            mock.patch.object(ingestion_service, "find_points_by_hashes", mock.Mock(return_value=set())),
+            mock.patch.object(ingestion_service, "extract_fields", self.extract),
+            mock.patch.object(
+                ingestion_service, "upload_resume_to_s3",
+                mock.Mock(return_value="https://bucket.s3.eu-west-1.amazonaws.com/resumes/Jane_Doe.pdf"),
+            ),
+            mock.patch.object(ingestion_service, "put_text", mock.Mock(return_value="text/ab/ab.txt.gz")),
+            mock.patch.object(ingestion_service, "index_prepared", index_prepared),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _run(self, files):
+        uploads = [SimpleUploadedFile(name, body, content_type="text/plain") for name, body in files]
+        job = ingestion_service.create_job(uploads, {"candidate_type": "external"})
+        ingestion_service.process_job(job)
+        job.refresh_from_db()
+        return job, {f.position: f for f in job.files.all()}
+
+    def test_repeated_names_in_one_upload(self):
+        job, rows = self._run([
+            ("CV.pdf", b"first resume"),
+            ("cv.pdf ", b"second resume"),
+            ("Other.pdf", b"third resume"),
+        ])
+        self.assertEqual(job.status, "done")
+        self.assertEqual([rows[i].status for i in range(3)], ["uploaded", "duplicate", "uploaded"])
+        self.assertEqual(self.extract.call_count, 2)
+        self.assertEqual(len({item["point_id"] for item in self.indexed}), 2)
+
+    def test_identical_content_in_one_upload(self):
+        job, rows = self._run([
+            ("alice.pdf", b"same bytes"),
+            ("bob.pdf", b"other bytes"),
+            ("alice-renamed.pdf", b"same bytes"),
+        ])
+        self.assertEqual([rows[i].status for i in range(3)], ["uploaded", "uploaded", "duplicate"])
+        self.assertEqual(self.extract.call_count, 2)
+        # payloads are stored normalized
+        self.assertEqual(self.indexed[0]["payload"]["skills"], ["python"])
+        self.assertEqual(self.indexed[0]["payload"]["experience_years"], 4)
+
+
+# ======================================================
+# Ingestion jobs: claiming
+# ======================================================
+class ClaimNextJobTests(TestCase):
+    def test_claims_oldest_queued_job(self):
+        first = IngestionJob.objects.create()
+        IngestionJob.objects.create()
+
+        claimed = ingestion_service.claim_next_job()
+
+        self.assertEqual(claimed.pk, first.pk)
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, "running")
+        self.assertIsNotNone(claimed.heartbeat_at)
+
+    def test_running_job_with_fresh_heartbeat_is_not_claimed(self):
+        IngestionJob.objects.create(status="running", heartbeat_at=timezone.now())
+        self.assertIsNone(ingestion_service.claim_next_job())
+
+    def test_stale_running_job_is_reclaimed(self):
+        stale = IngestionJob.objects.create(
+            status="running",
+            heartbeat_at=timezone.now() - timedelta(seconds=ingestion_service.INGEST_STALE_SECONDS + 60),
+        )
+        IngestionFile.objects.create(job=stale, position=0, file_name="a.pdf", status="uploaded", stage="finished")
+
+        claimed = ingestion_service.claim_next_job()
+
+        self.assertEqual(claimed.pk, stale.pk)
+        claimed.refresh_from_db()
+        self.assertGreater(claimed.heartbeat_at, timezone.now() - timedelta(seconds=60))
+
+    def test_finished_jobs_are_not_claimed(self):
+        IngestionJob.objects.create(status="done")
+        IngestionJob.objects.create(status="failed")
+        self.assertIsNone(ingestion_service.claim_next_job())
@@ -1,6 +1,7 @@
 from django.urls import path
 from . import views
 from . import job_views
+from . import async_views
 from .views import (
     filter_resumes,
     view_resume,
@@ -14,13 +15,16 @@ from .views import (
 urlpatterns = [
     # ========== HOME ==========
     path('', views.home, name='home'),
+    path('embedding/ready/', views.embedding_ready, name='embedding_ready'),
    
     # ========== RESUME UPLOAD & MANAGEMENT ==========
     path('upload-resume/', views.ResumeUploadView.as_view(), name='upload_resume'),
+    path('upload-jobs/<uuid:job_id>/', views.ingestion_job_status, name='ingestion_job_status'),  # Upload progress
     path('check-hashes/', check_hashes, name='check_hashes'),  # ✅ Hash-based dedup check
     path('resumes/', views.ResumeListView.as_view(), name='resume_list'),
     path('fetch-all-resumes/', fetch_all_resumes, name='fetch_all_resumes'),  # Optional: faster bulk fetch
     path('resumes/delete/<str:id>/', views.ResumeDeleteView.as_view(), name='resume_delete'),
+    path('resumes/<str:point_id>/text/', views.resume_full_text, name='resume_text'),  # Lazy full text
    
     # ========== RESUME SEARCH & VIEWING ==========
     path('search/', views.ResumeSearchView.as_view(), name='resume_search'),
@@ -81,6 +85,13 @@ path('confirmed-matches/save/', views.confirm_resume_matches, name='confirm_matc
 path('confirmed-matches/list/', views.get_confirmed_matches, name='get_confirmed_matches'),
 path('match_keywords/', views.match_resume_keywords, name='match_resume_keywords'),
 path('confirmed-matches/stage/<int:match_id>/', job_views.update_hiring_stage, name='update_hiring_stage'),
+
+# ========== ASYNC (ASGI) READ ENDPOINTS ==========
+path('async/search/', async_views.resume_search, name='async_resume_search'),
+path('async/resumes/', async_views.resume_list, name='async_resume_list'),
+path('async/analytics/', async_views.analytics_overview, name='async_analytics'),
+path('async/jobs/list/', async_views.list_jobs, name='async_list_jobs'),
+path('async/jobs/details/<str:job_id>/', async_views.get_job_details, name='async_get_job_details'),
 ]
  
  
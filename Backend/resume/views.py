@@ -1,5 +1,5 @@
+import heapq
 import uuid
-import io
 import os
 import re
 import traceback
@@ -17,28 +17,39 @@ from django.shortcuts import redirect
 from botocore.exceptions import ClientError
 from urllib.parse import unquote, urlparse
 import requests
-import hashlib
 
 # services 
-from .services.s3_service import upload_resume_to_s3, list_pdfs, get_pdf_bytes, get_presigned_url, s3, BUCKET
-from .services.extract_data import extract_fields
-from .services.embedding_service import get_text_embedding
+from .services.s3_service import list_pdfs, get_pdf_bytes, get_presigned_url, s3, BUCKET
+from .services.text_store import resolve_resume_text
+from .services.embedding_service import (
+    get_text_embedding,
+    get_document_embeddings,
+    get_skills_embeddings,
+)
+from .services import embedding_service
+from .services import ingestion_service
+from .services.ingestion_service import filename_to_point_id as _filename_to_point_id
+from .services.sparse_service import query_sparse_vector
 from .services.qdrant_service import (
-    qdrant_client,
-    upsert_point,
-    search_collection,
-    get_all_points,
+    iter_points,
     get_points_paginated,
     delete_point,
     retrieve_point,
-    find_point_by_filename,
-    find_points_by_hashes
+    find_points_by_hashes,
+    search_resumes_weighted,
+    hybrid_search,
+    list_points_filtered,
+    count_by_filters,
+    facet_counts,
+    parse_vector_weights,
+    TEXT_VECTOR,
+    SKILLS_VECTOR,
+    SUMMARY_VECTOR,
 )
 from .services.pdf_parser import extract_text_from_pdf_bytes, parse_resume as simple_parse_resume
 from .services.jd_keyword_service import extract_jd_keywords, match_resume_to_jd
 from qdrant_client.http import models
-from .services.qdrant_service import search_collection
-from .models import ConfirmedMatch
+from .models import ConfirmedMatch, IngestionJob, AppUser
 from django.db import IntegrityError
 from resume.services.keyword_match_service import KeywordMatchService
 from qdrant_client.http.models import MatchAny
@@ -70,37 +81,71 @@ def _split_skills(lines: list) -> list:
 
     return result
 
-def _normalize_filename(fn: str) -> str:
-    """
-    Normalization used across upload/check/migration:
-      - strip whitespace
-      - collapse internal whitespace
-      - strip leading/trailing dots/spaces
-      - lowercase (for deterministic id)
-    Returns normalized lowercase string (suitable for uuid5).
-    """
-    if not fn:
-        return ""
-    s = fn.strip()
-    s = re.sub(r"\s+", " ", s)
-    s = s.strip(". ")
-    return s.lower()
-
-
-def _filename_to_point_id(fn: str) -> str:
+# Payload fields each endpoint actually renders (resume_text is fetched lazily)
+RESUME_CARD_FIELDS = [
+    "candidate_name",
+    "email",
+    "experience_years",
+    "cpd_level",
+    "skills",
+    "s3_url",
+    "file_name",
+    "readable_file_name",
+]
+JD_MATCH_FIELDS = RESUME_CARD_FIELDS + ["salary", "salary_currency", "candidate_type"]
+# Best matches returned by jd_match (request "limit" overrides, capped at 1000)
+JD_MATCH_LIMIT = int(os.getenv("JD_MATCH_LIMIT", "200"))
+
+
+def _iter_resumes_for_matching(fields):
+    """iter_points() that stops (with a log line) instead of raising if Qdrant fails mid-stream."""
+    try:
+        yield from iter_points(fields=fields)
+    except Exception as e:
+        print(f"❌ Failed to fetch resumes for JD matching: {e}")
+
+# Dashboard experience buckets: (label, gte, lt); fractional years fall into the
+# bucket of their whole part (2.5 -> "0-2 yrs")
+EXPERIENCE_BUCKETS = [
+    ("0-2 yrs", 0, 3),
+    ("3-5 yrs", 3, 6),
+    ("6-10 yrs", 6, 11),
+    ("10+ yrs", 11, None),
+]
+
+# Top skills on the dashboard. More facet buckets are fetched than shown so
+# spellings that differ only in case/whitespace (older points, see
+# `manage.py normalize_resume_payloads`) can be merged before the cut.
+ANALYTICS_TOP_SKILLS = 20
+ANALYTICS_SKILL_FACET_LIMIT = 100
+
+# Default named-vector weights for resume search, e.g. "text:0.5,skills:0.5"
+RESUME_SEARCH_VECTOR_WEIGHTS = parse_vector_weights(
+    os.getenv("RESUME_SEARCH_VECTOR_WEIGHTS", "text:1")
+) or {TEXT_VECTOR: 1.0}
+
+# Dense + sparse (BM25) search fused in Qdrant; "rrf" or "dbsf"
+RESUME_SEARCH_HYBRID = os.getenv("RESUME_SEARCH_HYBRID", "true").lower() == "true"
+RESUME_SEARCH_FUSION = os.getenv("RESUME_SEARCH_FUSION", "rrf").strip().lower()
+
+
+def _query_vectors(text: str, keywords: list, weights: dict, long_text: bool = False) -> dict:
     """
-    Convert a filename (string) to a deterministic UUID string (UUID5).
-    Falls back to a random UUID if something goes wrong.
+    Query embedding per requested named vector: text/summary use the query
+    text itself (chunked + pooled when long_text, e.g. a full JD), skills uses
+    the mean of the keyword embeddings (the same way resume skill vectors are
+    built), falling back to the text embedding.
     """
-    try:
-        normalized = _normalize_filename(fn)
-        if not normalized:
-            return str(uuid.uuid4())
-        # We need uuid to be imported, so let's make sure it is at the top
-        # (Your file already has 'import uuid' at the top, so this is fine)
-        return str(uuid.uuid5(uuid.NAMESPACE_DNS, normalized))
-    except Exception:
-        return str(uuid.uuid4())
+    vectors = {}
+    if TEXT_VECTOR in weights or SUMMARY_VECTOR in weights:
+        vec = get_document_embeddings([text])[0].tolist() if long_text else get_text_embedding(text)
+        vectors[TEXT_VECTOR] = vectors[SUMMARY_VECTOR] = vec
+    if SKILLS_VECTOR in weights:
+        skills_vec = get_skills_embeddings([keywords or []])[0]
+        vectors[SKILLS_VECTOR] = (
+            skills_vec.tolist() if skills_vec.any() else get_text_embedding(text)
+        )
+    return vectors
 
 # -----------------------------
 # Home
@@ -109,6 +154,21 @@ def home(request):
     return HttpResponse("Welcome to ProMatch Resume Portal!")
 
 
+# -----------------------------
+# Embedding model readiness (polled by the deployment)
+# -----------------------------
+def embedding_ready(request):
+    ready = embedding_service.is_ready()
+    return JsonResponse(
+        {
+            "ready": ready,
+            "model": embedding_service.model_id(),
+            "cache": embedding_service.cache_stats(),
+        },
+        status=200 if ready else 503,
+    )
+
+
 # -----------------------------
 # Upload endpoint (class based)
 # -----------------------------
@@ -119,6 +179,9 @@ class ResumeUploadView(APIView):
     """
     Handles multi-file multipart-form uploads from the frontend.
     Duplicate detection and identity are based ONLY on the uploaded filename (normalized).
+
+    The files are staged and handed to the ingestion worker; the response
+    carries the job id to poll at upload-jobs/<job_id>/.
     """
 
     def post(self, request, *args, **kwargs):
@@ -127,217 +190,69 @@ class ResumeUploadView(APIView):
         if not resume_files:
             return Response({"error": "No resume files provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if len(resume_files) > 25:
+        if len(resume_files) > ingestion_service.INGEST_MAX_FILES:
             return Response(
-                {"error": "You can upload a maximum of 25 resumes at a time."},
+                {"error": f"You can upload a maximum of {ingestion_service.INGEST_MAX_FILES} resumes at a time."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # ✅ NEW: extra metadata for this batch
-        salary = request.data.get("salary")
-        salary_currency = request.data.get("salary_currency")
-        candidate_type = request.data.get("candidate_type")
-
-        uploaded_results = []
-        skipped_duplicates = []
-        errors = []
-
-        qc = qdrant_client
-
-        for resume_file in resume_files:
-            try:
-                incoming_name = (resume_file.name or "").strip()
-                if not incoming_name:
-                    errors.append(f"{resume_file.name or 'unknown'}: missing filename")
-                    continue
-
-                readable_file_name = incoming_name
-                normalized_key = _normalize_filename(readable_file_name)
-
-                # === Filename-only duplicate check ===
-                is_duplicate = False
-                try:
-                    if qc:
-                        variants = {
-                            readable_file_name,
-                            readable_file_name.lower(),
-                            f"resumes/{readable_file_name}",
-                            f"resumes/{readable_file_name.lower()}",
-                        }
-                        for v in variants:
-                            try:
-                                fil = models.Filter(
-                                    must=[
-                                        models.FieldCondition(
-                                            key="readable_file_name",
-                                            match=models.MatchValue(value=v),
-                                        )
-                                    ]
-                                )
-                                recs, _ = qc.scroll(
-                                    collection_name="resumes",
-                                    scroll_filter=fil,
-                                    limit=1,
-                                )
-                                if recs and len(recs) > 0:
-                                    is_duplicate = True
-                                    break
-                            except Exception as e:
-                                print(f"⚠️ filename duplicate variant check failed for '{v}': {e}")
-
-                        if (not is_duplicate) and normalized_key:
-                            try:
-                                probe_id = _filename_to_point_id(normalized_key)
-                                recs = qc.retrieve(
-                                    collection_name="resumes",
-                                    ids=[probe_id],
-                                    with_payload=True,
-                                )
-                                if recs and len(recs) > 0:
-                                    is_duplicate = True
-                            except Exception:
-                                pass
-                except Exception as e:
-                    print(f"⚠️ filename duplicate check failed for {readable_file_name}: {e}")
-
-                if is_duplicate:
-                    skipped_duplicates.append(readable_file_name)
-                    print(
-                        f"⚠️ Duplicate filename detected (skipping upload for user-facing flow): {readable_file_name}"
-                    )
-                    continue
-
-                # Read file bytes once
-                file_bytes = resume_file.read()
-                if not file_bytes:
-                    errors.append(f"{readable_file_name}: file empty or unreadable")
-                    continue
-
-                # hash
-                file_hash = hashlib.sha256(file_bytes).hexdigest()
-
-                s3_buffer = io.BytesIO(file_bytes)
-                s3_buffer.name = resume_file.name
-                extract_buffer = io.BytesIO(file_bytes)
-                extract_buffer.name = resume_file.name
-
-                # Extract fields
-                try:
-                    extracted_data = extract_fields(extract_buffer)
-                except Exception as e:
-                    print(f"⚠️ Text extraction failed for {readable_file_name}: {e}")
-                    errors.append(f"{readable_file_name}: extraction failed ({str(e)})")
-                    continue
-
-                candidate_name = (
-                    extracted_data.get("name")
-                    or extracted_data.get("candidate_name")
-                    or "Unknown"
-                )
-                candidate_email = (extracted_data.get("email") or "").strip().lower() or None
-
-                # S3 upload
-                try:
-                    s3_url = upload_resume_to_s3(
-                        s3_buffer, resume_file.content_type, candidate_name
-                    )
-                    print(f"✅ Uploaded to S3: {s3_url}")
-                except Exception as e:
-                    print(f"❌ S3 upload failed for {readable_file_name}: {e}")
-                    errors.append(f"{readable_file_name}: s3 upload failed ({str(e)})")
-                    continue
-
-                # object/file name
-                try:
-                    parsed_url = urlparse(s3_url)
-                    object_name = parsed_url.path.lstrip("/")
-                    stored_file_name = object_name.split("/")[-1] or readable_file_name
-                except Exception:
-                    stored_file_name = readable_file_name
-
-                # Embedding
-                resume_text = extracted_data.get("resume_text", "") or extracted_data.get(
-                    "text", ""
-                )
-                try:
-                    embedding = get_text_embedding(resume_text)
-                except Exception as e:
-                    print(f"⚠️ Embedding generation failed for {readable_file_name}: {e}")
-                    errors.append(f"{readable_file_name}: embedding failed ({str(e)})")
-                    continue
-
-                extracted_skills = extracted_data.get("skills", []) or []
-
-                # ✅ payload now also carries salary + currency + candidate_type
-                payload = {
-                    "s3_url": s3_url,
-                    "candidate_name": candidate_name,
-                    "email": candidate_email,
-                    "file_hash": file_hash,
-                    "file_name": stored_file_name,
-                    "readable_file_name": readable_file_name,
-                    "experience_years": extracted_data.get("experience_years"),
-                    "cpd_level": extracted_data.get("cpd_level"),
-                    "skills": extracted_skills,
-                    "resume_text": resume_text,
-                    "salary": float(salary) if salary else None,
-                    "salary_currency": salary_currency or None,
-                    "candidate_type": (candidate_type or "external").lower(),
-                }
-
-                # Deterministic UUID id
-                try:
-                    point_id = _filename_to_point_id(normalized_key)
-                except Exception:
-                    point_id = str(uuid.uuid4())
-
-                # Upsert
-                try:
-                    upsert_point(point_id, embedding, payload)
-                    uploaded_results.append(
-                        {"point_id": point_id, "file": readable_file_name}
-                    )
-                    print(f"✅ Saved to Qdrant: {point_id} ({readable_file_name})")
-                except Exception as e:
-                    print(f"❌ Qdrant upsert failed for {readable_file_name}: {e}")
-                    errors.append(
-                        f"{readable_file_name}: qdrant upsert failed ({str(e)})"
-                    )
-                    continue
-
-            except Exception as e:
-                print(f"❌ Unexpected error processing {resume_file.name}: {e}")
-                errors.append(f"{resume_file.name}: unexpected error ({str(e)})")
-                continue
-
-        # Final responses
-        if not uploaded_results and skipped_duplicates:
+        max_bytes = ingestion_service.INGEST_MAX_FILE_MB * 1024 * 1024
+        too_large = [f.name for f in resume_files if (f.size or 0) > max_bytes]
+        if too_large:
             return Response(
                 {
-                    "message": "All provided resumes already exist (by filename).",
-                    "duplicates": skipped_duplicates,
-                    "uploaded_count": 0,
-                    "errors": errors,
+                    "error": f"Files larger than {ingestion_service.INGEST_MAX_FILE_MB} MB are not accepted.",
+                    "files": too_large,
                 },
-                status=status.HTTP_200_OK,
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             )
 
+        # ✅ NEW: extra metadata for this batch
+        batch_meta = {
+            "salary": request.data.get("salary"),
+            "salary_currency": request.data.get("salary_currency"),
+            "candidate_type": request.data.get("candidate_type"),
+        }
+        try:
+            if batch_meta["salary"]:
+                float(batch_meta["salary"])
+        except (TypeError, ValueError):
+            return Response({"error": "Invalid salary"}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = None
+        user_id = request.session.get("user_id")
+        if user_id:
+            user = AppUser.objects.filter(id=user_id).first()
+
+        try:
+            job = ingestion_service.create_job(resume_files, batch_meta, created_by=user)
+        except Exception as e:
+            traceback.print_exc()
+            return Response({"error": f"Could not queue upload: {e}"}, status=500)
+
         return Response(
             {
-                "message": "Upload complete!",
-                "uploaded_count": len(uploaded_results),
-                "skipped_duplicates": skipped_duplicates,
-                "uploaded_data": uploaded_results,
-                "errors": errors,
+                "message": "Upload queued",
+                "job_id": str(job.id),
+                "file_count": job.file_count,
+                "status_url": f"upload-jobs/{job.id}/",
             },
-            status=status.HTTP_201_CREATED if uploaded_results else status.HTTP_200_OK,
+            status=status.HTTP_202_ACCEPTED,
         )
 
+
+@api_view(['GET'])
+def ingestion_job_status(request, job_id):
+    """Stage/status/error of every file in an upload, plus the upload summary."""
+    job = IngestionJob.objects.filter(id=job_id).first()
+    if not job:
+        return Response({"error": "Upload job not found"}, status=404)
+    return Response(ingestion_service.job_status(job), status=200)
+
  
 # -----------------------------
 # Search endpoint (kept largely as-is)
 # -----------------------------
-from qdrant_client.http import models  # used for filter building
  
 SYNONYM_MAP = {
     'script': ['python', 'bash', 'powershell', 'perl', 'ruby', 'javascript'],
@@ -350,10 +265,112 @@ SYNONYM_MAP = {
 # ============================================================
 # Search Resume (Fixed: Aligned with Dashboard filters)
 # ============================================================
+def _search_filter(filters: dict):
+    """Qdrant filter for the search endpoints' cpd_level / department filters."""
+    must_conditions = []
+
+    # CPD Level filter
+    cpd_level = filters.get("cpd_level")
+    if cpd_level:
+        try:
+            val = int(cpd_level)
+            must_conditions.append(
+                models.FieldCondition(
+                    key="cpd_level",
+                    match=models.MatchValue(value=val)
+                )
+            )
+        except ValueError:
+            print(f"⚠️ Invalid CPD level: {cpd_level}")
+
+    # Department filter (optional)
+    department = filters.get("department")
+    if department:
+        must_conditions.append(
+            models.FieldCondition(
+                key="department",
+                match=models.MatchValue(value=department)
+            )
+        )
+
+    return models.Filter(must=must_conditions) if must_conditions else None
+
+
+def _search_options(data) -> dict:
+    """Vector weights / hybrid / fusion / limit options of a search request (ValueError if invalid)."""
+    try:
+        weights = parse_vector_weights(data.get("vector_weights") or data.get("vector"))
+    except ValueError:
+        raise ValueError("Invalid vector_weights")
+    try:
+        limit = min(int(data.get("limit") or 100), 500)
+    except (TypeError, ValueError):
+        limit = 100
+    return {
+        "weights": weights or RESUME_SEARCH_VECTOR_WEIGHTS,
+        "hybrid": str(data.get("hybrid", RESUME_SEARCH_HYBRID)).lower() == "true",
+        "fusion": str(data.get("fusion") or RESUME_SEARCH_FUSION).lower(),
+        "limit": limit,
+    }
+
+
+def _filter_only_results(points) -> list:
+    # Set a default score for filter results (since semantic similarity doesn't apply)
+    return [
+        {
+            "id": match.id,
+            "score": 75.0,
+            "matched_keywords": [],  # No keyword matching for filter-only
+            "data": match.payload or {},
+        }
+        for match in points
+    ]
+
+
+def _score_search_results(results, query: str, use_hybrid: bool) -> list:
+    """Keyword-match each hit and turn its score into a 0-100 value, best first."""
+    # Fusion scores aren't cosines; show them relative to the best hit
+    top_score = max((r.score or 0.0 for r in results), default=0.0) if use_hybrid else 0.0
+
+    final_results = []
+    for match in results:
+        payload = match.payload or {}
+
+        resume_skills = payload.get("skills", [])
+        if isinstance(resume_skills, str):
+            resume_skills = [resume_skills]
+
+        # ---- SMART KEYWORD MATCH PIPELINE ----
+        matched_keywords = KeywordMatchService.get_matched_keywords(
+            resume_skills, query
+        )
+
+        if use_hybrid:
+            # Keyword relevance is already part of the fused score
+            final_score = round((match.score or 0.0) / top_score * 100, 2) if top_score else 0.0
+        else:
+            # ---- Boost score using matched keyword count ----
+            base_score = match.score
+            boost = len(matched_keywords) * 0.08  # keyword influence
+            final_score = (base_score + boost) * 100
+            final_score = min(final_score, 100.0)  # Cap at 100%
+            final_score = round(final_score, 2)
+
+        final_results.append({
+            "id": match.id,
+            "score": final_score,
+            "matched_keywords": matched_keywords,
+            "data": payload
+        })
+
+    # Sort by boosted score
+    final_results.sort(key=lambda x: x["score"], reverse=True)
+    return final_results
+
+
 class ResumeSearchView(APIView):
  
     def post(self, request, *args, **kwargs):
-        from qdrant_client.http import models
         query = request.data.get("query", "")
         filters = request.data.get("filters", {})
  
@@ -367,79 +384,44 @@ class ResumeSearchView(APIView):
         print(f"📥 Query: {query}")
         print(f"📥 Filters: {filters}")
         print("="*60)
+
+        try:
+            options = _search_options(request.data)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        query_filter = _search_filter(filters)
        
         # ============================================================
         # FILTER-ONLY SEARCH (when query is empty)
         # ============================================================
         if not query:
-           
-           
-            must_conditions = []
-           
-            # CPD Level filter
-            cpd_level = filters.get("cpd_level")
-            if cpd_level:
-                try:
-                    val = int(cpd_level)
-                    must_conditions.append(
-                        models.FieldCondition(
-                            key="cpd_level",
-                            match=models.MatchValue(value=val)
-                        )
-                    )
-                    print(f"✅ CPD Level filter added: {val}")
-                except ValueError:
-                    print(f"⚠️ Invalid CPD level: {cpd_level}")
-                    pass
-           
-            # Department filter (optional)
-            department = filters.get("department")
-            if department:
-                must_conditions.append(
-                    models.FieldCondition(
-                        key="department",
-                        match=models.MatchValue(value=department)
-                    )
-                )
-                print(f"✅ Department filter added: {department}")
-           
-            # Build filter
-            query_filter = models.Filter(must=must_conditions) if must_conditions else None
-           
-            # Use zero vector for filter-only search
-            dummy_vector = [0.0] * 384
-           
+            # Filter-only: plain scroll (no vector search), highest CPD level
+            # first, or most experienced first when the CPD level is fixed
             try:
-                results = search_collection(dummy_vector, query_filter=query_filter, limit=100)
-                print(f"✅ Filter-only search returned {len(results)} results")
+                listing = list_points_filtered(
+                    query_filter,
+                    order_by="experience_years" if filters.get("cpd_level") else "cpd_level",
+                    limit=options["limit"],
+                    cursor=request.data.get("cursor"),
+                    fields=RESUME_CARD_FIELDS,
+                )
+                print(f"✅ Filter-only listing returned {len(listing['points'])} of {listing['total']} results")
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
             except Exception as e:
-                print(f"❌ Qdrant search error: {e}")
+                print(f"❌ Qdrant scroll error: {e}")
                 return Response({"error": f"Qdrant search error: {e}"}, status=500)
            
-            # Build final_results for filter-only search
-            final_results = []
-            for match in results:
-                payload = match.payload or {}
-               
-                # Set a default score for filter results (since semantic similarity doesn't apply)
-                final_score = 75.0  # You can adjust this or calculate based on other criteria
-               
-                final_results.append({
-                    "id": match.id,
-                    "score": final_score,
-                    "matched_keywords": [],  # No keyword matching for filter-only
-                    "data": payload
-                })
-           
-            # Sort by CPD level or experience (optional)
-            final_results.sort(key=lambda x: (
-                x["data"].get("cpd_level", 0),
-                x["data"].get("experience_years", 0)
-            ), reverse=True)
+            final_results = _filter_only_results(listing["points"])
            
             print(f"📤 Returning {len(final_results)} filtered results")
             print("="*60 + "\n")
-            return Response({"results": final_results}, status=200)
+            return Response({
+                "results": final_results,
+                "next_cursor": listing["next_cursor"],
+                "total": listing["total"],
+            }, status=200)
        
         # ============================================================
         # TEXT-BASED SEARCH (with optional filters)
@@ -453,85 +435,47 @@ class ResumeSearchView(APIView):
         print("\n🔍 Search expanded keywords =", expanded_keywords)
  
         # ------------------------------------------------------------
-        # 2) Get embedding for semantic search
+        # 2) Get embedding(s) for semantic search
+        #    "vector" / "vector_weights" pick which named vectors to query
         # ------------------------------------------------------------
+        weights = options["weights"]
         try:
-            query_embedding = get_text_embedding(query)
+            query_vectors = _query_vectors(query, raw_keywords, weights)
         except Exception as e:
             return Response({"error": f"Embedding failed: {e}"}, status=500)
  
         # ------------------------------------------------------------
-        # 3) Build filters for text search (if provided)
+        # 3) Search Qdrant by similarity + filters
         # ------------------------------------------------------------
-        must_conditions = []
-       
-        cpd_level = filters.get("cpd_level")
-        if cpd_level:
-            try:
-                val = int(cpd_level)
-                must_conditions.append(
-                    models.FieldCondition(
-                        key="cpd_level",
-                        match=models.MatchValue(value=val)
-                    )
+        # Hybrid: keyword relevance (BM25 over the whole corpus) is fused with
+        # the dense results inside Qdrant instead of boosting in Python
+        use_hybrid, fusion = options["hybrid"], options["fusion"]
+        results = None
+        try:
+            if use_hybrid:
+                results = hybrid_search(
+                    query_vectors,
+                    query_sparse_vector(query, expanded_keywords),
+                    vector_names=list(weights),
+                    fusion=fusion,
+                    query_filter=query_filter,
+                    limit=300,
+                    exclude_fields=["resume_text"],
                 )
-            except ValueError:
-                pass
-       
-        department = filters.get("department")
-        if department:
-            must_conditions.append(
-                models.FieldCondition(
-                    key="department",
-                    match=models.MatchValue(value=department)
+            if results is None:
+                use_hybrid = False
+                results = search_resumes_weighted(
+                    query_vectors, weights, query_filter=query_filter, limit=300, exclude_fields=["resume_text"]
                 )
-            )
-       
-        query_filter = models.Filter(must=must_conditions) if must_conditions else None
-       
-        # ------------------------------------------------------------
-        # 4) Search Qdrant by similarity + filters
-        # ------------------------------------------------------------
-        try:
-            results = search_collection(query_embedding, query_filter=query_filter, limit=300)
-            print(f"✅ Semantic search returned {len(results)} results")
+            print(f"✅ {'Hybrid (' + fusion + ')' if use_hybrid else 'Semantic'} search returned "
+                  f"{len(results)} results (vectors: {weights})")
         except Exception as e:
             return Response({"error": f"Qdrant search error: {e}"}, status=500)
- 
-        final_results = []
- 
+
         # ------------------------------------------------------------
-        # 5) Loop resumes and do keyword scoring
+        # 4) Keyword-match and score the hits
         # ------------------------------------------------------------
-        for match in results:
-            payload = match.payload or {}
- 
-            resume_skills = payload.get("skills", [])
-            if isinstance(resume_skills, str):
-                resume_skills = [resume_skills]
- 
-            # ---- SMART KEYWORD MATCH PIPELINE ----
-            matched_keywords = KeywordMatchService.get_matched_keywords(
-                resume_skills, query
-            )
- 
-            # ---- Boost score using matched keyword count ----
-            base_score = match.score
-            boost = len(matched_keywords) * 0.08  # keyword influence
-            final_score = (base_score + boost) * 100
-            final_score = min(final_score, 100.0)  # Cap at 100%
-            final_score = round(final_score, 2)
- 
-            # Build result object
-            final_results.append({
-                "id": match.id,
-                "score": final_score,
-                "matched_keywords": matched_keywords,
-                "data": payload
-            })
-           
-        # Sort by boosted score
-        final_results.sort(key=lambda x: x["score"], reverse=True)
+        final_results = _score_search_results(results, query, use_hybrid)
        
         print(f"📤 Returning {len(final_results)} search results")
         print("="*60 + "\n")
@@ -547,6 +491,23 @@ class ResumeSearchView(APIView):
 # -----------------------------
 
 
+def _resume_card(record) -> dict:
+    payload = record.payload or {}
+    # Handle filename extraction
+    file_name = payload.get('file_name') or payload.get('readable_file_name') or payload.get('s3_url', '').split('/')[-1]
+
+    return {
+        'id': record.id,
+        'candidate_name': payload.get('candidate_name'),
+        'email': payload.get('email'),
+        'experience_years': payload.get('experience_years'),
+        'cpd_level': payload.get('cpd_level'),
+        'skills': payload.get('skills', []),
+        's3_url': payload.get('s3_url'),
+        'file_name': file_name,
+    }
+
+
 class ResumeListView(APIView):
     def get(self, request):
         try:
@@ -565,25 +526,11 @@ class ResumeListView(APIView):
                 return Response({"results": [], "next_offset": None}, status=200)
 
             # 3. ✅ PAGINATED QDRANT SEARCH (Fixes the issue)
-            qdrant_records, next_offset = get_points_paginated(offset=offset, limit=limit)
+            qdrant_records, next_offset = get_points_paginated(
+                offset=offset, limit=limit, fields=RESUME_CARD_FIELDS
+            )
             
-            formatted_results = []
-            for record in qdrant_records:
-                payload = record.payload or {}
-                # Handle filename extraction
-                file_name = payload.get('file_name') or payload.get('readable_file_name') or payload.get('s3_url', '').split('/')[-1]
-
-                formatted_results.append({
-                    'id': record.id,
-                    'candidate_name': payload.get('candidate_name'),
-                    'email': payload.get('email'),
-                    'experience_years': payload.get('experience_years'),
-                    'cpd_level': payload.get('cpd_level'),
-                    'skills': payload.get('skills', []),
-                    's3_url': payload.get('s3_url'),
-                    'file_name': file_name,
-                    'resume_text': payload.get('resume_text')
-                })
+            formatted_results = [_resume_card(record) for record in qdrant_records]
 
             # ✅ 4. RETURN "next_offset" SO FRONTEND KNOWS TO LOAD MORE
             return Response({
@@ -744,16 +691,13 @@ def filter_resumes(request):
 
         # 2. Experience Filter
         if experience_bucket:
-            # Logic must match 'analytics_overview' exactly
-            if experience_bucket in ["0-2", "0-2 yrs"]:
-                must_conditions.append(models.FieldCondition(key="experience_years", range=models.Range(gte=0, lte=2)))
-            elif experience_bucket in ["3-5", "3-5 yrs"]:
-                must_conditions.append(models.FieldCondition(key="experience_years", range=models.Range(gte=3, lte=5)))
-            elif experience_bucket in ["6-10", "6-10 yrs"]:
-                must_conditions.append(models.FieldCondition(key="experience_years", range=models.Range(gte=6, lte=10)))
-            elif experience_bucket in ["10+", "10+ yrs"]:
-                # Matches >10 (so 11 and up)
-                must_conditions.append(models.FieldCondition(key="experience_years", range=models.Range(gte=11)))
+            # Same buckets as 'analytics_overview', so counts and lists agree
+            for label, low, high in EXPERIENCE_BUCKETS:
+                if experience_bucket in (label, label.replace(" yrs", "")):
+                    must_conditions.append(models.FieldCondition(
+                        key="experience_years", range=models.Range(gte=low, lt=high)
+                    ))
+                    break
 
         # 3. Skill Filter
         if skill:
@@ -762,14 +706,25 @@ def filter_resumes(request):
                 key="skills", match=models.MatchAny(any=[skill.lower()])
             ))
 
-        # Execute Search
+        # Execute filtered listing (scroll + count, no vector search)
         query_filter = models.Filter(must=must_conditions) if must_conditions else None
-        
-        # We use a zero vector because we only care about the filter, not semantic similarity
-        dummy_vector = [0.0] * 384 
-        
-        # Search limit 100 to show plenty of results
-        results = search_collection(dummy_vector, query_filter=query_filter, limit=100)
+
+        try:
+            limit = min(int(request.query_params.get('limit') or 100), 500)
+        except ValueError:
+            limit = 100
+
+        try:
+            listing = list_points_filtered(
+                query_filter,
+                order_by="cpd_level",
+                limit=limit,
+                cursor=request.query_params.get('cursor'),
+                fields=RESUME_CARD_FIELDS,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+        results = listing["points"]
 
         formatted_results = []
         for match in results:
@@ -787,11 +742,14 @@ def filter_resumes(request):
                 'skills': p.get('skills', []),
                 's3_url': p.get('s3_url', ''),
                 'file_name': file_name,
-                'resume_text': p.get('resume_text', '')
             })
 
-        print(f"✅ Found {len(formatted_results)} matches.")
-        return Response({"results": formatted_results}, status=status.HTTP_200_OK)
+        print(f"✅ Found {len(formatted_results)} of {listing['total']} matches.")
+        return Response({
+            "results": formatted_results,
+            "next_cursor": listing["next_cursor"],
+            "total": listing["total"],
+        }, status=status.HTTP_200_OK)
 
     except Exception as e:
         import traceback
@@ -880,6 +838,24 @@ def view_resume(request):
         return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
 
+# -----------------------------
+# Full resume text (fetched lazily for highlighting)
+# -----------------------------
+@api_view(['GET'])
+def resume_full_text(request, point_id):
+    try:
+        record = retrieve_point(point_id, fields=["resume_text", "resume_text_ref"])
+    except RuntimeError as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    except Exception:
+        return Response({"error": "Resume not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response(
+        {"id": record.id, "resume_text": resolve_resume_text(record.payload)},
+        status=status.HTTP_200_OK,
+    )
+
+
 # -----------------------------
 # Proxy + Validate helpers
 # -----------------------------
@@ -921,18 +897,11 @@ def validate_word(request):
 # Utility: fetch single Qdrant record by id (used by detail endpoint)
 # -----------------------------
 def _get_qdrant_record_by_id(qdrant_id: str):
-    """
-    Simple helper: fetch all points (should be fast for moderate dataset) and find id match.
-    If you have a direct qdrant service helper to fetch by id, replace this implementation.
-    """
+    """Fetch a single Qdrant record by id (None if missing)."""
     try:
-        points = get_all_points()
-        for p in points:
-            if str(p.id) == str(qdrant_id):
-                return p
-        return None
-    except Exception:
-        traceback.print_exc()
+        return retrieve_point(qdrant_id)
+    except Exception as e:
+        print(f"⚠️ Record {qdrant_id} not found: {e}")
         return None
 
 
@@ -1054,66 +1023,53 @@ class ResumeDeleteView(APIView):
                 
 
 
-@api_view(['GET'])
-def analytics_overview(request):
-    try:
-        records = get_all_points()
-
-        # Initialize with 0s
-        cpd_levels = {str(i): 0 for i in range(1, 7)}
-        experience = {
-            "0-2 yrs": 0,
-            "3-5 yrs": 0,
-            "6-10 yrs": 0,
-            "10+ yrs": 0
-        }
-        skill_counts = {}
+def _analytics_filters() -> dict:
+    """One count filter per CPD level and per experience bucket."""
+    filters = {
+        f"cpd:{level}": models.Filter(must=[
+            models.FieldCondition(key="cpd_level", match=models.MatchValue(value=level))
+        ])
+        for level in range(1, 7)
+    }
+    for label, low, high in EXPERIENCE_BUCKETS:
+        filters[f"exp:{label}"] = models.Filter(must=[
+            models.FieldCondition(key="experience_years", range=models.Range(gte=low, lt=high))
+        ])
+    return filters
+
+
+def _merge_skill_facets(facets: dict, limit: int = ANALYTICS_TOP_SKILLS) -> dict:
+    """Facet buckets keyed by normalized skill ("Python", "python " -> "python"), top `limit`."""
+    merged = {}
+    for value, count in facets.items():
+        skill = str(value).strip().lower()
+        if skill:
+            merged[skill] = merged.get(skill, 0) + count
+    return dict(sorted(merged.items(), key=lambda x: x[1], reverse=True)[:limit])
 
-        print(f"📊 ANALYTICS: Processing {len(records)} records...")
 
-        for rec in records:
-            p = rec.payload or {}
+def _analytics_body(counts: dict, skills: dict) -> dict:
+    cpd_levels = {str(level): counts[f"cpd:{level}"] for level in range(1, 7)}
+    experience = {label: counts[f"exp:{label}"] for label, _, _ in EXPERIENCE_BUCKETS}
+    skills = _merge_skill_facets(skills)
 
-            # CPD
-            cpd = p.get("cpd_level")
-            if cpd:
-                cpd_str = str(cpd)
-                if cpd_str in cpd_levels:
-                    cpd_levels[cpd_str] += 1
+    print(f"📊 ANALYTICS: cpd={cpd_levels} experience={experience} top_skills={len(skills)}")
 
-            # EXPERIENCE
-            # Robust extraction: handles strings, ints, and floats
-            raw_exp = p.get("experience_years")
-            if raw_exp is not None:
-                try:
-                    # Convert to float first to handle "10.5", then int
-                    exp = int(float(raw_exp))
-                    
-                    if exp <= 2: bucket = "0-2 yrs"
-                    elif exp <= 5: bucket = "3-5 yrs"
-                    elif exp <= 10: bucket = "6-10 yrs"
-                    else: bucket = "10+ yrs"
-                    
-                    experience[bucket] += 1
-                    print(f"  - Found {exp} years -> {bucket}") # Debug print
-                except (ValueError, TypeError):
-                    print(f"  - ⚠️ Invalid experience value: {raw_exp}")
-                    pass 
-
-            # SKILLS
-            skills = p.get("skills", [])
-            for s in skills:
-                s = str(s).strip().lower()
-                if s:
-                    skill_counts[s] = skill_counts.get(s, 0) + 1
-
-        print(f"✅ Experience Data: {experience}")
+    return {
+        "cpd_levels": cpd_levels,
+        "experience": experience,
+        "skills": skills,
+    }
 
-        return Response({
-            "cpd_levels": cpd_levels,
-            "experience": experience,
-            "skills": dict(sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:20])
-        })
+
+@api_view(['GET'])
+def analytics_overview(request):
+    try:
+        # Every number comes from a count/facet call, so the cost doesn't grow
+        # with the number of resumes
+        counts = count_by_filters(_analytics_filters())
+        skills = facet_counts("skills", limit=ANALYTICS_SKILL_FACET_LIMIT)
+        return Response(_analytics_body(counts, skills))
 
     except Exception as e:
         import traceback
@@ -1331,12 +1287,47 @@ def jd_match(request):
 
 
         # ===== STEP 3: Fetch resumes =====
+        # Default: score every resume. With "vector" / "vector_weights", only the
+        # top candidates of a (weighted) named-vector search are scored.
         print("[3] Fetching resumes...")
-        all_resumes = get_all_points()
+        try:
+            vector_weights = parse_vector_weights(
+                request.data.get("vector_weights") or request.data.get("vector")
+            )
+        except ValueError:
+            return Response(
+                {'error': 'Invalid vector_weights', 'success': False},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        semantic_scores = {}
+        if vector_weights:
+            try:
+                top_k = int(request.data.get("top_k") or 300)
+            except (TypeError, ValueError):
+                top_k = 300
+            all_resumes = search_resumes_weighted(
+                _query_vectors(jd_text, jd_keywords, vector_weights, long_text=True),
+                vector_weights,
+                limit=top_k,
+                min_score=0.0,
+                fields=JD_MATCH_FIELDS,
+            )
+            semantic_scores = {r.id: round(float(r.score) * 100, 2) for r in all_resumes}
+        else:
+            # Streamed page by page (next page prefetched while this one is scored)
+            all_resumes = _iter_resumes_for_matching(JD_MATCH_FIELDS)
 
 
         # ===== STEP 4: Match resumes =====
-        matches = []
+        # Only the best `limit` matches are kept while resumes stream in:
+        # a min-heap of (score, -idx, candidate), so ties keep their order
+        try:
+            limit = max(1, min(int(request.data.get("limit") or JD_MATCH_LIMIT), 1000))
+        except (TypeError, ValueError):
+            limit = JD_MATCH_LIMIT
+        best = []
+        scored = 0
         
         for idx, resume in enumerate(all_resumes, 1):
             try:
@@ -1418,13 +1409,19 @@ def jd_match(request):
                     'total_required': match_result['total_required'],
                     's3_url': payload.get('s3_url', ''),
                     'file_name': file_name,
-                    'resume_text': payload.get('resume_text', ''),
                     'salary': payload.get('salary'),
                     'salary_currency': payload.get('salary_currency'),
                     'candidate_type': payload.get('candidate_type'),
                 }
+                if semantic_scores:
+                    candidate_data['semantic_score'] = semantic_scores.get(resume.id)
                 
-                matches.append(candidate_data)
+                scored += 1
+                entry = (final_match_pct, -idx, candidate_data)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                else:
+                    heapq.heappushpop(best, entry)
 
 
             except Exception as e:
@@ -1432,7 +1429,7 @@ def jd_match(request):
                 continue
         
         # Sort by match percentage descending
-        matches.sort(key=lambda x: x['match_percentage'], reverse=True)
+        matches = [candidate for _, _, candidate in sorted(best, reverse=True)]
         
         return Response({
             'jd_text': jd_text,
@@ -1440,7 +1437,7 @@ def jd_match(request):
             'required_experience_min': required_experience,
             'required_experience_max': None,
             'matches': matches,
-            'total_matches': len(matches),
+            'total_matches': scored,
             'success': True,
         }, status=status.HTTP_200_OK)
     
@@ -1488,7 +1485,6 @@ def check_hashes(request):
 # ====================================================================
 # USER AUTH: Register + Login (Using AppUser)
 # ====================================================================
-from .models import AppUser
 import json
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
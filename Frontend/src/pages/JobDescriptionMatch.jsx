@@ -378,9 +378,22 @@ const JobDescriptionMatch = () => {
     return highlighted.replace(/\n/g, "<br/>");
   };
 
-  const openHighlightModal = (resume) => {
+  const openHighlightModal = async (resume) => {
     setHighlightResume(resume);
     setShowHighlights(true);
+
+    // Match results don't carry the full text; fetch it on demand
+    if (!resume?.resume_text && resume?.id) {
+      try {
+        const res = await fetch(`${API_BASE_URL}/resumes/${resume.id}/text/`);
+        if (res.ok) {
+          const data = await res.json();
+          setHighlightResume({ ...resume, resume_text: data.resume_text || "" });
+        }
+      } catch (err) {
+        console.error("Failed to load resume text:", err);
+      }
+    }
   };
 
   const closeHighlightModal = () => {
@@ -217,13 +217,26 @@ function Retrieve() {
   };
  
   // ⭐ Highlight logic
-  const openHighlights = () => {
+  const openHighlights = async () => {
     if (!selectedResume) return;
  
     let resumeText =
       selectedResume.raw_payload?.resume_text ||
       selectedResume.raw_payload?.text ||
       "";
+
+    // Search results don't carry the full text; fetch it on demand
+    if (!resumeText && selectedResume.id) {
+      try {
+        const res = await fetch(`${API_BASE_URL}/resumes/${selectedResume.id}/text/`);
+        if (res.ok) {
+          const data = await res.json();
+          resumeText = data.resume_text || "";
+        }
+      } catch (err) {
+        console.error("Failed to load resume text:", err);
+      }
+    }
  
     resumeText = resumeText.replace(/\n{3,}/g, "\n\n");
     resumeText = resumeText
@@ -1,5 +1,5 @@
 // src/pages/Upload.jsx
-import React, { useState, useRef } from "react";
+import React, { useState, useRef, useEffect } from "react";
 import {
   UploadCloud,
   CheckCircle,
@@ -22,6 +22,10 @@ const calculateFileHash = async (file) => {
     .join("");
 };
  
+// Upload job polling: every 2s, giving up after 30 minutes
+const JOB_POLL_INTERVAL_MS = 2000;
+const JOB_POLL_TIMEOUT_MS = 30 * 60 * 1000;
+
 // Format file size
 const formatSize = (bytes) => {
   if (bytes < 1024) return bytes + " B";
@@ -47,6 +51,15 @@ const Upload = () => {
   const [salary, setSalary] = useState("");
   const [salaryCurrency, setSalaryCurrency] = useState("EUR");
   const [candidateType, setCandidateType] = useState("external");
+
+  // Stops the upload job poll when the page is left
+  const unmountedRef = useRef(false);
+  useEffect(() => {
+    unmountedRef.current = false;
+    return () => {
+      unmountedRef.current = true;
+    };
+  }, []);
  
   // ---------------- DRAG & DROP ----------------
   const dropRef = useRef(null);
@@ -116,6 +129,7 @@ const Upload = () => {
     const errorFiles = [];
  
     try {
+      const toUpload = [];
       for (const file of files) {
         setUploadStatus(`Checking ${file.name}…`);
         const hash = await calculateFileHash(file);
@@ -131,12 +145,18 @@ const Upload = () => {
           duplicateFiles.push(file.name);
           continue;
         }
+        toUpload.push({ file, hash });
+      }
  
-        setUploadStatus(`Uploading ${file.name}…`);
+      if (toUpload.length) {
+        setUploadStatus(`Uploading ${toUpload.length} file(s)…`);
  
+        // One request for the whole batch; the server queues an ingestion job
         const formData = new FormData();
-        formData.append("resume_file", file);
-        formData.append("file_hash", hash);
+        for (const { file, hash } of toUpload) {
+          formData.append("resume_file", file);
+          formData.append("file_hash", hash);
+        }
  
         if (salary) formData.append("salary", salary);
         if (salaryCurrency)
@@ -146,13 +166,44 @@ const Upload = () => {
         const uploadRes = await fetch(`${API_BASE_URL}/upload-resume/`, {
           method: "POST",
           body: formData,
+          credentials: "include",
         });
  
         const data = await uploadRes.json();
         if (!uploadRes.ok) {
-          errorFiles.push(`${file.name}: ${data.error || "Upload failed"}`);
+          for (const { file } of toUpload) {
+            errorFiles.push(`${file.name}: ${data.error || "Upload failed"}`);
+          }
         } else {
-          successFiles.push(file.name);
+          // Poll the ingestion job until every file has finished
+          let job = null;
+          const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+          while (true) {
+            await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+            if (unmountedRef.current) return;
+            if (Date.now() > deadline) {
+              throw new Error(
+                `Upload is still processing after ${JOB_POLL_TIMEOUT_MS / 60000} minutes. ` +
+                  "Check the resume list later."
+              );
+            }
+            const jobRes = await fetch(
+              `${API_BASE_URL}/upload-jobs/${data.job_id}/`,
+              { credentials: "include" }
+            );
+            job = await jobRes.json();
+            if (!jobRes.ok) throw new Error(job.error || "Could not read upload status");
+ 
+            const finished =
+              job.counts.uploaded + job.counts.duplicate + job.counts.failed;
+            setUploadStatus(`Processing ${finished}/${job.file_count}…`);
+            if (job.status === "done" || job.status === "failed") break;
+          }
+ 
+          successFiles.push(...job.uploaded_data.map((u) => u.file));
+          duplicateFiles.push(...job.skipped_duplicates);
+          errorFiles.push(...job.errors);
+          if (job.status === "failed" && job.error) errorFiles.push(job.error);
         }
       }
  
@@ -190,8 +241,10 @@ const Upload = () => {
       });
  
     } finally {
-      setUploading(false);
-      setUploadStatus("");
+      if (!unmountedRef.current) {
+        setUploading(false);
+        setUploadStatus("");
+      }
     }
   };
  